@@ -0,0 +1,67 @@
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+EXPAND_PARAM = 'expand'
+ALWAYS_INCLUDED = ('id',)
+
+
+def _split(value):
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+class Fieldset:
+
+    def __init__(self, fields=None, omit=(), expand=None):
+        self.fields = fields
+        self.omit = set(omit)
+        self.expand = expand
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        if not any(
+            param in query_params
+            for param in (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM)
+        ):
+            return None
+        fields = query_params.get(FIELDS_PARAM)
+        expand = query_params.get(EXPAND_PARAM)
+        return cls(
+            fields=None if fields is None else _split(fields),
+            omit=_split(query_params.get(OMIT_PARAM, '')),
+            expand=None if expand is None else _split(expand)
+        )
+
+    def includes(self, name):
+        if name in ALWAYS_INCLUDED:
+            return True
+        if self.fields is not None and name not in self.fields:
+            return False
+        return name not in self.omit
+
+    def expands(self, name):
+        if not self.includes(name):
+            return False
+        if self.fields is None and self.expand is None:
+            return True
+        return self.expand is not None and name in self.expand
+
+
+class SparseFieldsetMixin:
+
+    def get_collapsed_fields(self):
+        return {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            return fields
+        collapsed = self.get_collapsed_fields()
+        return {
+            name: (
+                collapsed[name]
+                if name in collapsed and not fieldset.expands(name)
+                else field
+            )
+            for name, field in fields.items()
+            if fieldset.includes(name)
+        }
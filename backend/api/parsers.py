@@ -0,0 +1,26 @@
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from api.renderers import MESSAGEPACK_MEDIA_TYPE
+
+
+class MessagePackParser(BaseParser):
+
+    media_type = MESSAGEPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException):
+            raise ParseError('Некорректные данные MessagePack.')
+
+
+class NDJSONParser(BaseParser):
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return []
+        return stream.read().splitlines()
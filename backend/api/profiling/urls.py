@@ -0,0 +1,13 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from api.profiling.views import ProfileViewSet
+
+app_name = 'profiling'
+
+router = DefaultRouter()
+router.register('profiles', ProfileViewSet, basename='profiles')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,57 @@
+from django.http import FileResponse, Http404
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from foodgram.profiling import (issue_token, list_profiles, profile_path,
+                                top_functions)
+
+SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+
+class ProfileViewSet(viewsets.ViewSet):
+
+    permission_classes = [permissions.IsAdminUser]
+    lookup_value_regex = r'[\w.-]+'
+
+    def _get_path(self, pk):
+        path = profile_path(pk)
+        if path is None:
+            raise Http404
+        return path
+
+    def list(self, request):
+        return Response([
+            {
+                'id': entry.name,
+                'size': entry.stat().st_size,
+                'created': entry.stat().st_mtime,
+            }
+            for entry in list_profiles()
+        ])
+
+    def retrieve(self, request, pk=None):
+        sort = request.query_params.get('sort', 'cumulative')
+        if sort not in SORT_KEYS:
+            return Response(
+                {'sort': f'Допустимые значения: {", ".join(SORT_KEYS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = request.query_params.get('limit', '30')
+        limit = int(limit) if limit.isdigit() else 30
+        return Response(top_functions(self._get_path(pk), sort, limit))
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        return FileResponse(
+            open(self._get_path(pk), 'rb'),
+            as_attachment=True,
+            filename=pk
+        )
+
+    @action(detail=False, methods=['post'])
+    def token(self, request):
+        return Response(
+            {'token': issue_token(request.user)},
+            status=status.HTTP_201_CREATED
+        )
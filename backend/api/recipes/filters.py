@@ -1,10 +1,27 @@
+import json
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework as filters
 from rest_framework import filters as drf_filters
 
+from recipes_app.ingredient_index import ingredient_index
 from recipes_app.models import Ingredient, Recipe
+from recipes_app.search import search_recipes
 from users_app.models import User
 
 
+def id_list(queryset, ids):
+    ids = ids.tolist()
+    if connections[queryset.db].vendor == 'postgresql':
+        return RawSQL('SELECT unnest(%s::bigint[])', (ids,))
+    return RawSQL('SELECT value FROM json_each(%s)', (json.dumps(ids),))
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
 class RecipeFilter(filters.FilterSet):
 
     author = filters.ModelChoiceFilter(queryset=User.objects.all())
@@ -12,11 +29,21 @@ class RecipeFilter(filters.FilterSet):
     is_in_shopping_cart = filters.BooleanFilter(
         method='filter_is_in_shopping_cart'
     )
+    search = filters.CharFilter(method='filter_search')
+    ingredients = NumberInFilter(method='filter_ingredients')
+    exclude_ingredients = NumberInFilter(method='filter_exclude_ingredients')
 
     class Meta:
 
         model = Recipe
-        fields = ['author', 'is_favorited', 'is_in_shopping_cart']
+        fields = [
+            'author',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'search',
+            'ingredients',
+            'exclude_ingredients'
+        ]
 
     def filter_is_favorited(self, queryset, name, value):
         user = self.request.user
@@ -30,6 +57,26 @@ class RecipeFilter(filters.FilterSet):
             return queryset.filter(shoppingcart__user=user)
         return queryset
 
+    def filter_search(self, queryset, name, value):
+        value = value.strip()
+        if not value:
+            return queryset
+        return search_recipes(queryset, value)
+
+    def filter_ingredients(self, queryset, name, value):
+        recipe_ids = ingredient_index.recipes_with_all(
+            [int(item) for item in value]
+        )
+        return queryset.filter(pk__in=id_list(queryset, recipe_ids))
+
+    def filter_exclude_ingredients(self, queryset, name, value):
+        recipe_ids = ingredient_index.recipes_with_any(
+            [int(item) for item in value]
+        )
+        if not len(recipe_ids):
+            return queryset
+        return queryset.exclude(pk__in=id_list(queryset, recipe_ids))
+
 
 class IngredientFilter(drf_filters.SearchFilter):
 
@@ -2,8 +2,10 @@ from django.db import transaction
 from rest_framework import serializers
 from rest_framework.fields import CreateOnlyDefault, CurrentUserDefault
 
+from api.fieldsets import SparseFieldsetMixin
 from api.users.serializers import Base64ImageField, UserSerializer
 from recipes_app.constants import MIN_VALUE_AMOUNT_INGREDIENTS
+from recipes_app.ingredient_index import ingredient_index
 from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
                                 Recipe, ShoppingCart)
 from recipes_app.validators import validate_time
@@ -40,13 +42,23 @@ class IngredientInRecipeReadSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount')
 
 
+class IngredientAmountReadSerializer(serializers.ModelSerializer):
+
+    id = serializers.IntegerField(source='ingredient_id')
+
+    class Meta:
+
+        model = IngredientInRecipe
+        fields = ('id', 'amount')
+
+
 class IngredientAmountWriteSerializer(serializers.Serializer):
 
     id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
     amount = serializers.IntegerField(min_value=MIN_VALUE_AMOUNT_INGREDIENTS)
 
 
-class RecipeReadSerializer(serializers.ModelSerializer):
+class RecipeReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     author = UserSerializer()
     ingredients = IngredientInRecipeReadSerializer(
@@ -64,6 +76,27 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'cooking_time', 'is_favorited', 'is_in_shopping_cart'
         )
 
+    def get_collapsed_fields(self):
+        return {
+            'author': serializers.PrimaryKeyRelatedField(read_only=True),
+            'ingredients': IngredientAmountReadSerializer(
+                many=True,
+                source='recipe_ingredients'
+            ),
+        }
+
+
+class PantryRecipeSerializer(RecipeReadSerializer):
+
+    coverage = serializers.FloatField(read_only=True)
+    missing_count = serializers.IntegerField(read_only=True)
+
+    class Meta(RecipeReadSerializer.Meta):
+
+        fields = RecipeReadSerializer.Meta.fields + (
+            'coverage', 'missing_count'
+        )
+
 
 class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
@@ -122,6 +155,10 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
                 )
                 for item in ingredients_data
             ])
+        ingredient_ids = [item['id'].pk for item in ingredients_data or []]
+        transaction.on_commit(
+            lambda: ingredient_index.update_recipe(recipe.pk, ingredient_ids)
+        )
 
     @transaction.atomic
     def create(self, validated_data):
@@ -1,25 +1,53 @@
+import hashlib
 from io import BytesIO
 
+import numpy as np
 from django.db.models import Exists, OuterRef, Sum
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotFound
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.cache import (add_never_cache_headers,
+                                get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from api.recipes.filters import IngredientFilter, RecipeFilter
+from api.fieldsets import Fieldset
+from api.parsers import NDJSONParser
+from api.recipes.filters import IngredientFilter, RecipeFilter, id_list
 from api.recipes.serializers import (AddRemoveRecipeSerializer, 
                                     IngredientSerializer,
+                                    PantryRecipeSerializer,
                                     RecipeCreateUpdateSerializer,
                                     RecipeReadSerializer,
                                     ShortRecipeSerializer)
-from recipes_app.constants import MAX_PAGE_SIZE, PAGE_SIZE
+from api.renderers import FastJSONRenderer, NormalizedJSONRenderer
+from api.users.serializers import UserSerializer
+from recipes_app.bulk_import import import_recipes
+from recipes_app.constants import (IMPORT_MAX_RECORDS, MAX_MULTI_GET_SIZE,
+                                   MAX_PAGE_SIZE, MAX_PANTRY_SIZE, PAGE_SIZE,
+                                   SHORT_LINK_CACHE_SECONDS,
+                                   SHORT_LINK_MISS_CACHE_SECONDS)
+from recipes_app.ingredient_index import ingredient_index
+from recipes_app.jobs import delete_recipes
 from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
                                 Recipe, ShoppingCart)
+from recipes_app.short_links import decode, encode, live_recipe_ids
+from recipes_app.trending import get_trending_ids, record_event
+from users_app.models import Subscription, User
+
+FIELDSET_ACTIONS = (
+    'list', 'retrieve', 'my_recipes', 'what_can_i_cook', 'trending'
+)
+DEFERRABLE_FIELDS = ('name', 'image', 'text', 'cooking_time')
+IDS_PARAM = 'ids'
 
 
 class RecipePermissions(BasePermission):
@@ -51,26 +79,169 @@ class RecipeViewSet(viewsets.ModelViewSet):
     permission_classes = [RecipePermissions]
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilter
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [
+        NormalizedJSONRenderer
+    ]
+
+    def is_normalized(self):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return (
+            self.action in FIELDSET_ACTIONS
+            and isinstance(renderer, NormalizedJSONRenderer)
+        )
+
+    def get_fieldset(self):
+        if self.action not in FIELDSET_ACTIONS:
+            return None
+        if not hasattr(self, '_fieldset'):
+            fieldset = Fieldset.from_query_params(self.request.query_params)
+            if self.is_normalized():
+                fieldset = fieldset or Fieldset()
+                fieldset.expand = set()
+            self._fieldset = fieldset
+        return self._fieldset
+
+    def _include_related(self, data):
+        recipes = data['results'] if 'results' in data else [data]
+        author_ids = {
+            recipe['author'] for recipe in recipes if 'author' in recipe
+        }
+        ingredient_ids = {
+            ingredient['id']
+            for recipe in recipes
+            for ingredient in recipe.get('ingredients', ())
+        }
+        context = super().get_serializer_context()
+        user = self.request.user
+        authors = User.objects.filter(pk__in=author_ids).annotate(
+            is_subscribed=Exists(Subscription.objects.filter(
+                subscriber=user,
+                author=OuterRef('pk')
+            ) if user.is_authenticated else Subscription.objects.none())
+        )
+        included = {
+            'users': {
+                author['id']: author for author in UserSerializer(
+                    authors,
+                    many=True,
+                    context=context
+                ).data
+            },
+            'ingredients': {
+                ingredient['id']: ingredient for ingredient in (
+                    IngredientSerializer(
+                        Ingredient.objects.filter(pk__in=ingredient_ids),
+                        many=True
+                    ).data
+                )
+            },
+        }
+        if 'results' in data:
+            return dict(data, included=included)
+        return {'data': data, 'included': included}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            self.is_normalized()
+            and response.status_code == status.HTTP_200_OK
+            and isinstance(response.data, dict)
+        ):
+            response.data = self._include_related(response.data)
+        if (
+            self.is_multi_get()
+            and response.status_code == status.HTTP_200_OK
+        ):
+            response = self._conditional_response(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def is_multi_get(self):
+        return (
+            self.action == 'list' and IDS_PARAM in self.request.query_params
+        )
+
+    def _conditional_response(self, request, response):
+        renderer = getattr(request, 'accepted_renderer', None)
+        digest = hashlib.md5(FastJSONRenderer().render(response.data))
+        digest.update(getattr(renderer, 'media_type', '').encode())
+        etag = quote_etag(digest.hexdigest())
+        response = get_conditional_response(
+            request, etag=etag, response=response
+        )
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_multi_get():
+            return super().list(request, *args, **kwargs)
+        try:
+            recipe_ids = list(dict.fromkeys(
+                int(item)
+                for item in request.query_params[IDS_PARAM].split(',')
+                if item.strip()
+            ))
+        except ValueError:
+            return Response(
+                {IDS_PARAM: 'Неверный формат идентификатора.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not recipe_ids or len(recipe_ids) > MAX_MULTI_GET_SIZE:
+            return Response(
+                {IDS_PARAM: (
+                    f'Укажите от 1 до {MAX_MULTI_GET_SIZE} рецептов.'
+                )},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        recipes = {
+            recipe.pk: recipe
+            for recipe in self.get_queryset().filter(pk__in=recipe_ids)
+        }
+        serializer = self.get_serializer(
+            [recipes[pk] for pk in recipe_ids if pk in recipes], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in recipe_ids if pk not in recipes],
+        })
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
 
     def get_queryset(self):
         user = self.request.user
-        favorite_subquery = Favorite.objects.filter(
-            recipe=OuterRef('pk'),
-            user=user
-        ) if user.is_authenticated else Favorite.objects.none()
-        shopping_cart_subquery = ShoppingCart.objects.filter(
-            recipe=OuterRef('pk'),
-            user=user
-        ) if user.is_authenticated else ShoppingCart.objects.none()
-        queryset = Recipe.objects.select_related('author').prefetch_related(
-            'recipe_ingredients__ingredient',
-            'favorite',
-            'shoppingcart',
-        ).annotate(
-            is_favorited=Exists(favorite_subquery),
-            is_in_shopping_cart=Exists(shopping_cart_subquery)
-        ).all()
-        return queryset
+        fieldset = self.get_fieldset() or Fieldset()
+        queryset = Recipe.objects.defer('search_vector', *(
+            name for name in DEFERRABLE_FIELDS
+            if not fieldset.includes(name)
+        ))
+        if fieldset.expands('author'):
+            queryset = queryset.select_related('author')
+        if fieldset.expands('ingredients'):
+            queryset = queryset.prefetch_related(
+                'recipe_ingredients__ingredient'
+            )
+        elif fieldset.includes('ingredients'):
+            queryset = queryset.prefetch_related('recipe_ingredients')
+        annotations = {}
+        if fieldset.includes('is_favorited'):
+            annotations['is_favorited'] = Exists(Favorite.objects.filter(
+                recipe=OuterRef('pk'),
+                user=user
+            ) if user.is_authenticated else Favorite.objects.none())
+        if fieldset.includes('is_in_shopping_cart'):
+            annotations['is_in_shopping_cart'] = Exists(
+                ShoppingCart.objects.filter(
+                    recipe=OuterRef('pk'),
+                    user=user
+                ) if user.is_authenticated else ShoppingCart.objects.none()
+            )
+        return queryset.annotate(**annotations)
+
+    def perform_destroy(self, instance):
+        delete_recipes([instance.pk])
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -91,6 +262,112 @@ class RecipeViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(recipes, many=True)
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='what-can-i-cook',
+        url_name='what-can-i-cook'
+    )
+    def what_can_i_cook(self, request):
+        try:
+            pantry = {
+                int(item)
+                for item in request.query_params.get('pantry', '').split(',')
+                if item.strip()
+            }
+        except ValueError:
+            return Response(
+                {'pantry': 'Неверный формат идентификатора.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not pantry or len(pantry) > MAX_PANTRY_SIZE:
+            return Response(
+                {'pantry': (
+                    f'Укажите от 1 до {MAX_PANTRY_SIZE} ингредиентов.'
+                )},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        recipe_ids, coverage, missing = ingredient_index.rank_pantry(pantry)
+        if len(recipe_ids):
+            # The index may lag behind deletions; drop them before paging
+            # so that counts and page sizes stay right.
+            live = np.fromiter(Recipe.objects.filter(
+                pk__in=id_list(Recipe.objects.all(), recipe_ids)
+            ).values_list('pk', flat=True), dtype=np.int64)
+            keep = np.isin(recipe_ids, live)
+            recipe_ids, coverage, missing = (
+                recipe_ids[keep], coverage[keep], missing[keep]
+            )
+        positions = self.paginate_queryset(range(len(recipe_ids)))
+        scores = {
+            int(recipe_ids[position]): (
+                float(coverage[position]), int(missing[position])
+            )
+            for position in positions
+        }
+        recipes = self.get_queryset().filter(pk__in=list(scores))
+        recipes = sorted(recipes, key=lambda recipe: (
+            -scores[recipe.pk][0], scores[recipe.pk][1], recipe.pk
+        ))
+        for recipe in recipes:
+            recipe.coverage, recipe.missing_count = scores[recipe.pk]
+        serializer = PantryRecipeSerializer(
+            recipes,
+            many=True,
+            context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        recipe_ids = self.paginate_queryset(get_trending_ids())
+        positions = {
+            recipe_id: index for index, recipe_id in enumerate(recipe_ids)
+        }
+        recipes = sorted(
+            self.get_queryset().filter(pk__in=recipe_ids),
+            key=lambda recipe: positions[recipe.pk]
+        )
+        serializer = self.get_serializer(recipes, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        url_name='import',
+        permission_classes=[permissions.IsAuthenticated],
+        parser_classes=[NDJSONParser]
+    )
+    def import_recipes(self, request):
+        lines = request.data
+        if not lines:
+            return Response(
+                {'detail': 'Передайте рецепты в формате NDJSON.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(lines) > IMPORT_MAX_RECORDS:
+            return Response(
+                {'detail': (
+                    f'Не более {IMPORT_MAX_RECORDS} рецептов за один запрос.'
+                )},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(import_recipes(lines, request.user))
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        recipe = get_object_or_404(Recipe.objects.only('pk'), pk=pk)
+        recipes = Recipe.objects.filter(
+            similar_to__recipe=recipe
+        ).order_by('similar_to__rank')
+        serializer = ShortRecipeSerializer(
+            recipes,
+            many=True,
+            context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
     def _handle_add_remove(
         self, request, model, serializer_class, exists_error, not_found_error, pk=None
     ):
@@ -110,21 +387,25 @@ class RecipeViewSet(viewsets.ModelViewSet):
             )
             serializer.is_valid(raise_exception=True)
             instance = serializer.save(user=user)
+            record_event(model, recipe.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         if request.method != 'DELETE':
             return Response(
                 {'errors': 'Метод не поддерживается'},
                 status=status.HTTP_405_METHOD_NOT_ALLOWED
             )
-        deleted_count, _ = model.objects.filter(
-            user=user,
-            recipe=recipe
-        ).delete()
+        instance = model.objects.filter(user=user, recipe=recipe).first()
+        deleted_count = 0
+        if instance is not None:
+            deleted_count, _ = model.objects.filter(pk=instance.pk).delete()
         if deleted_count == 0:
             return Response(
                 {'errors': not_found_error},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        record_event(
+            model, recipe.id, added=False, created_at=instance.created_at
+        )
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -153,7 +434,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
     def generate_shopping_list_file(self, user):
         ingredients = IngredientInRecipe.objects.filter(
-            recipe__shoppingcart__user=user
+            recipe__shoppingcart__user=user,
+            recipe__deleted_at__isnull=True
         ).select_related('ingredient').values(
             'ingredient__name',
             'ingredient__measurement_unit'
@@ -189,12 +471,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
     def get_recipe_link(self, request, pk=None):
         recipe = self.get_object()
-        code = str(recipe.id)
+        code = encode(recipe.id)
         short_path = reverse('short-link', kwargs={'code': code})
         short_url = request.build_absolute_uri(short_path).rstrip('/')
         return Response({'short-link': short_url})
 
 
-def short_link_redirect(request, code: int):
-    recipe = get_object_or_404(Recipe, pk=code)
-    return redirect(f'/recipes/{recipe.id}')
+@require_safe
+def short_link_redirect(request, code):
+    recipe_id = decode(code)
+    if recipe_id is None or recipe_id not in live_recipe_ids:
+        response = HttpResponseNotFound()
+        if recipe_id is not None and live_recipe_ids.is_unseen(recipe_id):
+            add_never_cache_headers(response)
+        else:
+            patch_cache_control(
+                response, public=True, max_age=SHORT_LINK_MISS_CACHE_SECONDS
+            )
+        return response
+    response = redirect(f'/recipes/{recipe_id}')
+    patch_cache_control(
+        response, public=True, max_age=SHORT_LINK_CACHE_SECONDS
+    )
+    return response
@@ -0,0 +1,38 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+MESSAGEPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(
+            data, default=self.encoder_class().default, option=options
+        )
+
+
+class NormalizedJSONRenderer(FastJSONRenderer):
+
+    media_type = 'application/vnd.foodgram.normalized+json'
+    format = 'normalized'
+
+
+class MessagePackRenderer(BaseRenderer):
+
+    media_type = MESSAGEPACK_MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=JSONEncoder().default)
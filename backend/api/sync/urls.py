@@ -0,0 +1,13 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from api.sync.views import SyncViewSet
+
+app_name = 'sync'
+
+router = DefaultRouter()
+router.register('sync', SyncViewSet, basename='sync')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,81 @@
+from rest_framework import permissions, status, viewsets
+from rest_framework.response import Response
+
+from api.fieldsets import Fieldset
+from api.recipes.serializers import IngredientSerializer, RecipeReadSerializer
+from recipes_app.constants import SYNC_BATCH_SIZE, SYNC_MAX_BATCH_SIZE
+from recipes_app.models import ChangeLog, Ingredient, Recipe
+from recipes_app.sync import (format_cursor, is_expired, parse_cursor,
+                              read_changes)
+
+RECIPE_FIELDSET = Fieldset(
+    omit={'is_favorited', 'is_in_shopping_cart'}, expand=set()
+)
+
+
+class SyncViewSet(viewsets.ViewSet):
+
+    permission_classes = [permissions.AllowAny]
+
+    def _load(self, queryset, object_ids):
+        objects = {obj.pk: obj for obj in queryset.filter(pk__in=object_ids)}
+        return (
+            [objects[pk] for pk in object_ids if pk in objects],
+            [pk for pk in object_ids if pk not in objects]
+        )
+
+    def _recipes(self):
+        queryset = Recipe.objects.defer('search_vector')
+        if RECIPE_FIELDSET.expands('author'):
+            queryset = queryset.select_related('author')
+        if RECIPE_FIELDSET.expands('ingredients'):
+            return queryset.prefetch_related(
+                'recipe_ingredients__ingredient'
+            )
+        return queryset.prefetch_related('recipe_ingredients')
+
+    def list(self, request):
+        cursor = parse_cursor(request.query_params.get('since', '0'))
+        limit = request.query_params.get('limit', '')
+        if cursor is None:
+            return Response(
+                {'since': 'Неверный курсор.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(
+            int(limit) if limit.isdigit() and int(limit) else SYNC_BATCH_SIZE,
+            SYNC_MAX_BATCH_SIZE
+        )
+        if is_expired(cursor):
+            return Response(
+                {
+                    'detail': (
+                        'Курсор устарел: выполните полную синхронизацию '
+                        'с since=0.'
+                    ),
+                    'reset': True,
+                },
+                status=status.HTTP_410_GONE
+            )
+        changes = read_changes(cursor, limit)
+        recipes, deleted_recipes = self._load(
+            self._recipes(), changes['changed'][ChangeLog.RECIPE]
+        )
+        ingredients, deleted_ingredients = self._load(
+            Ingredient.objects.all(),
+            changes['changed'][ChangeLog.INGREDIENT]
+        )
+        return Response({
+            'cursor': format_cursor(changes['cursor']),
+            'has_more': changes['has_more'],
+            'recipes': RecipeReadSerializer(
+                recipes,
+                many=True,
+                context={'request': request, 'fieldset': RECIPE_FIELDSET}
+            ).data,
+            'ingredients': IngredientSerializer(ingredients, many=True).data,
+            'deleted': {
+                'recipes': deleted_recipes,
+                'ingredients': deleted_ingredients,
+            },
+        })
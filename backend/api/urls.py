@@ -4,4 +4,6 @@ urlpatterns = [
     path('', include('api.users.urls')),
     path('auth/', include('djoser.urls.authtoken')),
     path('', include('api.recipes.urls')),
+    path('', include('api.profiling.urls')),
+    path('', include('api.sync.urls')),
 ]
\ No newline at end of file
@@ -27,7 +27,7 @@ class UserSerializer(serializers.ModelSerializer):
         validators=[
             EmailValidator(),
             UniqueValidator(
-                queryset=User.objects.all(),
+                queryset=User.all_objects.all(),
                 message='Пользователь с таким email уже зарегистрирован'
             )
         ]
@@ -36,7 +36,7 @@ class UserSerializer(serializers.ModelSerializer):
         validators=[
             validate_username,
             UniqueValidator(
-                queryset=User.objects.all(),
+                queryset=User.all_objects.all(),
                 message='Пользователь с таким username уже существует'
             )
         ]
@@ -58,6 +58,8 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context.get('request')
         return (
             request
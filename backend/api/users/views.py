@@ -1,15 +1,19 @@
 from django.contrib.auth import update_session_auth_hash
-from django.db.models import Count
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from api.users.serializers import (SetAvatarSerializer, SubscriptionSerializer,
                                    UserSerializer, UserSubscribeSerializer,
                                    UserWithRecipesSerializer)
+from recipes_app.export import export_ndjson, export_zip
 from users_app.constants import MAX_PAGE_SIZE, PAGE_SIZE
+from users_app.jobs import delete_users
 from users_app.models import Subscription, User                            
 
 
@@ -23,7 +27,9 @@ class LimitPageNumberPagination(PageNumberPagination):
 class UserViewSet(viewsets.ModelViewSet):
 
     lookup_value_regex = r'\d+'
-    queryset = User.objects.annotate(recipes_count=Count('recipes')).prefetch_related(
+    queryset = User.objects.annotate(recipes_count=Count(
+        'recipes', filter=Q(recipes__deleted_at__isnull=True)
+    )).prefetch_related(
         'recipes',
         'subscriptions',
     )
@@ -35,6 +41,12 @@ class UserViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
     
+    def perform_destroy(self, instance):
+        user = self.request.user
+        if instance != user and not user.is_staff:
+            raise PermissionDenied('Нельзя удалить другого пользователя.')
+        delete_users([instance.pk])
+
     @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def set_password(self, request):
         user = request.user
@@ -104,6 +116,24 @@ class UserViewSet(viewsets.ModelViewSet):
             user.avatar.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['get'], url_path='me/export')
+    def export(self, request):
+        user_ids = [request.user.pk]
+        if request.query_params.get('zip') in ('1', 'true'):
+            response = StreamingHttpResponse(
+                export_zip(user_ids), content_type='application/zip'
+            )
+            filename = f'foodgram-export-{request.user.pk}.zip'
+        else:
+            response = StreamingHttpResponse(
+                export_ndjson(user_ids), content_type='application/x-ndjson'
+            )
+            filename = f'foodgram-export-{request.user.pk}.ndjson'
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
 
 class SubscriptionViewSet(mixins.CreateModelMixin,
                          mixins.DestroyModelMixin,
@@ -115,7 +145,10 @@ class SubscriptionViewSet(mixins.CreateModelMixin,
     pagination_class = LimitPageNumberPagination
     
     def get_queryset(self):
-        return Subscription.objects.filter(subscriber=self.request.user)
+        return Subscription.objects.filter(
+            subscriber=self.request.user,
+            author__deleted_at__isnull=True
+        )
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -0,0 +1,94 @@
+import argparse
+import http.client
+import os
+import time
+import uuid
+from urllib.parse import urlsplit
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.files.base import ContentFile  # noqa: E402
+from django.core.files.storage import default_storage  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+
+def measure_wsgi(mode, path, requests):
+    client = Client()
+    transferred = 0
+    with override_settings(MEDIA_SERVE_MODE=mode):
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = client.get(path)
+            transferred += sum(
+                len(chunk) for chunk in response.streaming_content
+            ) if response.streaming else len(response.content)
+            response.close()
+        duration = time.perf_counter() - started
+    return duration, transferred, response
+
+
+def measure_http(url, path, requests):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    transferred = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        connection.request('GET', path)
+        response = connection.getresponse()
+        transferred += len(response.read())
+    duration = time.perf_counter() - started
+    connection.close()
+    return duration, transferred
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Сравнивает отдачу медиафайлов через Django и через '
+            'X-Accel-Redirect.'
+        )
+    )
+    parser.add_argument('--size', type=int, default=256 * 1024)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument(
+        '--url',
+        help=(
+            'Адрес nginx (например, http://localhost) для замера полного '
+            'пути X-Accel-Redirect; файл должен быть в общем томе media.'
+        )
+    )
+    args = parser.parse_args()
+
+    name = default_storage.save(
+        f'recipes/{uuid.uuid4()}.jpg', ContentFile(os.urandom(args.size))
+    )
+    path = settings.MEDIA_URL + name
+    try:
+        print(f'{"path":<26}{"req/s":>10}{"ms/req":>10}{"MB via python":>16}')
+        for mode in ('django', 'accel'):
+            duration, transferred, response = measure_wsgi(
+                mode, path, args.requests
+            )
+            print(
+                f'{"wsgi " + mode:<26}{args.requests / duration:>10.0f}'
+                f'{duration / args.requests * 1000:>10.3f}'
+                f'{transferred / 1024 / 1024:>16.1f}'
+            )
+        print(f'Cache-Control: {response["Cache-Control"]}')
+        if args.url:
+            duration, transferred = measure_http(args.url, path, args.requests)
+            print(
+                f'{"nginx " + args.url:<26}{args.requests / duration:>10.0f}'
+                f'{duration / args.requests * 1000:>10.3f}'
+                f'{0:>16.1f}'
+            )
+    finally:
+        default_storage.delete(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+import numpy as np  # noqa: E402
+
+from recipes_app.ingredient_index import (_group_pairs,  # noqa: E402
+                                          rank_by_coverage)
+
+
+def build_catalog(recipes, ingredients, seed):
+    rng = np.random.default_rng(seed)
+    per_recipe = rng.integers(3, 16, size=recipes)
+    recipe_ids = np.repeat(np.arange(1, recipes + 1), per_recipe)
+    popularity = rng.zipf(1.3, size=len(recipe_ids)) - 1
+    ingredient_ids = popularity % ingredients + 1
+    pairs = np.unique(recipe_ids * (ingredients + 1) + ingredient_ids)
+    recipe_ids, ingredient_ids = np.divmod(pairs, ingredients + 1)
+    postings = _group_pairs(ingredient_ids, recipe_ids)
+    sizes = np.bincount(recipe_ids).astype(np.int32)
+    return postings, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Ранжирование рецептов по содержимому кладовой.'
+    )
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--ingredients', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    postings, sizes = build_catalog(args.recipes, args.ingredients, args.seed)
+    print(
+        f'catalog: {args.recipes} recipes, '
+        f'{sum(len(p) for p in postings.values())} rows, '
+        f'built in {time.perf_counter() - started:.2f}s'
+    )
+    rng = np.random.default_rng(args.seed)
+    for pantry_size in (5, 20, 100):
+        timings = []
+        for _ in range(args.repeat):
+            pantry = rng.choice(
+                args.ingredients, size=pantry_size, replace=False
+            ) + 1
+            started = time.perf_counter()
+            recipe_ids, _, _ = rank_by_coverage(
+                [postings.get(int(key), np.empty(0, dtype=np.int64))
+                 for key in pantry],
+                sizes
+            )
+            timings.append(time.perf_counter() - started)
+        print(
+            f'pantry={pantry_size:>3}: '
+            f'median {statistics.median(timings) * 1000:.1f} ms, '
+            f'max {max(timings) * 1000:.1f} ms, '
+            f'{len(recipe_ids)} ranked'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from foodgram.profiling import ProfilingMiddleware  # noqa: E402
+
+
+def get_response(request):
+    return HttpResponse()
+
+
+def measure(handler, requests, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for request in requests:
+            handler(request)
+        timings.append((time.perf_counter() - started) / len(requests))
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Накладные расходы профилировщика без его активации.'
+    )
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    factory = RequestFactory()
+    requests = [
+        factory.get('/api/recipes/', {'page': index % 10, 'limit': 6})
+        for index in range(args.requests)
+    ]
+    middleware = ProfilingMiddleware(get_response)
+    bare = measure(get_response, requests, args.rounds)
+    wrapped = measure(middleware, requests, args.rounds)
+    print(f'bare handler:      {bare * 1e9:8.0f} ns/request')
+    print(f'with middleware:   {wrapped * 1e9:8.0f} ns/request')
+    print(f'overhead:          {(wrapped - bare) * 1e9:8.0f} ns/request')
+
+
+if __name__ == '__main__':
+    main()
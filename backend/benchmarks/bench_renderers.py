@@ -0,0 +1,71 @@
+import argparse
+import gzip
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.recipes.serializers import IngredientSerializer  # noqa: E402
+from api.recipes.views import RecipeViewSet  # noqa: E402
+from api.renderers import FastJSONRenderer, MessagePackRenderer  # noqa: E402
+from recipes_app.models import Ingredient  # noqa: E402
+
+RENDERERS = (
+    ('json', JSONRenderer()),
+    ('orjson', FastJSONRenderer()),
+    ('msgpack', MessagePackRenderer()),
+)
+
+
+def recipe_page(limit):
+    request = APIRequestFactory().get('/api/recipes/', {'limit': limit})
+    return RecipeViewSet.as_view({'get': 'list'})(request).data
+
+
+def ingredient_catalog():
+    return IngredientSerializer(Ingredient.objects.all(), many=True).data
+
+
+def measure(renderer, data, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        content = renderer.render(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings), content
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Время кодирования и размер ответа для разных форматов.'
+    )
+    parser.add_argument('--limits', default='10,100')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [
+        (f'recipes limit={limit}', recipe_page(int(limit)))
+        for limit in args.limits.split(',')
+    ]
+    payloads.append(('ingredients catalog', ingredient_catalog()))
+    print(
+        f'{"payload":<22}{"renderer":<10}{"encode, ms":>12}'
+        f'{"bytes":>12}{"gzip bytes":>12}'
+    )
+    for name, data in payloads:
+        for renderer_name, renderer in RENDERERS:
+            duration, content = measure(renderer, data, args.rounds)
+            print(
+                f'{name:<22}{renderer_name:<10}{duration * 1000:>12.2f}'
+                f'{len(content):>12}{len(gzip.compress(content)):>12}'
+            )
+
+
+if __name__ == '__main__':
+    main()
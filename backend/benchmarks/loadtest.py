@@ -0,0 +1,459 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, unquote, urlsplit
+
+import numpy as np
+
+VARIABLE = re.compile(r'{{\s*([\w.-]+)\s*}}')
+ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PERCENTILES = (50, 90, 99)
+NO_BODY_STATUSES = (204, 304)
+URL_SAFE = "/?&=%:+,;@!$'()*~"
+
+
+class Scenario:
+
+    def __init__(self, method, path, body=None, headers=None, weight=1.0):
+        self.method = method.upper()
+        self.path = quote(path, safe=URL_SAFE)
+        self.body = body.encode() if isinstance(body, str) else body
+        self.headers = headers or {}
+        self.weight = weight
+
+    @property
+    def endpoint(self):
+        path = self.path.partition('?')[0]
+        return f'{self.method} {ID_SEGMENT.sub("/{id}", path)}'
+
+
+def _substitute(value, variables, missing):
+    def replace(match):
+        if match.group(1) not in variables:
+            missing.add(match.group(1))
+            return match.group(0)
+        return variables[match.group(1)]
+
+    return VARIABLE.sub(replace, value)
+
+
+def _postman_items(items):
+    for item in items:
+        if 'item' in item:
+            yield from _postman_items(item['item'])
+        else:
+            yield item
+
+
+def _postman_auth(auth):
+    if not auth or auth.get('type') != 'apikey':
+        return {}
+    options = {row['key']: row['value'] for row in auth.get('apikey', [])}
+    if options.get('in', 'header') != 'header':
+        return {}
+    return {options.get('key', 'Authorization'): options.get('value', '')}
+
+
+def load_postman(path, variables, methods):
+    with open(path, encoding='utf-8') as stream:
+        collection = json.load(stream)
+    variables = dict(
+        {row['key']: row['value'] for row in collection.get('variable', [])},
+        **variables
+    )
+    scenarios, skipped = [], []
+    for item in _postman_items(collection.get('item', [])):
+        request = item['request']
+        if request['method'].upper() not in methods:
+            continue
+        url = request['url']
+        missing = set()
+        raw = _substitute(
+            url['raw'] if isinstance(url, dict) else url, variables, missing
+        )
+        headers = {
+            row['key']: _substitute(row['value'], variables, missing)
+            for row in request.get('header', [])
+            if not row.get('disabled')
+        }
+        auth = _postman_auth(request.get('auth', collection.get('auth')))
+        headers.update(
+            (key, _substitute(value, variables, missing))
+            for key, value in auth.items()
+        )
+        body = request.get('body') or {}
+        data = None
+        if body.get('mode') == 'raw' and body.get('raw'):
+            data = _substitute(body['raw'], variables, missing)
+            headers.setdefault('Content-Type', 'application/json')
+        if missing:
+            skipped.append((item.get('name', raw), sorted(missing)))
+            continue
+        parts = urlsplit(raw)
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        scenarios.append(Scenario(request['method'], path, data, headers))
+    return scenarios, skipped
+
+
+def load_log(path, methods):
+    scenarios = []
+    with open(path, encoding='utf-8') as stream:
+        for line in stream:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row.get('method', 'GET').upper() not in methods:
+                continue
+            body = row.get('body')
+            if body is not None and not isinstance(body, str):
+                body = json.dumps(body)
+            scenarios.append(Scenario(
+                row.get('method', 'GET'),
+                row['path'],
+                body,
+                row.get('headers'),
+                float(row.get('weight', 1))
+            ))
+    return scenarios
+
+
+class HTTPClient:
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def _read_head(self):
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        headers = {}
+        for line in header_lines:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        return int(status_line.split()[1]), headers
+
+    async def _read_body(self, method, status, headers):
+        if method == 'HEAD' or status < 200 or status in NO_BODY_STATUSES:
+            return b''
+        if 'content-length' in headers:
+            return await self.reader.readexactly(
+                int(headers['content-length'])
+            )
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if not size:
+                    await self.reader.readline()
+                    return b''.join(chunks)
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+        body = await self.reader.read()
+        await self.close()
+        return body
+
+    async def request(self, scenario):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        body = scenario.body or b''
+        lines = [
+            f'{scenario.method} {scenario.path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            f'Content-Length: {len(body)}',
+        ]
+        lines.extend(
+            f'{key}: {value}' for key, value in scenario.headers.items()
+        )
+        self.writer.write(
+            '\r\n'.join(lines).encode('latin-1') + b'\r\n\r\n' + body
+        )
+        await self.writer.drain()
+        status, headers = await self._read_head()
+        while 100 <= status < 200 and status != 101:
+            status, headers = await self._read_head()
+        await self._read_body(scenario.method, status, headers)
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status
+
+
+class WSGIClient:
+
+    def __init__(self, application, executor):
+        self.application = application
+        self.executor = executor
+
+    def _call(self, scenario):
+        path, _, query = scenario.path.partition('?')
+        body = scenario.body or b''
+        environ = {
+            'REQUEST_METHOD': scenario.method,
+            'PATH_INFO': unquote(path, encoding='latin-1'),
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_HOST': 'localhost',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for key, value in scenario.headers.items():
+            name = key.upper().replace('-', '_')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            environ[name] = value
+        status = []
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split()[0]))
+
+        result = self.application(environ, start_response)
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0]
+
+    async def request(self, scenario):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, self._call, scenario
+        )
+
+    async def close(self):
+        pass
+
+
+async def _worker(client, picks, deadline, results):
+    try:
+        for scenario in picks:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            started = time.perf_counter()
+            try:
+                status = await client.request(scenario)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as error:
+                status = type(error).__name__
+                await client.close()
+            results.append(
+                (scenario.endpoint, status, time.perf_counter() - started)
+            )
+    finally:
+        await client.close()
+
+
+async def run(scenarios, make_client, concurrency, requests, duration, seed):
+    rng = random.Random(seed)
+    weights = [scenario.weight for scenario in scenarios]
+    per_client = -(-requests // concurrency) if requests else 10 ** 9
+    deadline = time.perf_counter() + duration if duration else None
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(
+            make_client(),
+            (
+                rng.choices(scenarios, weights)[0]
+                for _ in range(per_client)
+            ),
+            deadline,
+            results
+        )
+        for _ in range(concurrency)
+    ))
+    return results, time.perf_counter() - started
+
+
+def _summarize(rows, elapsed):
+    latencies = np.array([row[2] for row in rows]) * 1000
+    statuses = {}
+    for _, status, _ in rows:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(
+        count for status, count in statuses.items()
+        if not status.isdigit() or int(status) >= 500
+    )
+    summary = {
+        'requests': len(rows),
+        'rps': round(len(rows) / elapsed, 1),
+        'error_rate': round(errors / len(rows), 4),
+        'statuses': statuses,
+        'mean_ms': round(float(latencies.mean()), 2),
+        'max_ms': round(float(latencies.max()), 2),
+    }
+    for percentile, value in zip(
+        PERCENTILES, np.percentile(latencies, PERCENTILES)
+    ):
+        summary[f'p{percentile}_ms'] = round(float(value), 2)
+    return summary
+
+
+def build_report(results, elapsed, options):
+    endpoints = {}
+    for row in results:
+        endpoints.setdefault(row[0], []).append(row)
+    return {
+        'options': options,
+        'elapsed_seconds': round(elapsed, 2),
+        'total': _summarize(results, elapsed) if results else {},
+        'endpoints': {
+            endpoint: _summarize(rows, elapsed)
+            for endpoint, rows in endpoints.items()
+        },
+    }
+
+
+def print_report(report, baseline=None):
+    columns = ('rps', 'p50_ms', 'p90_ms', 'p99_ms', 'error_rate')
+    print(f'{"endpoint":<50}' + ''.join(f'{name:>14}' for name in columns))
+    rows = [('total', report['total'])] + sorted(report['endpoints'].items())
+    for endpoint, summary in rows:
+        if not summary:
+            continue
+        previous = (
+            baseline['total'] if endpoint == 'total'
+            else baseline['endpoints'].get(endpoint)
+        ) if baseline else None
+        cells = []
+        for name in columns:
+            cell = f'{summary[name]:g}'
+            if previous and previous.get(name):
+                change = (summary[name] - previous[name]) / previous[name]
+                cell = f'{cell} ({change:+.0%})'
+            cells.append(f'{cell:>14}')
+        print(f'{endpoint[:49]:<50}' + ''.join(cells))
+
+
+def _variables(pairs):
+    variables = {}
+    for pair in pairs:
+        key, separator, value = pair.partition('=')
+        if not separator:
+            raise SystemExit(f'Ожидается имя=значение: {pair}')
+        variables[key] = value
+    return variables
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Нагрузочный прогон по коллекции Postman и журналам запросов.'
+        )
+    )
+    parser.add_argument('--postman', action='append', default=[])
+    parser.add_argument('--log', action='append', default=[])
+    parser.add_argument('--var', action='append', default=[])
+    parser.add_argument('--token')
+    parser.add_argument('--methods', default=','.join(SAFE_METHODS))
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--wsgi', action='store_true')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--duration', type=float, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    methods = {method.strip().upper() for method in args.methods.split(',')}
+    variables = _variables(args.var)
+    if args.token:
+        variables.setdefault('userToken', args.token)
+    scenarios = []
+    for path in args.postman:
+        loaded, skipped = load_postman(path, variables, methods)
+        scenarios.extend(loaded)
+        for name, missing in skipped:
+            print(
+                f'пропущен «{name}»: нет {", ".join(missing)}',
+                file=sys.stderr
+            )
+    for path in args.log:
+        scenarios.extend(load_log(path, methods))
+    if not scenarios:
+        raise SystemExit('Нет сценариев для прогона.')
+    if args.token:
+        for scenario in scenarios:
+            scenario.headers.setdefault(
+                'Authorization', f'Token {args.token}'
+            )
+
+    if args.wsgi:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+        from django.core.wsgi import get_wsgi_application
+
+        application = get_wsgi_application()
+        executor = ThreadPoolExecutor(args.threads)
+
+        def make_client():
+            return WSGIClient(application, executor)
+
+        target = 'wsgi'
+    else:
+        parts = urlsplit(args.url)
+
+        def make_client():
+            return HTTPClient(parts.hostname, parts.port or 80)
+
+        target = args.url
+
+    results, elapsed = asyncio.run(run(
+        scenarios, make_client, args.concurrency, args.requests,
+        args.duration, args.seed
+    ))
+    report = build_report(results, elapsed, {
+        'target': target,
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'duration': args.duration,
+        'seed': args.seed,
+        'scenarios': len(scenarios),
+    })
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as stream:
+            baseline = json.load(stream)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as stream:
+            json.dump(
+                report, stream, ensure_ascii=False, indent=2, sort_keys=True
+            )
+            stream.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import hashlib
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE = 'primary_db_until'
+STICKY_CACHE_PREFIX = 'primary-db-sticky:'
+PRIMARY_ONLY_APPS = ('authtoken', 'sessions', 'django_cache')
+LAG_QUERIES = {
+    'postgresql': (
+        'SELECT pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), '
+        'EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())'
+    ),
+}
+DEFAULT_LAG_QUERY = 'SELECT 1, 0'
+
+_state = threading.local()
+_health = {}
+_health_lock = threading.Lock()
+
+
+def _measure_lag(alias):
+    connection = connections[alias]
+    query = LAG_QUERIES.get(connection.vendor, DEFAULT_LAG_QUERY)
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        caught_up, seconds = cursor.fetchone()
+    if caught_up:
+        return 0.0
+    return float(seconds or 0)
+
+
+def mark_unhealthy(alias):
+    with _health_lock:
+        _health[alias] = (
+            False,
+            time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+        )
+
+
+def is_healthy(alias):
+    with _health_lock:
+        healthy, expires_at = _health.get(alias, (None, 0))
+    if time.monotonic() < expires_at:
+        return healthy
+    try:
+        healthy = _measure_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    except DatabaseError:
+        healthy = False
+    with _health_lock:
+        _health[alias] = (
+            healthy,
+            time.monotonic() + (
+                settings.DATABASE_REPLICA_CHECK_SECONDS if healthy
+                else settings.DATABASE_REPLICA_RETRY_SECONDS
+            )
+        )
+    return healthy
+
+
+def choose_replica():
+    replicas = [
+        alias for alias in settings.DATABASE_REPLICAS if is_healthy(alias)
+    ]
+    return random.choice(replicas) if replicas else None
+
+
+def _sticky_cache_key(request):
+    credentials = request.META.get('HTTP_AUTHORIZATION', '')
+    if not credentials:
+        return None
+    return STICKY_CACHE_PREFIX + hashlib.sha256(
+        credentials.encode()
+    ).hexdigest()
+
+
+def _is_sticky(request):
+    try:
+        if float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    key = _sticky_cache_key(request)
+    return key is not None and _sticky_cache().get(key) is not None
+
+
+def _sticky_cache():
+    return caches[settings.DATABASE_REPLICA_STICKY_CACHE]
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return getattr(_state, 'replica', None) or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _state.replica = None
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.replica = None
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not _is_sticky(request)
+        ):
+            _state.replica = choose_replica()
+        _state.wrote = False
+        try:
+            response = self.get_response(request)
+            if settings.DATABASE_REPLICAS and getattr(_state, 'wrote', False):
+                self._stick_to_primary(request, response)
+            return response
+        finally:
+            _state.replica = None
+            _state.wrote = False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.replica_view = (view_func, view_args, view_kwargs)
+
+    def process_exception(self, request, exception):
+        replica = getattr(_state, 'replica', None)
+        view = getattr(request, 'replica_view', None)
+        if (
+            replica is None
+            or view is None
+            or request.method not in SAFE_METHODS
+            or not isinstance(exception, DatabaseError)
+        ):
+            return None
+        mark_unhealthy(replica)
+        _state.replica = None
+        view_func, view_args, view_kwargs = view
+        return view_func(request, *view_args, **view_kwargs)
+
+    def _stick_to_primary(self, request, response):
+        window = settings.DATABASE_REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite='Lax'
+        )
+        key = _sticky_cache_key(request)
+        if key is not None:
+            _sticky_cache().set(key, True, window)
@@ -0,0 +1,61 @@
+import mimetypes
+import posixpath
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import FileField
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from django.views.static import serve
+
+HASHED_NAME = re.compile(
+    r'[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}'
+)
+
+
+@lru_cache(maxsize=None)
+def upload_directories():
+    return tuple(sorted({
+        field.upload_to.strip('/') + '/'
+        for model in apps.get_models()
+        for field in model._meta.get_fields()
+        if isinstance(field, FileField) and isinstance(field.upload_to, str)
+    }))
+
+
+def cache_control(path):
+    stem = posixpath.splitext(posixpath.basename(path))[0]
+    if HASHED_NAME.search(stem):
+        return (
+            f'public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+        )
+    return f'public, max-age={settings.MEDIA_MAX_AGE}'
+
+
+def _authorize(path):
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith('..') or not path.startswith(upload_directories()):
+        raise PermissionDenied('Доступ к файлу запрещён.')
+    return path
+
+
+@require_safe
+def serve_media(request, path):
+    path = _authorize(path)
+    if settings.MEDIA_SERVE_MODE == 'accel':
+        response = HttpResponse(
+            content_type=(
+                mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            )
+        )
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(path)
+        )
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response['Cache-Control'] = cache_control(path)
+    return response
@@ -0,0 +1,328 @@
+import atexit
+import fcntl
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+PREFIX = 'foodgram_'
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+HISTOGRAM_BUCKETS = {
+    'http_request_duration_seconds': LATENCY_BUCKETS,
+    'db_queries_per_request': QUERY_COUNT_BUCKETS,
+    'db_seconds_per_request': LATENCY_BUCKETS,
+    'http_response_size_bytes': SIZE_BUCKETS,
+    'job_duration_seconds': LATENCY_BUCKETS + (30, 60, 300),
+    'job_queue_latency_seconds': LATENCY_BUCKETS + (30, 60, 300),
+}
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+EXITED_FILE = 'exited.json'
+MERGE_LOCK_FILE = 'merge.lock'
+
+
+class Registry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._name = f'{self._pid}-{uuid.uuid4().hex[:8]}'
+        self._owner = None
+        self._counters = {}
+        self._histograms = {}
+        self._flushed_at = 0
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+    def increment(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAM_BUCKETS[name]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            counts, total = self._histograms.get(
+                key, ([0] * (len(buckets) + 1), 0)
+            )
+            counts[bisect_left(buckets, value)] += 1
+            self._histograms[key] = (counts, total + value)
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            self._check_fork()
+            elapsed = now - self._flushed_at
+            if not force and elapsed < settings.METRICS_FLUSH_SECONDS:
+                return
+            self._flushed_at = now
+            snapshot = _snapshot(self._counters, self._histograms)
+            name = self._name
+            if self._owner is None:
+                os.makedirs(settings.METRICS_DIR, exist_ok=True)
+                self._owner = open(_path(f'{name}.lock'), 'w')
+                fcntl.flock(self._owner, fcntl.LOCK_EX)
+        _write(_path(f'{name}.json'), snapshot)
+
+
+def _path(name):
+    return os.path.join(settings.METRICS_DIR, name)
+
+
+def _write(path, snapshot):
+    with open(f'{path}.tmp', 'w') as stream:
+        json.dump(snapshot, stream)
+    os.replace(f'{path}.tmp', path)
+
+
+def _snapshot(counters, histograms):
+    return {
+        'counters': [
+            [name, labels, value]
+            for (name, labels), value in counters.items()
+        ],
+        'histograms': [
+            [name, labels, counts, total]
+            for (name, labels), (counts, total) in histograms.items()
+        ],
+    }
+
+
+def _merge(snapshot, counters, histograms):
+    for name, labels, value in snapshot['counters']:
+        key = (name, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, counts, total in snapshot['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        merged_counts, merged_total = histograms.get(
+            key, ([0] * len(counts), 0)
+        )
+        histograms[key] = (
+            [a + b for a, b in zip(merged_counts, counts)],
+            merged_total + total
+        )
+
+
+def _load(path):
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_alive(name):
+    try:
+        with open(_path(f'{name}.lock')) as owner:
+            fcntl.flock(owner, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+def _fold_exited(paths):
+    counters, histograms = {}, {}
+    exited = _load(_path(EXITED_FILE))
+    if exited is not None:
+        _merge(exited, counters, histograms)
+    folded = []
+    for path in paths:
+        name = os.path.basename(path)[:-len('.json')]
+        if _is_alive(name):
+            continue
+        snapshot = _load(path)
+        if snapshot is not None:
+            _merge(snapshot, counters, histograms)
+        folded.append(name)
+    if not folded:
+        return
+    _write(_path(EXITED_FILE), _snapshot(counters, histograms))
+    for name in folded:
+        for suffix in ('.json', '.lock'):
+            try:
+                os.remove(_path(name + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def clear_metrics_dir():
+    shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+
+
+registry = Registry()
+atexit.register(lambda: registry.flush(force=True))
+gauge_collectors = []
+
+
+def register_gauges(collector):
+    gauge_collectors.append(collector)
+
+
+def count_cache(cache_name, hit):
+    registry.increment(
+        'cache_requests_total',
+        {'cache': cache_name, 'result': 'hit' if hit else 'miss'}
+    )
+
+
+def collect():
+    registry.flush(force=True)
+    counters, histograms = {}, {}
+    with open(_path(MERGE_LOCK_FILE), 'a') as merge_lock:
+        fcntl.flock(merge_lock, fcntl.LOCK_EX)
+        _fold_exited([
+            path for path in glob.glob(_path('*.json'))
+            if os.path.basename(path) != EXITED_FILE
+        ])
+        for path in glob.glob(_path('*.json')):
+            snapshot = _load(path)
+            if snapshot is not None:
+                _merge(snapshot, counters, histograms)
+    return counters, histograms
+
+
+def _format_labels(labels, extra=()):
+    pairs = [
+        '{}="{}"'.format(
+            key, str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for key, value in tuple(labels) + tuple(extra)
+    ]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def render():
+    counters, histograms = collect()
+    lines = []
+    gauges = {}
+    for collector in gauge_collectors:
+        for name, labels, value in collector():
+            gauges.setdefault(name, []).append((labels, value))
+    for name, samples in sorted(gauges.items()):
+        lines.append(f'# TYPE {PREFIX}{name} gauge')
+        for labels, value in samples:
+            lines.append(
+                f'{PREFIX}{name}{_format_labels(sorted(labels.items()))} '
+                f'{value}'
+            )
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f'# TYPE {PREFIX}{name} counter')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(
+                    f'{PREFIX}{name}{_format_labels(labels)} {value}'
+                )
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f'# TYPE {PREFIX}{name} histogram')
+        buckets = HISTOGRAM_BUCKETS[name]
+        for (metric, labels), (counts, total) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'{PREFIX}{name}_bucket'
+                    f'{_format_labels(labels, [("le", bound)])} {cumulative}'
+                )
+            lines.append(
+                f'{PREFIX}{name}_sum{_format_labels(labels)} {total}'
+            )
+            lines.append(
+                f'{PREFIX}{name}_count{_format_labels(labels)} {cumulative}'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def _can_read_metrics(request):
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'
+    ):
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+def metrics_view(request):
+    if not _can_read_metrics(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
+
+
+def _view_labels(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return {'view': 'unresolved', 'action': ''}
+    actions = getattr(match.func, 'actions', None) or {}
+    return {
+        'view': match.view_name or match.route,
+        'action': actions.get(request.method.lower(), ''),
+    }
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = {'queries': 0, 'seconds': 0.0}
+
+        def timer(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats['queries'] += 1
+                stats['seconds'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        labels = dict(_view_labels(request), method=request.method)
+        registry.increment(
+            'http_requests_total',
+            dict(labels, status=str(response.status_code))
+        )
+        registry.observe('http_request_duration_seconds', labels, duration)
+        registry.observe('db_queries_per_request', labels, stats['queries'])
+        registry.observe('db_seconds_per_request', labels, stats['seconds'])
+        if not response.streaming:
+            registry.observe(
+                'http_response_size_bytes', labels, len(response.content)
+            )
+        registry.flush()
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={stats["seconds"] * 1000:.1f};'
+            f'desc="{stats["queries"]} queries"'
+        )
+        return response
@@ -0,0 +1,49 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from foodgram.soft_delete import SoftDeleteManager
+
+ESTIMATE_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+
+    def _is_unfiltered(self, queryset):
+        manager = queryset.model._default_manager
+        return (
+            not queryset.query.where
+            or queryset.query.where == manager.all().query.where
+        )
+
+    def _estimate(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if (
+            connection.vendor != 'postgresql'
+            or not self._is_unfiltered(queryset)
+        ):
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < ESTIMATE_THRESHOLD:
+            return None
+        estimate = int(row[0])
+        if queryset.query.where and isinstance(
+            queryset.model._default_manager, SoftDeleteManager
+        ):
+            estimate -= queryset.model._base_manager.using(
+                queryset.db
+            ).filter(deleted_at__isnull=False).count()
+        return max(estimate, 0)
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None:
+            return estimate
+        return super().count
@@ -0,0 +1,118 @@
+import cProfile
+import os
+import pstats
+import re
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+
+HEADER = 'HTTP_X_PROFILE'
+QUERY_PARAM = '_profile'
+SALT = 'foodgram.profiling'
+SUFFIX = '.prof'
+PROFILE_ID = re.compile(r'^[\w.-]+\.prof$')
+UNSAFE_CHARS = re.compile(r'[^\w-]+')
+
+
+def issue_token(user):
+    return signing.dumps({'user': user.pk}, salt=SALT)
+
+
+def _token_from_request(request):
+    token = request.META.get(HEADER)
+    if token:
+        return token
+    if QUERY_PARAM in request.META.get('QUERY_STRING', ''):
+        return request.GET.get(QUERY_PARAM)
+    return None
+
+
+def _is_authorized(token):
+    try:
+        payload = signing.loads(
+            token, salt=SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return get_user_model().objects.filter(
+        pk=payload.get('user'), is_staff=True
+    ).exists()
+
+
+def profile_path(profile_id):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, profile_id)
+    return path if os.path.isfile(path) else None
+
+
+def list_profiles():
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    entries = [
+        entry for entry in os.scandir(settings.PROFILE_DIR)
+        if entry.is_file() and entry.name.endswith(SUFFIX)
+    ]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return entries
+
+
+def _prune():
+    for entry in list_profiles()[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def _save(profiler, request, duration):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    slug = UNSAFE_CHARS.sub('_', request.path).strip('_')[:80]
+    profile_id = (
+        f'{time.time():.6f}-{request.method}-{slug}-'
+        f'{duration * 1000:.0f}ms{SUFFIX}'
+    )
+    profiler.dump_stats(os.path.join(settings.PROFILE_DIR, profile_id))
+    _prune()
+    return profile_id
+
+
+def top_functions(path, sort='cumulative', limit=30):
+    stats = pstats.Stats(path)
+    stats.sort_stats(sort)
+    rows = []
+    for function in stats.fcn_list[:limit]:
+        primitive, calls, total, cumulative, _ = stats.stats[function]
+        filename, line, name = function
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'primitive_calls': primitive,
+            'total_time': total,
+            'cumulative_time': cumulative,
+        })
+    return {'total_time': stats.total_tt, 'functions': rows}
+
+
+class ProfilingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _token_from_request(request)
+        if token is None or not _is_authorized(token):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        response['X-Profile-Id'] = _save(
+            profiler, request, time.perf_counter() - started
+        )
+        return response
@@ -0,0 +1,156 @@
+import logging
+import re
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger('foodgram.queries')
+
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+NUMBER = re.compile(r'\b\d+\b')
+STRING = re.compile(r"'(?:[^']|'')*'")
+STACK_DEPTH = 6
+
+
+class QueryInspectionError(Exception):
+    pass
+
+
+def fingerprint(sql):
+    sql = STRING.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    return IN_LIST.sub('IN (...)', sql)
+
+
+def _call_site():
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(base_dir)
+        and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return [
+        f'{frame.filename}:{frame.lineno} in {frame.name}'
+        for frame in frames[-STACK_DEPTH:]
+    ]
+
+
+class Report:
+
+    def __init__(self):
+        self.queries = 0
+        self.shapes = {}
+        self.slow = []
+
+    @property
+    def repeated(self):
+        threshold = settings.QUERY_INSPECTOR['REPEAT_THRESHOLD']
+        return sorted(
+            (
+                (shape, count, stack)
+                for shape, (count, stack) in self.shapes.items()
+                if count >= threshold
+            ),
+            key=lambda item: -item[1]
+        )
+
+    def summary(self):
+        return (
+            f'queries={self.queries}; repeated={len(self.repeated)}; '
+            f'slow={len(self.slow)}'
+        )
+
+    def describe(self):
+        lines = [self.summary()]
+        for shape, count, stack in self.repeated:
+            lines.append(f'{count}x {shape}')
+            lines.extend(f'    {frame}' for frame in stack)
+        for sql, duration, plan in self.slow:
+            lines.append(f'{duration:.1f} ms {sql}')
+            lines.extend(f'    {row}' for row in plan)
+        return '\n'.join(lines)
+
+
+class _Inspector:
+
+    def __init__(self, report):
+        self.report = report
+        self.explaining = False
+
+    def _explain(self, connection, sql, params):
+        self.explaining = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'{connection.ops.explain_query_prefix()} {sql}', params
+                )
+                return [
+                    ' '.join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                ]
+        except DatabaseError as error:
+            return [f'EXPLAIN failed: {error}']
+        finally:
+            self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self.report.queries += 1
+            shape = fingerprint(sql)
+            count, stack = self.report.shapes.get(shape, (0, None))
+            self.report.shapes[shape] = (count + 1, stack or _call_site())
+            slow_limit = settings.QUERY_INSPECTOR['SLOW_QUERY_MS']
+            if (
+                duration >= slow_limit
+                and not many
+                and sql.lstrip().upper().startswith('SELECT')
+            ):
+                self.report.slow.append((
+                    sql,
+                    duration,
+                    self._explain(context['connection'], sql, params)
+                ))
+
+
+@contextmanager
+def inspect_queries():
+    report = Report()
+    inspector = _Inspector(report)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield report
+
+
+class QueryInspectorMiddleware:
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with inspect_queries() as report:
+            response = self.get_response(request)
+        if report.repeated or report.slow:
+            message = f'{request.method} {request.path}: {report.describe()}'
+            if settings.QUERY_INSPECTOR['MODE'] == 'raise':
+                raise QueryInspectionError(message)
+            logger.warning(message)
+        response['X-Query-Inspector'] = report.summary()
+        for index, (shape, count, _) in enumerate(report.repeated[:3]):
+            response[f'X-Query-Inspector-Repeated-{index}'] = (
+                f'{count}x {shape[:200]}'
+            )
+        return response
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,10 +34,15 @@ INSTALLED_APPS = [
     'django_filters',
     'recipes_app',
     'users_app',
+    'jobs_app',
 ]
 
 MIDDLEWARE = [
+    'foodgram.metrics.MetricsMiddleware',
+    'foodgram.query_inspector.QueryInspectorMiddleware',
+    'foodgram.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'foodgram.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -67,7 +73,7 @@ WSGI_APPLICATION = 'foodgram.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
         'NAME': os.getenv('POSTGRES_DB', 'foodgram'),
         'USER': os.getenv('POSTGRES_USER', 'oleg'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', '123'),
@@ -76,6 +82,50 @@ DATABASES = {
     }
 }
 
+DB_REPLICA_HOSTS = [
+    host for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host
+]
+DB_REPLICA_NAMES = [
+    name for name in os.getenv('DB_REPLICA_NAMES', '').split(',') if name
+]
+
+DATABASE_REPLICAS = []
+
+for index in range(max(len(DB_REPLICA_HOSTS), len(DB_REPLICA_NAMES))):
+    replica = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if index < len(DB_REPLICA_HOSTS):
+        host, _, port = DB_REPLICA_HOSTS[index].partition(':')
+        replica.update(HOST=host, PORT=port or replica['PORT'])
+    if index < len(DB_REPLICA_NAMES):
+        replica['NAME'] = DB_REPLICA_NAMES[index]
+    DATABASES[f'replica_{index}'] = replica
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['foodgram.db_router.PrimaryReplicaRouter']
+
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.getenv('DB_REPLICA_STICKY_SECONDS', '5')
+)
+DATABASE_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '10'))
+DATABASE_REPLICA_CHECK_SECONDS = 5
+DATABASE_REPLICA_RETRY_SECONDS = 30
+DATABASE_REPLICA_STICKY_CACHE = 'replica_sticky'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    DATABASE_REPLICA_STICKY_CACHE: {
+        'BACKEND': os.getenv(
+            'DB_REPLICA_STICKY_CACHE_BACKEND',
+            'django.core.cache.backends.db.DatabaseCache'
+        ),
+        'LOCATION': os.getenv(
+            'DB_REPLICA_STICKY_CACHE_LOCATION', 'replica_sticky_cache'
+        ),
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -109,8 +159,43 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+MEDIA_SERVE_MODE = os.getenv(
+    'MEDIA_SERVE_MODE', 'django' if DEBUG else 'accel'
+)
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MEDIA_MAX_AGE = 60 * 60
+
+SHORT_LINK_SIGNATURE_LENGTH = int(
+    os.getenv('SHORT_LINK_SIGNATURE_LENGTH', '0')
+)
+SHORT_LINK_ALLOW_LEGACY = (
+    os.getenv('SHORT_LINK_ALLOW_LEGACY', 'False') == 'True'
+)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+METRICS_DIR = os.getenv(
+    'METRICS_DIR',
+    os.path.join(tempfile.gettempdir(), 'foodgram-metrics')
+)
+METRICS_FLUSH_SECONDS = 1
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+PROFILE_DIR = os.getenv(
+    'PROFILE_DIR',
+    os.path.join(tempfile.gettempdir(), 'foodgram-profiles')
+)
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '50'))
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+
+QUERY_INSPECTOR = {
+    'ENABLED': os.getenv('QUERY_INSPECTOR', 'False') == 'True',
+    'MODE': os.getenv('QUERY_INSPECTOR_MODE', 'warn'),
+    'REPEAT_THRESHOLD': int(os.getenv('QUERY_INSPECTOR_REPEAT', '5')),
+    'SLOW_QUERY_MS': float(os.getenv('QUERY_INSPECTOR_SLOW_MS', '100')),
+}
+
 REST_FRAMEWORK = {
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -121,6 +206,19 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
 
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'api.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
 
     'DEFAULT_PERMISSION_CLASSES': [
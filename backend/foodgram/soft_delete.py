@@ -0,0 +1,44 @@
+from django.db import models, transaction
+
+
+class SoftDeleteManager(models.Manager):
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteAdminMixin:
+
+    soft_delete_function = None
+
+    def soft_delete(self, ids):
+        type(self).soft_delete_function(ids)
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        return (
+            [str(obj) for obj in objs],
+            {self.model._meta.verbose_name_plural: len(objs)},
+            set(),
+            []
+        )
+
+    def delete_model(self, request, obj):
+        self.soft_delete([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        self.soft_delete(list(queryset.values_list('pk', flat=True)))
+
+
+def delete_in_batches(queryset, batch_size):
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(
+            queryset.order_by().values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            model._base_manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
@@ -1,21 +1,25 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from api.recipes.views import short_link_redirect
+from foodgram.media import serve_media
+from foodgram.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('s/<int:code>', short_link_redirect, name='short-link'),
+    path('s/<str:code>', short_link_redirect, name='short-link'),
     path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$',
+        serve_media,
+        name='media'
+    ),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
     urlpatterns += static(
         settings.STATIC_URL,
         document_root=settings.STATIC_ROOT
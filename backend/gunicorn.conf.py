@@ -0,0 +1,8 @@
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+
+
+def on_starting(server):
+    from foodgram.metrics import clear_metrics_dir
+    clear_metrics_dir()
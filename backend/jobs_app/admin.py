@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from foodgram.paginators import EstimatedCountPaginator
+from jobs_app.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+
+    list_display = (
+        'id', 'name', 'status', 'attempts', 'run_at', 'started_at',
+        'finished_at', 'locked_by'
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('dedup_key',)
+    readonly_fields = (
+        'created_at', 'started_at', 'finished_at', 'locked_by', 'progress'
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs_app'
+    verbose_name = 'Фоновые задачи'
+
+    def ready(self):
+        from foodgram.metrics import register_gauges
+        from jobs_app.worker import queue_gauges
+
+        register_gauges(queue_gauges)
+        autodiscover_modules('jobs')
@@ -0,0 +1,9 @@
+JOB_NAME_LENGTH = 128
+JOB_KEY_LENGTH = 255
+JOB_WORKER_LENGTH = 128
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 10
+JOB_RETRY_MAX_SECONDS = 60 * 60
+JOB_LEASE_SECONDS = 10 * 60
+JOB_POLL_SECONDS = 1.0
+JOB_ERROR_LENGTH = 10000
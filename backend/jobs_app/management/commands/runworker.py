@@ -0,0 +1,66 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs_app.constants import JOB_POLL_SECONDS
+from jobs_app.registry import registry
+from jobs_app.worker import Worker
+
+
+def _work(threads, poll_interval, burst):
+    worker = Worker(threads, poll_interval, burst)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Запускает обработчик фоновых задач из очереди в базе данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument(
+            '--poll-interval', type=float, default=JOB_POLL_SECONDS
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Выйти, когда очередь опустеет.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'Задачи: {", ".join(sorted(registry)) or "нет"}; '
+            f'процессов: {options["processes"]}, '
+            f'потоков: {options["threads"]}.'
+        )
+        arguments = (
+            options['threads'], options['poll_interval'], options['burst']
+        )
+        if options['processes'] <= 1:
+            _work(*arguments)
+            return
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=_work, args=arguments)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in processes:
+            process.join()
@@ -0,0 +1,60 @@
+import threading
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from jobs_app.constants import JOB_MAX_ATTEMPTS
+from jobs_app.models import Job
+
+registry = {}
+current = threading.local()
+
+
+class UnknownJob(Exception):
+    pass
+
+
+def job(name=None, max_attempts=JOB_MAX_ATTEMPTS):
+    def decorator(function):
+        job_name = name or f'{function.__module__}.{function.__name__}'
+        registry[job_name] = function
+        function.job_name = job_name
+        function.max_attempts = max_attempts
+        function.enqueue = (
+            lambda dedup_key=None, run_at=None, **payload: enqueue(
+                job_name, payload, dedup_key, run_at, max_attempts
+            )
+        )
+        return function
+    return decorator
+
+
+def enqueue(name, payload=None, dedup_key=None, run_at=None,
+            max_attempts=JOB_MAX_ATTEMPTS):
+    if name not in registry:
+        raise UnknownJob(name)
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'dedup_key': dedup_key,
+        'run_at': run_at or timezone.now(),
+        'max_attempts': max_attempts,
+    }
+    if dedup_key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(**fields)
+    except IntegrityError:
+        existing = Job.objects.filter(
+            dedup_key=dedup_key, status__in=Job.ACTIVE_STATUSES
+        ).first()
+        if existing is None:
+            raise
+        return existing
+
+
+def report_progress(**progress):
+    job_id = getattr(current, 'job_id', None)
+    if job_id is not None:
+        Job.objects.filter(pk=job_id).update(progress=progress)
@@ -0,0 +1,182 @@
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from foodgram.metrics import registry as metrics
+from jobs_app.constants import (JOB_ERROR_LENGTH, JOB_LEASE_SECONDS,
+                                JOB_POLL_SECONDS, JOB_RETRY_BASE_SECONDS,
+                                JOB_RETRY_MAX_SECONDS)
+from jobs_app.models import Job
+from jobs_app.registry import UnknownJob, current, registry
+
+
+def _claimable(now):
+    return (
+        Q(status=Job.QUEUED, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim(worker, limit):
+    now = timezone.now()
+    claimed = []
+    with transaction.atomic():
+        candidates = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(_claimable(now))
+            .order_by('run_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        for pk in candidates:
+            if Job.objects.filter(_claimable(now), pk=pk).update(
+                status=Job.RUNNING,
+                locked_by=worker,
+                locked_until=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                started_at=now,
+                attempts=F('attempts') + 1
+            ):
+                claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at'))
+
+
+def extend_lease(worker, job_ids):
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, locked_by=worker).update(
+            locked_until=timezone.now() + timedelta(seconds=JOB_LEASE_SECONDS)
+        )
+
+
+def backoff(attempts):
+    delay = min(
+        JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+
+def run_job(job, worker):
+    labels = {'job': job.name}
+    metrics.observe(
+        'job_queue_latency_seconds',
+        labels,
+        max((job.started_at - job.run_at).total_seconds(), 0)
+    )
+    started = time.perf_counter()
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError('Превышено число попыток: истекла аренда.')
+        function = registry.get(job.name)
+        if function is None:
+            raise UnknownJob(job.name)
+        current.job_id = job.pk
+        function(**job.payload)
+    except Exception:
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            result = 'retry'
+            fields = {
+                'status': Job.QUEUED,
+                'run_at': now + backoff(job.attempts),
+            }
+        else:
+            result = 'failed'
+            fields = {'status': Job.FAILED, 'finished_at': now}
+        Job.objects.filter(pk=job.pk, locked_by=worker).update(
+            last_error=traceback.format_exc()[-JOB_ERROR_LENGTH:],
+            locked_by='',
+            locked_until=None,
+            **fields
+        )
+    else:
+        result = 'done'
+        Job.objects.filter(pk=job.pk, locked_by=worker).update(
+            status=Job.DONE,
+            finished_at=timezone.now(),
+            locked_by='',
+            locked_until=None
+        )
+    finally:
+        current.job_id = None
+    metrics.increment('jobs_total', dict(labels, result=result))
+    metrics.observe(
+        'job_duration_seconds', labels, time.perf_counter() - started
+    )
+    metrics.flush()
+    return result
+
+
+def queue_gauges():
+    now = timezone.now()
+    rows = Job.objects.filter(
+        status__in=Job.ACTIVE_STATUSES
+    ).order_by().values('name', 'status').annotate(
+        count=Count('pk'), oldest=Min('run_at')
+    )
+    for row in rows:
+        labels = {'job': row['name'], 'status': row['status']}
+        yield 'jobs_active', labels, row['count']
+        if row['status'] == Job.QUEUED:
+            yield (
+                'jobs_oldest_queued_seconds',
+                {'job': row['name']},
+                max((now - row['oldest']).total_seconds(), 0)
+            )
+
+
+class Worker:
+
+    def __init__(self, threads, poll_interval=JOB_POLL_SECONDS, burst=False):
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.stopping = threading.Event()
+        self.in_flight = {}
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def _run(self, job):
+        try:
+            return run_job(job, self.name)
+        finally:
+            close_old_connections()
+
+    def run(self):
+        heartbeat_at = time.monotonic()
+        with ThreadPoolExecutor(
+            self.threads, thread_name_prefix='job'
+        ) as pool:
+            while not self.stopping.is_set():
+                self.in_flight = {
+                    pk: future for pk, future in self.in_flight.items()
+                    if not future.done()
+                }
+                free = self.threads - len(self.in_flight)
+                jobs = claim(self.name, free) if free else []
+                for job in jobs:
+                    self.in_flight[job.pk] = pool.submit(self._run, job)
+                if time.monotonic() - heartbeat_at > JOB_LEASE_SECONDS / 3:
+                    extend_lease(self.name, list(self.in_flight))
+                    heartbeat_at = time.monotonic()
+                if jobs and len(self.in_flight) < self.threads:
+                    continue
+                if self.in_flight:
+                    wait(
+                        list(self.in_flight.values()),
+                        timeout=self.poll_interval,
+                        return_when=FIRST_COMPLETED
+                    )
+                elif self.burst:
+                    break
+                else:
+                    self.stopping.wait(self.poll_interval)
+            close_old_connections()
@@ -0,0 +1,42 @@
+import pytest
+from rest_framework.test import APIClient
+
+from recipes_app.models import Ingredient, Recipe
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        email='author@foodgram.ru',
+        username='author',
+        first_name='Иван',
+        last_name='Иванов',
+        password='Pa55w0rd!'
+    )
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def ingredient():
+    return Ingredient.objects.create(name='картофель', measurement_unit='г')
+
+
+@pytest.fixture
+def make_recipe(user):
+    def make(name='Борщ', text='Классический борщ', **fields):
+        fields.setdefault('author', user)
+        return Recipe.objects.create(
+            name=name, text=text, cooking_time=30, **fields
+        )
+    return make
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import Group
+from django.test import Client
+from rest_framework.authtoken.models import Token
+
+from jobs_app.models import Job
+from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
+                                Recipe, ShoppingCart)
+from users_app.models import Subscription
+
+ADMIN_ROWS = 10
+ADMIN_MAX_QUERIES = 10
+
+
+@pytest.fixture
+def admin_client(django_user_model):
+    admin = django_user_model.objects.create_superuser(
+        email='admin@foodgram.ru',
+        username='admin',
+        first_name='Админ',
+        last_name='Админов',
+        password='Pa55w0rd!'
+    )
+    client = Client()
+    client.force_login(admin)
+    return client
+
+
+@pytest.mark.django_db
+def test_admin_delete_soft_deletes_recipe(admin_client, make_recipe):
+    recipe = make_recipe()
+
+    response = admin_client.post(
+        f'/admin/recipes_app/recipe/{recipe.id}/delete/', {'post': 'yes'}
+    )
+
+    assert response.status_code == 302
+    assert not Recipe.objects.filter(pk=recipe.id).exists()
+    assert Recipe.all_objects.get(pk=recipe.id).deleted_at is not None
+
+
+@pytest.fixture
+def admin_rows(django_user_model, user, make_recipe):
+    ingredients = [
+        Ingredient.objects.create(
+            name=f'ингредиент {index}', measurement_unit='г'
+        )
+        for index in range(ADMIN_ROWS)
+    ]
+    for index in range(ADMIN_ROWS):
+        author = django_user_model.objects.create_user(
+            email=f'cook{index}@foodgram.ru',
+            username=f'cook{index}',
+            first_name='Пётр',
+            last_name='Петров',
+            password='Pa55w0rd!'
+        )
+        Token.objects.create(user=author)
+        Subscription.objects.create(subscriber=user, author=author)
+        recipe = make_recipe(name=f'Рецепт {index}', author=author)
+        for ingredient in ingredients:
+            IngredientInRecipe.objects.create(
+                recipe=recipe, ingredient=ingredient, amount=100
+            )
+        Favorite.objects.create(user=author, recipe=recipe)
+        ShoppingCart.objects.create(user=author, recipe=recipe)
+        Group.objects.create(name=f'Группа {index}')
+        Job.objects.create(name='users.purge', payload={'user_id': index})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'model',
+    list(admin.site._registry),
+    ids=lambda model: model._meta.label
+)
+def test_admin_changelist_query_count(
+    admin_client, admin_rows, model, django_assert_max_num_queries
+):
+    opts = model._meta
+    url = f'/admin/{opts.app_label}/{opts.model_name}/'
+
+    with django_assert_max_num_queries(ADMIN_MAX_QUERIES):
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert response.context['cl'].result_count >= ADMIN_ROWS
@@ -0,0 +1,116 @@
+import base64
+import io
+
+import orjson
+import pytest
+from PIL import Image
+
+from recipes_app.models import IngredientInRecipe, Recipe
+
+URL = '/api/recipes/import/'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (2, 2)).save(buffer, format='PNG')
+    return 'data:image/png;base64,' + base64.b64encode(
+        buffer.getvalue()
+    ).decode()
+
+
+def _record(ingredient, **fields):
+    return dict({
+        'name': 'Пюре',
+        'text': 'Картофельное пюре',
+        'cooking_time': 20,
+        'ingredients': [{'id': ingredient.id, 'amount': 500}],
+    }, **fields)
+
+
+def _post(client, *records):
+    return client.post(
+        URL,
+        b'\n'.join(
+            record if isinstance(record, bytes) else orjson.dumps(record)
+            for record in records
+        ),
+        content_type='application/x-ndjson'
+    )
+
+
+@pytest.mark.django_db
+def test_import_creates_recipes(user, user_client, ingredient, media_root):
+    response = _post(
+        user_client,
+        _record(ingredient),
+        _record(ingredient, name='Драники', image=_png())
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['created'], data['failed']) == (2, 0)
+    recipes = {
+        recipe.name: recipe for recipe in Recipe.objects.filter(
+            pk__in=[result['id'] for result in data['results']]
+        )
+    }
+    assert set(recipes) == {'Пюре', 'Драники'}
+    assert all(recipe.author == user for recipe in recipes.values())
+    assert not recipes['Пюре'].image
+    assert (media_root / recipes['Драники'].image.name).exists()
+    assert IngredientInRecipe.objects.filter(
+        ingredient=ingredient, amount=500
+    ).count() == 2
+
+
+@pytest.mark.django_db
+def test_import_reports_errors_per_line(user_client, ingredient, make_recipe):
+    make_recipe(name='Борщ')
+
+    response = _post(
+        user_client,
+        _record(ingredient),
+        _record(ingredient, name='Суп', ingredients=[
+            {'id': 32000, 'amount': 1}
+        ]),
+        _record(ingredient, name='Щи', ingredients=[
+            {'id': ingredient.id, 'amount': 1},
+            {'id': ingredient.id, 'amount': 2},
+        ]),
+        _record(ingredient),
+        _record(ingredient, name='Борщ'),
+        b'{not json',
+        _record(ingredient, name='Рагу', cooking_time=0, text=''),
+        _record(ingredient, name='Каша', image='bm90IGFuIGltYWdl'),
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['created'], data['failed']) == (1, 7)
+    errors = {
+        result['line']: result['errors']
+        for result in data['results'] if 'errors' in result
+    }
+    assert errors[2] == {'ingredients': 'Ингредиенты не найдены: 32000.'}
+    assert errors[3] == {
+        'ingredients': 'Ингредиенты не должны повторяться.'
+    }
+    assert set(errors[4]) == set(errors[5]) == {'name'}
+    assert errors[6] == {'detail': 'Некорректный JSON.'}
+    assert set(errors[7]) == {'text', 'cooking_time'}
+    assert set(errors[8]) == {'image'}
+    assert list(
+        Recipe.objects.order_by('name').values_list('name', flat=True)
+    ) == ['Борщ', 'Пюре']
+
+
+@pytest.mark.django_db
+def test_import_rejects_empty_and_anonymous_requests(client, user_client):
+    assert _post(user_client).status_code == 400
+    assert _post(client, {'name': 'Пюре'}).status_code == 401
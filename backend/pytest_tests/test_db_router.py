@@ -0,0 +1,109 @@
+import pytest
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from foodgram import db_router
+
+
+def _unexpected_chain(request):
+    raise AssertionError('Middleware chain must not be re-run.')
+
+
+@pytest.fixture
+def replica_state():
+    db_router._state.replica = 'replica_0'
+    yield
+    db_router._state.replica = None
+    db_router._health.clear()
+
+
+def _view(request, pk):
+    return HttpResponse(f'{pk}:{db_router._state.replica}')
+
+
+def test_failed_replica_read_retries_only_the_view(replica_state):
+    middleware = db_router.ReplicaRoutingMiddleware(_unexpected_chain)
+    request = RequestFactory().get('/api/recipes/1/')
+    middleware.process_view(request, _view, (), {'pk': 1})
+
+    response = middleware.process_exception(request, DatabaseError())
+
+    assert response.content == b'1:None'
+    assert db_router._health['replica_0'][0] is False
+
+
+def test_failed_unsafe_request_is_not_retried(replica_state):
+    middleware = db_router.ReplicaRoutingMiddleware(_unexpected_chain)
+    request = RequestFactory().post('/api/recipes/')
+    middleware.process_view(request, _view, (), {'pk': 1})
+
+    assert middleware.process_exception(request, DatabaseError()) is None
+
+
+@pytest.mark.django_db
+def test_write_sticks_token_to_primary_in_shared_cache(settings):
+    settings.DATABASE_REPLICAS = ['replica_0']
+
+    def write(request):
+        db_router._state.wrote = True
+        return HttpResponse()
+
+    request = RequestFactory().post(
+        '/api/recipes/', HTTP_AUTHORIZATION='Token secret'
+    )
+    response = db_router.ReplicaRoutingMiddleware(write)(request)
+
+    assert db_router.STICKY_COOKIE in response.cookies
+    assert db_router._is_sticky(
+        RequestFactory().get('/', HTTP_AUTHORIZATION='Token secret')
+    )
+    assert not db_router._is_sticky(
+        RequestFactory().get('/', HTTP_AUTHORIZATION='Token other')
+    )
+
+
+class FakeCursor:
+
+    def __init__(self, row):
+        self.row = row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query):
+        assert query == db_router.LAG_QUERIES['postgresql']
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+
+    vendor = 'postgresql'
+
+    def __init__(self, row):
+        self.row = row
+
+    def cursor(self):
+        return FakeCursor(self.row)
+
+
+@pytest.mark.parametrize('row, healthy', [
+    ((True, 3600.0), True),
+    ((False, 3.0), True),
+    ((False, 3600.0), False),
+    ((None, None), True),
+])
+def test_replica_health_ignores_idle_primary(
+    monkeypatch, settings, replica_state, row, healthy
+):
+    settings.DATABASE_REPLICA_MAX_LAG = 10
+    monkeypatch.setattr(
+        db_router, 'connections', {'replica_0': FakeConnection(row)}
+    )
+
+    assert db_router.is_healthy('replica_0') is healthy
@@ -0,0 +1,24 @@
+import pytest
+
+from jobs_app.worker import claim, run_job
+from recipes_app.models import Recipe
+from users_app.jobs import delete_users
+from users_app.models import User
+
+
+@pytest.mark.django_db
+def test_deleted_user_recipes_are_hidden_before_purge(
+    client, user, make_recipe
+):
+    recipe = make_recipe()
+
+    delete_users([user.id])
+
+    assert client.get(f'/api/recipes/{recipe.id}/').status_code == 404
+    assert client.get('/api/recipes/').json()['results'] == []
+    assert Recipe.all_objects.filter(pk=recipe.id).exists()
+
+    [job] = claim('test', 1)
+    assert run_job(job, 'test') == 'done'
+    assert not Recipe.all_objects.filter(pk=recipe.id).exists()
+    assert not User.all_objects.filter(pk=user.id).exists()
@@ -0,0 +1,106 @@
+import io
+import zipfile
+
+import orjson
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from recipes_app.export import export_records
+from recipes_app.models import Favorite, IngredientInRecipe, ShoppingCart
+from users_app.models import Subscription
+
+URL = '/api/users/me/export/'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def data(django_user_model, user, ingredient, make_recipe):
+    other = django_user_model.objects.create_user(
+        email='cook@foodgram.ru',
+        username='cook',
+        first_name='Пётр',
+        last_name='Петров',
+        password='Pa55w0rd!'
+    )
+    image = default_storage.save('recipes/borscht.png', ContentFile(b'png'))
+    recipe = make_recipe(image=image)
+    IngredientInRecipe.objects.create(
+        recipe=recipe, ingredient=ingredient, amount=100
+    )
+    foreign = make_recipe(name='Щи', author=other)
+    Favorite.objects.create(user=user, recipe=foreign)
+    ShoppingCart.objects.create(user=other, recipe=recipe)
+    Subscription.objects.create(subscriber=user, author=other)
+    return {'recipe': recipe, 'foreign': foreign, 'other': other}
+
+
+def _records(content):
+    return [orjson.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+def test_ndjson_export_streams_only_own_data(user, user_client, data):
+    response = user_client.get(URL)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Type'] == 'application/x-ndjson'
+    records = _records(b''.join(response.streaming_content))
+    assert [record['type'] for record in records] == [
+        'user', 'recipe', 'favorite', 'subscription'
+    ]
+    user_record, recipe, favorite, subscription = records
+    assert user_record['email'] == user.email
+    assert recipe['id'] == data['recipe'].id
+    assert recipe['image'] == 'recipes/borscht.png'
+    assert recipe['ingredients'][0]['amount'] == 100
+    assert favorite['recipe'] == data['foreign'].id
+    assert subscription['author'] == data['other'].id
+
+
+@pytest.mark.django_db
+def test_zip_export_contains_data_and_media(user_client, data):
+    ndjson = b''.join(user_client.get(URL).streaming_content)
+
+    response = user_client.get(URL, {'zip': 1})
+
+    assert response['Content-Type'] == 'application/zip'
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+    assert archive.namelist() == ['data.ndjson', 'media/recipes/borscht.png']
+    assert _records(archive.read('data.ndjson')) == _records(ndjson)
+    assert archive.read('media/recipes/borscht.png') == b'png'
+
+
+@pytest.mark.django_db
+def test_export_reads_in_batches(make_recipe):
+    recipe_ids = [make_recipe(name=f'Рецепт {index}').id for index in range(5)]
+
+    records = list(export_records(batch_size=2))
+
+    assert [
+        record['id'] for record in records if record['type'] == 'recipe'
+    ] == recipe_ids
+
+
+@pytest.mark.django_db
+def test_export_command_writes_site_export(data, tmp_path):
+    output = tmp_path / 'export.ndjson'
+
+    call_command('export_data', output=str(output), stdout=io.StringIO())
+
+    records = _records(output.read_bytes())
+    assert sum(record['type'] == 'user' for record in records) == 2
+    assert sum(record['type'] == 'recipe' for record in records) == 2
+    assert sum(record['type'] == 'shopping_cart' for record in records) == 1
+
+
+@pytest.mark.django_db
+def test_export_requires_authentication(client):
+    assert client.get(URL).status_code == 401
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes_app.models import IngredientInRecipe
+
+URL = '/api/recipes/'
+
+
+@pytest.fixture
+def recipe(make_recipe, ingredient):
+    recipe = make_recipe()
+    IngredientInRecipe.objects.create(
+        recipe=recipe, ingredient=ingredient, amount=100
+    )
+    return recipe
+
+
+def _get(client, url=URL, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    data = response.json()
+    return data['results'][0] if 'results' in data else data, ' '.join(
+        query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_fields_limit_response_and_selected_columns(user_client, recipe):
+    data, sql = _get(user_client, fields='name,cooking_time')
+
+    assert data == {'id': recipe.id, 'name': 'Борщ', 'cooking_time': 30}
+    assert '"text"' not in sql
+    assert 'recipes_app_favorite' not in sql
+    assert 'recipes_app_ingredientinrecipe' not in sql
+
+
+@pytest.mark.django_db
+def test_omit_drops_fields(user_client, recipe):
+    data, sql = _get(
+        user_client, f'{URL}{recipe.id}/', omit='text,is_favorited'
+    )
+
+    assert 'text' not in data
+    assert 'is_favorited' not in data
+    assert {'name', 'author', 'ingredients', 'is_in_shopping_cart'} <= set(
+        data
+    )
+    assert '"text"' not in sql
+    assert 'recipes_app_favorite' not in sql
+
+
+@pytest.mark.django_db
+def test_related_fields_are_collapsed_unless_expanded(
+    client, recipe, ingredient
+):
+    collapsed, _ = _get(client, fields='author,ingredients')
+    expanded, _ = _get(
+        client, fields='author,ingredients', expand='author,ingredients'
+    )
+
+    assert collapsed['author'] == recipe.author_id
+    assert collapsed['ingredients'] == [{'id': ingredient.id, 'amount': 100}]
+    assert expanded['author']['username'] == 'author'
+    assert expanded['ingredients'][0]['name'] == ingredient.name
+
+
+@pytest.mark.django_db
+def test_without_fieldset_everything_is_expanded(client, recipe):
+    data, _ = _get(client)
+
+    assert set(data) == {
+        'id', 'author', 'ingredients', 'name', 'image', 'text',
+        'cooking_time', 'is_favorited', 'is_in_shopping_cart'
+    }
+    assert isinstance(data['author'], dict)
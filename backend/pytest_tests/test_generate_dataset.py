@@ -0,0 +1,92 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.utils import timezone
+
+from recipes_app.jobs import delete_recipes
+from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
+                                Recipe, ShoppingCart)
+from users_app.models import Subscription, User
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_dataset_skips_ids_of_soft_deleted_rows(user, make_recipe):
+    Ingredient.objects.create(name='соль', measurement_unit='г')
+    recipe = make_recipe()
+    delete_recipes([recipe.id])
+    User.all_objects.filter(pk=user.pk).update(deleted_at=timezone.now())
+
+    call_command(
+        'generate_dataset', users=3, recipes=5, favorites=1, cart=1,
+        subscriptions=1, ingredients_per_recipe=1, workers=1, stdout=None
+    )
+
+    assert User.all_objects.count() == 4
+    assert Recipe.all_objects.count() == 6
+    assert Recipe.objects.count() == 5
+
+
+def _generate(**options):
+    call_command('generate_dataset', **dict({
+        'users': 20, 'recipes': 50, 'favorites': 3, 'cart': 2,
+        'subscriptions': 3, 'ingredients_per_recipe': 3, 'workers': 1,
+        'chunk_size': 7, 'stdout': None,
+    }, **options))
+
+
+def _snapshot():
+    return (
+        list(Recipe.all_objects.order_by('id').values_list(
+            'id', 'author_id', 'name', 'cooking_time'
+        )),
+        list(IngredientInRecipe.objects.order_by('id').values_list(
+            'recipe_id', 'ingredient_id', 'amount'
+        )),
+        sorted(Favorite.objects.values_list('user_id', 'recipe_id')),
+        sorted(Subscription.objects.values_list('subscriber_id', 'author_id')),
+    )
+
+
+@pytest.fixture
+def ingredients():
+    Ingredient.objects.bulk_create([
+        Ingredient(name=f'ингредиент {index}', measurement_unit='г')
+        for index in range(10)
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_dataset_is_reproducible_for_a_seed(ingredients):
+    _generate()
+    first = _snapshot()
+    User.all_objects.all().delete()
+
+    _generate()
+
+    assert _snapshot() == first
+    User.all_objects.all().delete()
+    _generate(seed=7)
+    assert _snapshot() != first
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generated_dataset_is_consistent(ingredients):
+    _generate()
+
+    assert User.objects.count() == 20
+    assert Recipe.objects.count() == 50
+    assert not Recipe.objects.filter(recipe_ingredients__isnull=True).exists()
+    assert Favorite.objects.exists() and ShoppingCart.objects.exists()
+    assert not Subscription.objects.filter(
+        subscriber=F('author')
+    ).exists()
+    assert Recipe.objects.create(
+        author=User.objects.first(), name='Борщ', text='Борщ', cooking_time=30
+    ).id == 51
+
+
+@pytest.mark.django_db
+def test_generate_dataset_needs_users_and_recipes(ingredients):
+    with pytest.raises(CommandError):
+        _generate(users=0)
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+from django.utils import timezone
+
+from api.recipes import filters
+from recipes_app import ingredient_index
+from recipes_app.constants import (INGREDIENT_INDEX_REFRESH_INTERVAL,
+                                   INGREDIENT_INDEX_TTL)
+from recipes_app.ingredient_index import IngredientIndex
+from recipes_app.models import ChangeLog, Ingredient, IngredientInRecipe
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = IngredientIndex()
+    monkeypatch.setattr(filters, 'ingredient_index', index)
+    return index
+
+
+@pytest.fixture
+def recipes(make_recipe):
+    potato, beet = (
+        Ingredient.objects.create(name=name, measurement_unit='г')
+        for name in ('картофель', 'свёкла')
+    )
+    borscht, mash = make_recipe(name='Борщ'), make_recipe(name='Пюре')
+    IngredientInRecipe.objects.bulk_create([
+        IngredientInRecipe(recipe=borscht, ingredient=potato, amount=200),
+        IngredientInRecipe(recipe=borscht, ingredient=beet, amount=300),
+        IngredientInRecipe(recipe=mash, ingredient=potato, amount=500),
+    ])
+    return {'potato': potato, 'beet': beet, 'borscht': borscht, 'mash': mash}
+
+
+def _ids(response):
+    return {item['id'] for item in response.json()['results']}
+
+
+@pytest.mark.django_db
+def test_ingredient_filters(client, index, recipes):
+    potato, beet = recipes['potato'].id, recipes['beet'].id
+
+    assert _ids(client.get(
+        '/api/recipes/', {'ingredients': f'{potato},{beet}'}
+    )) == {recipes['borscht'].id}
+    assert _ids(client.get(
+        '/api/recipes/', {'exclude_ingredients': beet}
+    )) == {recipes['mash'].id}
+    assert _ids(client.get(
+        '/api/recipes/', {'exclude_ingredients': 999999}
+    )) == {recipes['borscht'].id, recipes['mash'].id}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_index_is_rebuilt_in_background(index, recipes):
+    borscht, mash = recipes['borscht'].id, recipes['mash'].id
+    index.refresh()
+    loading, release = threading.Event(), threading.Event()
+    load = index._load
+
+    def slow_load():
+        loading.set()
+        release.wait(5)
+        return load()
+
+    index._load = slow_load
+    index._built_at -= INGREDIENT_INDEX_TTL + 1
+    started = time.monotonic()
+    index.refresh()
+    rebuild = index._rebuild_thread
+
+    assert time.monotonic() - started < 1
+    assert loading.wait(5)
+    assert list(index.recipes_with_all([recipes['beet'].id])) == [borscht]
+    index.remove_recipes([borscht])
+    release.set()
+    rebuild.join(5)
+
+    assert index._rebuild_thread is None
+    assert list(index.recipes_with_any([recipes['potato'].id])) == [mash]
+
+
+def _refresh_now(index):
+    index._checked_at -= INGREDIENT_INDEX_REFRESH_INTERVAL + 1
+    index.refresh()
+
+
+@pytest.mark.django_db
+def test_catch_up_follows_edits_deletes_and_restores(index, recipes):
+    potato, beet = recipes['potato'].id, recipes['beet'].id
+    borscht, mash = recipes['borscht'], recipes['mash']
+    index.refresh()
+
+    IngredientInRecipe.objects.filter(recipe=mash).update(
+        ingredient=recipes['beet']
+    )
+    IngredientInRecipe.objects.filter(recipe=borscht, ingredient=beet).delete()
+    _refresh_now(index)
+
+    assert list(index.recipes_with_any([beet])) == [mash.id]
+    assert list(index.recipes_with_any([potato])) == [borscht.id]
+
+    borscht.deleted_at = timezone.now()
+    borscht.save()
+    _refresh_now(index)
+
+    assert list(index.recipes_with_any([potato])) == []
+
+    borscht.deleted_at = None
+    borscht.save()
+    _refresh_now(index)
+
+    assert list(index.recipes_with_any([potato])) == [borscht.id]
+    assert index._sizes[borscht.id] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_catch_up_queries_outside_the_lock(index, recipes, monkeypatch):
+    index.refresh()
+    locked = []
+
+    def probe_lock():
+        acquired = index._lock.acquire(timeout=1)
+        if acquired:
+            index._lock.release()
+        locked.append(not acquired)
+
+    def read_changes(cursor, limit):
+        probe = threading.Thread(target=probe_lock)
+        probe.start()
+        probe.join()
+        return {'cursor': cursor, 'has_more': False,
+                'changed': {ChangeLog.RECIPE: []}}
+
+    monkeypatch.setattr(ingredient_index, 'read_changes', read_changes)
+    _refresh_now(index)
+
+    assert locked == [False]
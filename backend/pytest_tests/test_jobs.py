@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from jobs_app.constants import JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS
+from jobs_app.models import Job
+from jobs_app.registry import enqueue, job
+from jobs_app.worker import backoff, claim, run_job
+
+calls = []
+
+
+@job('tests.record')
+def record(**payload):
+    calls.append(payload)
+
+
+@job('tests.fail', max_attempts=2)
+def fail():
+    raise ValueError('Сбой')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def expire_lease(job):
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+def test_claimed_job_is_not_handed_out_twice():
+    queued = record.enqueue(value=1)
+
+    first = claim('worker-a', 10)
+    second = claim('worker-b', 10)
+
+    assert [job.pk for job in first] == [queued.pk]
+    assert second == []
+    assert first[0].locked_by == 'worker-a'
+    assert first[0].attempts == 1
+
+
+@pytest.mark.django_db
+def test_future_job_is_not_claimed():
+    record.enqueue(run_at=timezone.now() + timedelta(minutes=1))
+
+    assert claim('worker-a', 10) == []
+
+
+@pytest.mark.django_db
+def test_expired_lease_lets_another_worker_reclaim():
+    record.enqueue(value=1)
+    [stale] = claim('worker-a', 10)
+    expire_lease(stale)
+
+    [reclaimed] = claim('worker-b', 10)
+
+    assert reclaimed.pk == stale.pk
+    assert reclaimed.locked_by == 'worker-b'
+    assert reclaimed.attempts == 2
+    assert run_job(stale, 'worker-a') == 'done'
+    assert Job.objects.get(pk=stale.pk).status == Job.RUNNING
+    assert run_job(reclaimed, 'worker-b') == 'done'
+    assert Job.objects.get(pk=stale.pk).status == Job.DONE
+    assert calls == [{'value': 1}, {'value': 1}]
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff_until_max_attempts():
+    queued = fail.enqueue()
+    [claimed] = claim('worker-a', 10)
+    started = timezone.now()
+
+    assert run_job(claimed, 'worker-a') == 'retry'
+    retried = Job.objects.get(pk=queued.pk)
+    assert retried.status == Job.QUEUED
+    assert retried.locked_by == ''
+    assert 'Сбой' in retried.last_error
+    delay = (retried.run_at - started).total_seconds()
+    assert JOB_RETRY_BASE_SECONDS * 0.5 - 1 <= delay
+    assert delay <= JOB_RETRY_BASE_SECONDS * 1.5 + 1
+    assert claim('worker-a', 10) == []
+
+    Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+    [claimed] = claim('worker-a', 10)
+
+    assert run_job(claimed, 'worker-a') == 'failed'
+    failed = Job.objects.get(pk=queued.pk)
+    assert failed.status == Job.FAILED
+    assert failed.attempts == 2
+    assert failed.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_expired_lease_past_max_attempts_fails_without_running():
+    record.enqueue(value=1)
+    Job.objects.update(max_attempts=1)
+    [stale] = claim('worker-a', 10)
+    expire_lease(stale)
+    [reclaimed] = claim('worker-b', 10)
+
+    assert run_job(reclaimed, 'worker-b') == 'failed'
+    assert calls == []
+    assert 'аренда' in Job.objects.get(pk=stale.pk).last_error
+
+
+def test_backoff_grows_exponentially_up_to_the_limit():
+    for attempts in range(1, 20):
+        delay = min(
+            JOB_RETRY_MAX_SECONDS,
+            JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        )
+        seconds = backoff(attempts).total_seconds()
+        assert delay * 0.5 <= seconds <= delay * 1.5
+
+
+@pytest.mark.django_db
+def test_dedup_key_collapses_active_duplicates():
+    first = record.enqueue(dedup_key='user:1', value=1)
+    second = enqueue('tests.record', {'value': 2}, dedup_key='user:1')
+
+    assert second.pk == first.pk
+    assert Job.objects.count() == 1
+
+    [claimed] = claim('worker-a', 10)
+    assert record.enqueue(dedup_key='user:1', value=3).pk == first.pk
+    run_job(claimed, 'worker-a')
+
+    third = record.enqueue(dedup_key='user:1', value=4)
+    assert third.pk != first.pk
+    assert Job.objects.filter(dedup_key='user:1').count() == 2
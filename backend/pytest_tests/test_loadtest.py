@@ -0,0 +1,46 @@
+import asyncio
+
+from benchmarks.loadtest import HTTPClient, Scenario
+
+RESPONSES = {
+    'HEAD': b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n',
+    'DELETE': b'HTTP/1.1 204 No Content\r\n\r\n',
+    'GET': (
+        b'HTTP/1.1 100 Continue\r\n\r\n'
+        b'HTTP/1.1 304 Not Modified\r\nETag: "1"\r\n\r\n'
+    ),
+    'POST': b'HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\n{}',
+}
+
+
+async def _serve(reader, writer):
+    while True:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            break
+        writer.write(RESPONSES[head.split(b' ', 1)[0].decode()])
+        await writer.drain()
+    writer.close()
+
+
+async def _exchange(methods):
+    server = await asyncio.start_server(_serve, '127.0.0.1', 0)
+    client = HTTPClient('127.0.0.1', server.sockets[0].getsockname()[1])
+    try:
+        return [
+            await asyncio.wait_for(
+                client.request(Scenario(method, '/api/recipes/')), 1
+            )
+            for method in methods
+        ]
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+
+def test_bodiless_responses_keep_connection_usable():
+    statuses = asyncio.run(_exchange(['HEAD', 'DELETE', 'GET', 'POST']))
+
+    assert statuses == [200, 204, 304, 201]
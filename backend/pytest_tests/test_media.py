@@ -0,0 +1,66 @@
+import pytest
+from django.conf import settings
+
+NAME = 'recipes/0f8e2b1c-4d5a-4c3b-9e7f-1a2b3c4d5e6f.png'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'recipes').mkdir()
+    (tmp_path / NAME).write_bytes(b'png')
+    (tmp_path / 'recipes' / 'borscht.png').write_bytes(b'png')
+    (tmp_path / 'secret.txt').write_text('secret')
+    return tmp_path
+
+
+@pytest.mark.parametrize('path', [
+    '/media/secret.txt',
+    '/media/recipes/../secret.txt',
+    '/media/recipes/../../foodgram/settings.py',
+    '/media/recipesfake/borscht.png',
+    '/media//etc/passwd',
+])
+def test_paths_outside_upload_directories_are_forbidden(client, path):
+    assert client.get(path).status_code == 403
+
+
+def test_accel_mode_delegates_to_nginx(client, settings):
+    settings.MEDIA_SERVE_MODE = 'accel'
+
+    response = client.get(f'/media/{NAME}')
+
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'] == f'/protected-media/{NAME}'
+    assert response['Content-Type'] == 'image/png'
+    assert response.content == b''
+
+
+def test_django_mode_serves_file(client, settings):
+    settings.MEDIA_SERVE_MODE = 'django'
+
+    response = client.get('/media/recipes/borscht.png')
+
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == b'png'
+    assert response['Cache-Control'] == (
+        f'public, max-age={settings.MEDIA_MAX_AGE}'
+    )
+
+
+def test_hashed_names_are_immutable(client):
+    response = client.get(f'/media/{NAME}')
+
+    assert response['Cache-Control'] == (
+        f'public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+    )
+
+
+def test_missing_file_is_not_found(client, settings):
+    settings.MEDIA_SERVE_MODE = 'django'
+
+    assert client.get('/media/recipes/missing.png').status_code == 404
+
+
+def test_unsafe_methods_are_not_allowed(client):
+    assert client.post(f'/media/{NAME}').status_code == 405
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from recipes_app.constants import MEDIA_GC_GRACE_HOURS
+
+OLD = time.time() - (MEDIA_GC_GRACE_HOURS + 1) * 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def write(media_root, name, modified=OLD):
+    path = media_root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'image')
+    os.utime(path, (modified, modified))
+    return path
+
+
+@pytest.fixture
+def files(user, make_recipe, media_root):
+    make_recipe(image='recipes/kept.jpg')
+    user.avatar = 'users/avatars/kept.jpg'
+    user.save()
+    return {
+        'recipe': write(media_root, 'recipes/kept.jpg'),
+        'avatar': write(media_root, 'users/avatars/kept.jpg'),
+        'fresh': write(media_root, 'recipes/fresh.jpg', time.time()),
+        'orphan': write(media_root, 'recipes/orphan.jpg'),
+        'nested': write(media_root, 'users/avatars/old/orphan.jpg'),
+        'other': write(media_root, 'static/orphan.jpg'),
+    }
+
+
+@pytest.mark.django_db
+def test_collect_removes_only_old_unreferenced_files(files):
+    call_command('collect_media_garbage')
+
+    assert not files['orphan'].exists()
+    assert not files['nested'].exists()
+    for kept in ('recipe', 'avatar', 'fresh', 'other'):
+        assert files[kept].exists()
+
+
+@pytest.mark.django_db
+def test_soft_deleted_recipe_keeps_its_image(files, make_recipe):
+    make_recipe(
+        name='Щи', image='recipes/orphan.jpg', deleted_at=timezone.now()
+    )
+
+    call_command('collect_media_garbage')
+
+    assert files['orphan'].exists()
+
+
+@pytest.mark.django_db
+def test_grace_hours_option_shortens_grace_period(files):
+    call_command('collect_media_garbage', grace_hours=0)
+
+    assert not files['fresh'].exists()
+    assert files['recipe'].exists()
+
+
+@pytest.mark.django_db
+def test_dry_run_deletes_nothing(files, capsys):
+    call_command('collect_media_garbage', dry_run=True)
+
+    assert all(path.exists() for path in files.values())
+    assert 'Будет удалено файлов: 2' in capsys.readouterr().out
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from foodgram import metrics
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path, monkeypatch):
+    settings.METRICS_DIR = str(tmp_path)
+    monkeypatch.setattr(metrics, 'registry', metrics.Registry())
+    return tmp_path
+
+
+def _write_snapshot(path, value):
+    path.write_text(json.dumps({
+        'counters': [['jobs_total', [['result', 'ok']], value]],
+        'histograms': [],
+    }))
+
+
+@pytest.mark.django_db
+def test_metrics_require_token_or_staff(client, settings, metrics_dir):
+    settings.METRICS_TOKEN = 'secret'
+
+    assert client.get('/metrics').status_code == 403
+    assert client.get(
+        '/metrics', HTTP_AUTHORIZATION='Bearer wrong'
+    ).status_code == 403
+    response = client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+    assert response.status_code == 200
+    assert response['Content-Type'] == metrics.CONTENT_TYPE
+
+
+@pytest.mark.django_db
+def test_metrics_allow_staff(user, client, metrics_dir):
+    user.is_staff = True
+    user.save()
+    client.force_login(user)
+
+    assert client.get('/metrics').status_code == 200
+
+
+def test_exited_process_snapshots_are_folded(metrics_dir):
+    _write_snapshot(metrics_dir / '1-dead.json', 2)
+    _write_snapshot(metrics_dir / '2-dead.json', 3)
+    metrics.registry.increment('jobs_total', {'result': 'ok'})
+
+    counters, _ = metrics.collect()
+    assert counters[('jobs_total', (('result', 'ok'),))] == 6
+    assert not (metrics_dir / '1-dead.json').exists()
+    assert (metrics_dir / metrics.EXITED_FILE).exists()
+
+    counters, _ = metrics.collect()
+    assert counters[('jobs_total', (('result', 'ok'),))] == 6
+
+
+def test_clear_metrics_dir(metrics_dir):
+    _write_snapshot(metrics_dir / '1-dead.json', 2)
+
+    metrics.clear_metrics_dir()
+
+    assert not metrics_dir.exists()
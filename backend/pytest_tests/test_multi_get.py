@@ -0,0 +1,113 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from recipes_app.constants import MAX_MULTI_GET_SIZE
+
+URL = '/api/recipes/'
+
+
+@pytest.fixture
+def recipes(make_recipe):
+    return [make_recipe(name=f'Рецепт {number}') for number in range(3)]
+
+
+def _multi_get(client, ids, **headers):
+    return client.get(
+        URL, {'ids': ','.join(str(pk) for pk in ids)}, **headers
+    )
+
+
+@pytest.mark.django_db
+def test_multi_get_keeps_requested_order_and_reports_missing(
+    client, recipes
+):
+    first, second, third = recipes
+    missing = third.pk + 100
+
+    response = _multi_get(client, [third.pk, missing, first.pk, third.pk])
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [recipe['id'] for recipe in data['results']] == [
+        third.pk, first.pk
+    ]
+    assert data['missing'] == [missing]
+
+
+@pytest.mark.django_db
+def test_multi_get_treats_deleted_recipes_as_missing(client, recipes):
+    first, second, _ = recipes
+    second.deleted_at = timezone.now()
+    second.save()
+
+    data = _multi_get(client, [first.pk, second.pk]).json()
+
+    assert [recipe['id'] for recipe in data['results']] == [first.pk]
+    assert data['missing'] == [second.pk]
+
+
+def _multi_get_queries(client, ids):
+    with CaptureQueriesContext(connection) as context:
+        response = _multi_get(client, ids)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_multi_get_query_count_does_not_grow(
+    client, make_recipe, ingredient
+):
+    recipe = make_recipe()
+    recipe.ingredients.add(ingredient, through_defaults={'amount': 1})
+    queries = _multi_get_queries(client, [recipe.pk])
+    more = [make_recipe(name=f'Рецепт {index}') for index in range(10)]
+    for other in more:
+        other.ingredients.add(ingredient, through_defaults={'amount': 1})
+
+    assert _multi_get_queries(
+        client, [recipe.pk, *(other.pk for other in more)]
+    ) == queries
+
+
+@pytest.mark.django_db
+def test_multi_get_supports_conditional_requests(client, recipes):
+    ids = [recipe.pk for recipe in recipes]
+    response = _multi_get(client, ids)
+    etag = response['ETag']
+
+    assert 'no-cache' in response['Cache-Control']
+    assert _multi_get(
+        client, ids, HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+
+    recipes[0].name = 'Солянка'
+    recipes[0].save()
+
+    changed = _multi_get(client, ids, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed['ETag'] != etag
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ids', [
+    'abc',
+    '1,x',
+    '',
+    ',',
+    ','.join(str(pk) for pk in range(1, MAX_MULTI_GET_SIZE + 2)),
+])
+def test_multi_get_rejects_invalid_ids(client, ids):
+    response = client.get(URL, {'ids': ids})
+
+    assert response.status_code == 400
+    assert 'ids' in response.json()
+
+
+@pytest.mark.django_db
+def test_list_without_ids_is_paginated(client, recipes):
+    data = client.get(URL).json()
+
+    assert data['count'] == len(recipes)
+    assert 'missing' not in data
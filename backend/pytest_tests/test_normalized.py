@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users_app.models import Subscription
+
+NORMALIZED = 'application/vnd.foodgram.normalized+json'
+
+
+@pytest.fixture
+def make_author(django_user_model):
+    def make(index):
+        return django_user_model.objects.create_user(
+            email=f'cook{index}@foodgram.ru',
+            username=f'cook{index}',
+            first_name='Пётр',
+            last_name='Петров',
+            password='Pa55w0rd!'
+        )
+    return make
+
+
+def _list_queries(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/api/recipes/', HTTP_ACCEPT=NORMALIZED)
+    assert response.status_code == 200
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_included_authors_do_not_query_per_author(
+    user, user_client, make_author, make_recipe
+):
+    first = make_author(0)
+    Subscription.objects.create(subscriber=user, author=first)
+    make_recipe(author=first)
+    _, queries = _list_queries(user_client)
+    for index in range(1, 6):
+        make_recipe(name=f'Рецепт {index}', author=make_author(index))
+
+    response, more_queries = _list_queries(user_client)
+
+    assert more_queries == queries
+    users = response.json()['included']['users']
+    assert len(users) == 6
+    assert {
+        user['username']: user['is_subscribed'] for user in users.values()
+    } == {f'cook{index}': index == 0 for index in range(6)}
+
+
+@pytest.mark.django_db
+def test_included_authors_for_anonymous_user(client, make_author, make_recipe):
+    make_recipe(author=make_author(0))
+
+    response, _ = _list_queries(client)
+
+    [author] = response.json()['included']['users'].values()
+    assert author['is_subscribed'] is False
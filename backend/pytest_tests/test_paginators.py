@@ -0,0 +1,13 @@
+from foodgram.paginators import EstimatedCountPaginator
+from recipes_app.models import Recipe
+
+
+def test_soft_delete_filter_alone_counts_as_unfiltered():
+    paginator = EstimatedCountPaginator(Recipe.objects.all(), 10)
+
+    assert paginator._is_unfiltered(Recipe.objects.order_by('-pub_date'))
+    assert paginator._is_unfiltered(Recipe.all_objects.all())
+    assert not paginator._is_unfiltered(Recipe.objects.filter(name='Борщ'))
+    assert not paginator._is_unfiltered(
+        Recipe.all_objects.filter(deleted_at__isnull=False)
+    )
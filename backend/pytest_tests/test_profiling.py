@@ -0,0 +1,91 @@
+import pytest
+from rest_framework.test import APIClient
+
+from foodgram.profiling import issue_token
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def staff(django_user_model):
+    return django_user_model.objects.create_user(
+        email='staff@foodgram.ru',
+        username='staff',
+        first_name='Пётр',
+        last_name='Петров',
+        password='Pa55w0rd!',
+        is_staff=True
+    )
+
+
+@pytest.fixture
+def staff_client(staff):
+    client = APIClient()
+    client.force_authenticate(staff)
+    return client
+
+
+@pytest.mark.django_db
+def test_staff_token_profiles_request(client, staff_client, profile_dir):
+    token = staff_client.post('/api/profiles/token/').json()['token']
+
+    response = client.get('/api/recipes/', HTTP_X_PROFILE=token)
+
+    profile_id = response['X-Profile-Id']
+    assert response.status_code == 200
+    assert '-GET-api_recipes-' in profile_id
+    assert (profile_dir / profile_id).is_file()
+    summary = staff_client.get(f'/api/profiles/{profile_id}/').json()
+    assert summary['functions']
+    assert [
+        entry['id'] for entry in staff_client.get('/api/profiles/').json()
+    ] == [profile_id]
+
+
+@pytest.mark.django_db
+def test_query_param_token_profiles_request(client, staff):
+    response = client.get(
+        '/api/recipes/', {'_profile': issue_token(staff)}
+    )
+
+    assert 'X-Profile-Id' in response
+
+
+@pytest.mark.django_db
+def test_requests_without_valid_token_are_not_profiled(
+    client, user, profile_dir
+):
+    for headers in (
+        {},
+        {'HTTP_X_PROFILE': 'forged'},
+        {'HTTP_X_PROFILE': issue_token(user)},
+    ):
+        response = client.get('/api/recipes/', **headers)
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response
+    assert list(profile_dir.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_old_profiles_are_pruned(client, staff, settings, profile_dir):
+    settings.PROFILE_MAX_FILES = 2
+    token = issue_token(staff)
+
+    for _ in range(3):
+        client.get('/api/recipes/', HTTP_X_PROFILE=token)
+
+    assert len(list(profile_dir.iterdir())) == 2
+
+
+@pytest.mark.django_db
+def test_profile_api_is_for_staff_only(user_client, staff_client):
+    assert user_client.get('/api/profiles/').status_code == 403
+    assert user_client.post('/api/profiles/token/').status_code == 403
+    for profile_id in ('..%2Fsecret.prof', 'missing.prof'):
+        response = staff_client.get(f'/api/profiles/{profile_id}/')
+        assert response.status_code == 404
@@ -0,0 +1,85 @@
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from foodgram.query_inspector import (QueryInspectionError,
+                                      QueryInspectorMiddleware, fingerprint)
+from recipes_app.models import Recipe
+
+
+@pytest.fixture
+def inspector_settings(settings):
+    settings.QUERY_INSPECTOR = {
+        'ENABLED': True,
+        'MODE': 'warn',
+        'REPEAT_THRESHOLD': 3,
+        'SLOW_QUERY_MS': 10000,
+    }
+    return settings.QUERY_INSPECTOR
+
+
+def _middleware(queries):
+    def view(request):
+        for recipe_id in range(1, queries + 1):
+            Recipe.objects.filter(pk=recipe_id).exists()
+        return HttpResponse()
+    return QueryInspectorMiddleware(view)
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    assert fingerprint(
+        "SELECT * FROM t WHERE id = 42 AND name = 'it''s' "
+        'AND pk IN (%s, %s, %s)'
+    ) == 'SELECT * FROM t WHERE id = ? AND name = ? AND pk IN (...)'
+
+
+def test_disabled_inspector_is_not_used(inspector_settings):
+    inspector_settings['ENABLED'] = False
+
+    with pytest.raises(MiddlewareNotUsed):
+        _middleware(0)
+
+
+@pytest.mark.django_db
+def test_repeated_queries_are_reported(inspector_settings, caplog):
+    response = _middleware(4)(RequestFactory().get('/api/recipes/'))
+
+    assert response['X-Query-Inspector'] == (
+        'queries=4; repeated=1; slow=0'
+    )
+    assert response['X-Query-Inspector-Repeated-0'].startswith('4x SELECT')
+    assert 'GET /api/recipes/' in caplog.text
+    assert 'test_query_inspector.py' in caplog.text
+
+
+@pytest.mark.django_db
+def test_queries_below_threshold_are_not_reported(inspector_settings, caplog):
+    response = _middleware(2)(RequestFactory().get('/'))
+
+    assert response['X-Query-Inspector'] == (
+        'queries=2; repeated=0; slow=0'
+    )
+    assert 'X-Query-Inspector-Repeated-0' not in response
+    assert caplog.text == ''
+
+
+@pytest.mark.django_db
+def test_slow_queries_are_explained(inspector_settings, caplog):
+    inspector_settings['SLOW_QUERY_MS'] = 0
+
+    response = _middleware(1)(RequestFactory().get('/'))
+
+    assert response['X-Query-Inspector'] == (
+        'queries=1; repeated=0; slow=1'
+    )
+    assert 'recipes_app_recipe' in caplog.text
+    assert 'EXPLAIN failed' not in caplog.text
+
+
+@pytest.mark.django_db
+def test_raise_mode_fails_the_request(inspector_settings):
+    inspector_settings['MODE'] = 'raise'
+
+    with pytest.raises(QueryInspectionError, match='repeated=1'):
+        _middleware(3)(RequestFactory().get('/'))
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+
+from recipes_app.management.commands.check_query_plans import (FULL_SCANS,
+                                                               hot_queries)
+from recipes_app.models import Favorite, IngredientInRecipe, ShoppingCart
+from users_app.models import Subscription
+
+EXPECTED_INDEXES = {
+    'recipe_list': 'recipe_pub_date_idx',
+    'author_recipes': 'recipe_author_pub_date_idx',
+    'user_favorites': 'favorite_user_created_idx',
+    'user_shopping_cart': 'shoppingcart_user_created_idx',
+    'ingredient_recipes': 'ingredient_recipe_idx',
+    'author_subscribers': 'subscription_author_idx',
+}
+
+
+@pytest.fixture
+def dataset(django_user_model, user, ingredient, make_recipe):
+    authors = [
+        django_user_model.objects.create_user(
+            email=f'cook{index}@foodgram.ru',
+            username=f'cook{index}',
+            first_name='Пётр',
+            last_name='Петров',
+            password='Pa55w0rd!'
+        )
+        for index in range(3)
+    ]
+    for author in authors:
+        Subscription.objects.create(subscriber=user, author=author)
+        recipe = make_recipe(name=f'Рецепт {author.username}', author=author)
+        IngredientInRecipe.objects.create(
+            recipe=recipe, ingredient=ingredient, amount=100
+        )
+        Favorite.objects.create(user=user, recipe=recipe)
+        ShoppingCart.objects.create(user=user, recipe=recipe)
+    return authors[0]
+
+
+@pytest.mark.django_db
+def test_hot_queries_use_indexes(user, ingredient, dataset):
+    pattern = FULL_SCANS[connection.vendor]
+    for name, queryset in hot_queries(user, dataset, ingredient).items():
+        plan = queryset.explain()
+        assert not pattern.findall(plan), f'{name}:\n{plan}'
+        assert EXPECTED_INDEXES.get(name, '') in plan, f'{name}:\n{plan}'
+
+
+@pytest.mark.django_db
+def test_hot_queries_run_in_one_query(
+    user, ingredient, dataset, django_assert_num_queries
+):
+    for queryset in hot_queries(user, dataset, ingredient).values():
+        with django_assert_num_queries(1):
+            list(queryset)
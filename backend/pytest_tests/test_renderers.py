@@ -0,0 +1,119 @@
+import io
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import msgpack
+import orjson
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import NDJSONParser
+from api.renderers import FastJSONRenderer
+from recipes_app.models import IngredientInRecipe, Recipe
+
+MESSAGEPACK = 'application/msgpack'
+NORMALIZED = 'application/vnd.foodgram.normalized+json'
+
+
+@pytest.fixture
+def recipe(make_recipe, ingredient):
+    recipe = make_recipe()
+    IngredientInRecipe.objects.create(
+        recipe=recipe, ingredient=ingredient, amount=100
+    )
+    return recipe
+
+
+def test_fast_json_matches_drf_json():
+    data = {
+        'id': 1,
+        'price': Decimal('1.50'),
+        'created': datetime(2024, 1, 2, 3, 4, 5),
+        'key': uuid.UUID(int=1),
+        'tags': ('a', 'б'),
+        2: None,
+    }
+
+    assert orjson.loads(FastJSONRenderer().render(data)) == orjson.loads(
+        JSONRenderer().render(data)
+    )
+    assert FastJSONRenderer().render(None) == b''
+
+
+def test_fast_json_honours_indent():
+    rendered = FastJSONRenderer().render(
+        {'id': 1}, 'application/json; indent=2'
+    )
+
+    assert rendered == b'{\n  "id": 1\n}'
+
+
+@pytest.mark.django_db
+def test_msgpack_response_matches_json(client, recipe):
+    as_json = client.get('/api/recipes/').json()
+
+    response = client.get('/api/recipes/', HTTP_ACCEPT=MESSAGEPACK)
+
+    assert response['Content-Type'] == MESSAGEPACK
+    assert msgpack.unpackb(response.content, raw=False) == as_json
+
+
+@pytest.mark.django_db
+def test_msgpack_request_body_is_parsed(user_client, ingredient):
+    response = user_client.post(
+        '/api/recipes/',
+        msgpack.packb({
+            'name': 'Пюре',
+            'text': 'Картофельное пюре',
+            'cooking_time': 20,
+            'ingredients': [{'id': ingredient.id, 'amount': 500}],
+        }),
+        content_type=MESSAGEPACK
+    )
+
+    assert response.status_code == 201
+    assert Recipe.objects.filter(name='Пюре').exists()
+
+
+@pytest.mark.django_db
+def test_malformed_msgpack_is_rejected(user_client):
+    response = user_client.post(
+        '/api/recipes/', b'\xc1', content_type=MESSAGEPACK
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {
+        'detail': 'Некорректные данные MessagePack.'
+    }
+
+
+@pytest.mark.django_db
+def test_normalized_json_moves_related_objects_to_included(
+    client, recipe, ingredient
+):
+    listing = client.get('/api/recipes/', HTTP_ACCEPT=NORMALIZED).json()
+    detail = client.get(
+        f'/api/recipes/{recipe.id}/', HTTP_ACCEPT=NORMALIZED
+    ).json()
+
+    assert listing['count'] == 1
+    [item] = listing['results']
+    assert item['author'] == recipe.author_id
+    assert item['ingredients'] == [{'id': ingredient.id, 'amount': 100}]
+    assert listing['included']['users'][str(recipe.author_id)][
+        'username'
+    ] == 'author'
+    assert listing['included']['ingredients'][str(ingredient.id)][
+        'name'
+    ] == ingredient.name
+    assert detail == {'data': item, 'included': listing['included']}
+
+
+def test_ndjson_parser_splits_lines():
+    parser = NDJSONParser()
+
+    assert parser.parse(io.BytesIO(b'{"a": 1}\n{"b": 2}\n')) == [
+        b'{"a": 1}', b'{"b": 2}'
+    ]
+    assert parser.parse(None) == []
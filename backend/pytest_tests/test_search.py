@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_search_finds_recipe_created_after_migrations(client, make_recipe):
+    recipe = make_recipe(name='Окрошка на квасе')
+    make_recipe(name='Солянка')
+
+    response = client.get('/api/recipes/', {'search': 'окрошка'})
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.json()['results']] == [recipe.id]
+
+
+@pytest.mark.django_db
+def test_search_finds_recipe_after_edit(client, make_recipe):
+    recipe = make_recipe(name='Солянка')
+    recipe.name = 'Рассольник'
+    recipe.save()
+
+    response = client.get('/api/recipes/', {'search': 'рассольник'})
+    assert [item['id'] for item in response.json()['results']] == [recipe.id]
+    response = client.get('/api/recipes/', {'search': 'солянка'})
+    assert response.json()['results'] == []
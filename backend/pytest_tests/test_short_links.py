@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from api.recipes import views
+from recipes_app.constants import (SHORT_LINK_CACHE_SECONDS,
+                                   SHORT_LINK_REFRESH_INTERVAL)
+from recipes_app.short_links import RecipeIdSet, decode, encode
+
+
+def test_unsigned_codes_round_trip(settings):
+    settings.SHORT_LINK_SIGNATURE_LENGTH = 0
+
+    assert decode(encode(12345)) == 12345
+    assert decode('42') == 42
+
+
+def test_signed_codes_reject_legacy_and_forged_codes(settings):
+    settings.SHORT_LINK_SIGNATURE_LENGTH = 4
+    settings.SHORT_LINK_ALLOW_LEGACY = False
+    code = encode(42)
+
+    assert decode(code) == 42
+    assert decode('42') is None
+    assert decode(code[:-1] + ('a' if code[-1] != 'a' else 'b')) is None
+
+
+def test_legacy_codes_can_be_allowed_explicitly(settings):
+    settings.SHORT_LINK_SIGNATURE_LENGTH = 4
+    settings.SHORT_LINK_ALLOW_LEGACY = True
+
+    assert decode('42') == 42
+
+
+def _catch_up_now(recipe_ids):
+    recipe_ids._checked_at -= SHORT_LINK_REFRESH_INTERVAL + 1
+
+
+@pytest.mark.django_db
+def test_recipe_id_set_catches_up_create_delete_and_restore(make_recipe):
+    recipe_ids = RecipeIdSet()
+    kept = make_recipe(name='Щи')
+    assert kept.id in recipe_ids
+
+    recipe = make_recipe()
+    _catch_up_now(recipe_ids)
+    assert recipe.id in recipe_ids
+
+    recipe.pub_date = timezone.now() - timedelta(days=30)
+
+    recipe.deleted_at = timezone.now()
+    recipe.save()
+    _catch_up_now(recipe_ids)
+    assert recipe.id not in recipe_ids
+
+    recipe.deleted_at = None
+    recipe.save()
+    _catch_up_now(recipe_ids)
+    assert recipe.id in recipe_ids
+    assert kept.id in recipe_ids
+
+
+@pytest.mark.django_db
+def test_redirect_is_cached_briefly(client, make_recipe, monkeypatch):
+    monkeypatch.setattr(views, 'live_recipe_ids', RecipeIdSet())
+    recipe = make_recipe()
+
+    response = client.get(f'/s/{encode(recipe.id)}')
+
+    assert response.status_code == 302
+    assert response['Location'] == f'/recipes/{recipe.id}'
+    assert (
+        f'max-age={SHORT_LINK_CACHE_SECONDS}' in response['Cache-Control']
+    )
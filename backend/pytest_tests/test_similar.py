@@ -0,0 +1,33 @@
+import pytest
+
+from recipes_app.jobs import delete_recipes
+from recipes_app.models import SimilarRecipe
+
+
+@pytest.mark.django_db
+def test_similar_lists_ranked_recipes(client, make_recipe):
+    recipe, first, second = (
+        make_recipe(name=name) for name in ('Борщ', 'Щи', 'Солянка')
+    )
+    SimilarRecipe.objects.create(
+        recipe=recipe, similar=second, rank=2, score=0.5
+    )
+    SimilarRecipe.objects.create(
+        recipe=recipe, similar=first, rank=1, score=0.9
+    )
+
+    response = client.get(f'/api/recipes/{recipe.id}/similar/')
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.json()] == [first.id, second.id]
+
+
+@pytest.mark.django_db
+def test_similar_returns_404_for_missing_or_deleted_recipe(
+    client, make_recipe
+):
+    recipe = make_recipe()
+    delete_recipes([recipe.id])
+
+    assert client.get(f'/api/recipes/{recipe.id}/similar/').status_code == 404
+    assert client.get('/api/recipes/999999/similar/').status_code == 404
@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes_app.models import IngredientInRecipe
+from recipes_app.sync import compact_changelog
+
+SYNC_URL = '/api/sync/'
+
+
+def _sync(client, since='0', **params):
+    return client.get(SYNC_URL, {'since': since, **params})
+
+
+@pytest.mark.django_db
+def test_sync_pages_through_all_changes(client, make_recipe):
+    recipe_ids = {make_recipe(name=f'Рецепт {index}').id for index in range(5)}
+    seen, cursor, pages = set(), '0', 0
+    while True:
+        response = _sync(client, cursor, limit=2)
+        assert response.status_code == 200
+        data = response.json()
+        seen |= {recipe['id'] for recipe in data['recipes']}
+        cursor, pages = data['cursor'], pages + 1
+        if not data['has_more']:
+            break
+
+    assert seen == recipe_ids
+    assert pages == 3
+    assert _sync(client, cursor).json()['recipes'] == []
+
+
+@pytest.mark.django_db
+def test_sync_reports_deleted_recipe_as_tombstone(
+    client, user_client, make_recipe
+):
+    recipe = make_recipe()
+    cursor = _sync(client).json()['cursor']
+
+    response = user_client.delete(f'/api/recipes/{recipe.id}/')
+    assert response.status_code == 204
+
+    data = _sync(client, cursor).json()
+    assert data['recipes'] == []
+    assert data['deleted'] == {'recipes': [recipe.id], 'ingredients': []}
+
+
+@pytest.mark.django_db
+def test_sync_resets_cursor_older_than_compacted_tombstones(
+    client, user_client, make_recipe
+):
+    kept = make_recipe(name='Борщ')
+    first = _sync(client, limit=1).json()['cursor']
+    deleted = make_recipe(name='Щи')
+    user_client.delete(f'/api/recipes/{deleted.id}/')
+
+    compact_changelog(retention_days=0)
+
+    response = _sync(client, first)
+    assert response.status_code == 410
+    assert response.json()['reset'] is True
+    data = _sync(client).json()
+    assert [recipe['id'] for recipe in data['recipes']] == [kept.id]
+    assert data['deleted']['recipes'] == []
+
+
+@pytest.mark.django_db
+def test_sync_rejects_malformed_cursor(client):
+    assert _sync(client, 'abc').status_code == 400
+
+
+def _sync_queries(client):
+    with CaptureQueriesContext(connection) as context:
+        response = _sync(client)
+    assert response.status_code == 200
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_sync_query_count_does_not_grow_with_changes(
+    client, make_recipe, ingredient
+):
+    recipe = make_recipe()
+    IngredientInRecipe.objects.create(
+        recipe=recipe, ingredient=ingredient, amount=100
+    )
+    _, queries = _sync_queries(client)
+    for index in range(10):
+        recipe = make_recipe(name=f'Рецепт {index}')
+        IngredientInRecipe.objects.create(
+            recipe=recipe, ingredient=ingredient, amount=index + 1
+        )
+
+    response, more_queries = _sync_queries(client)
+
+    assert more_queries == queries
+    assert len(response.json()['recipes']) == 11
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from recipes_app.constants import (TRENDING_FAVORITE_WEIGHT,
+                                   TRENDING_WINDOW_SECONDS)
+from recipes_app.models import (Favorite, ShoppingCart, TrendingBucket,
+                                TrendingScore)
+from recipes_app.trending import _bucket_start, compact_scores, record_event
+
+
+def _favorite(user, recipe, created_at):
+    favorite = Favorite.objects.create(user=user, recipe=recipe)
+    Favorite.objects.filter(pk=favorite.pk).update(created_at=created_at)
+    return favorite
+
+
+@pytest.mark.django_db
+def test_removal_decrements_bucket_of_original_event(
+    user, user_client, make_recipe
+):
+    recipe = make_recipe()
+    created_at = timezone.now() - timedelta(hours=3)
+    _favorite(user, recipe, created_at)
+    record_event(Favorite, recipe.id, created_at=created_at)
+
+    response = user_client.delete(f'/api/recipes/{recipe.id}/favorite/')
+
+    assert response.status_code == 204
+    buckets = dict(TrendingBucket.objects.values_list('bucket', 'score'))
+    assert buckets == {_bucket_start(created_at): 0}
+    assert TrendingScore.objects.get(recipe=recipe).score == pytest.approx(
+        0, abs=1e-3
+    )
+
+
+@pytest.mark.django_db
+def test_removal_outside_window_is_ignored(user, user_client, make_recipe):
+    recipe = make_recipe()
+    _favorite(
+        user, recipe,
+        timezone.now() - timedelta(seconds=TRENDING_WINDOW_SECONDS + 3600)
+    )
+
+    response = user_client.delete(f'/api/recipes/{recipe.id}/favorite/')
+
+    assert response.status_code == 204
+    assert not TrendingBucket.objects.exists()
+    assert not TrendingScore.objects.exists()
+
+
+@pytest.mark.django_db
+def test_compact_scores_drops_expired_buckets(make_recipe):
+    fresh, stale = make_recipe(name='Борщ'), make_recipe(name='Щи')
+    now = timezone.now()
+    TrendingBucket.objects.create(
+        recipe=fresh, bucket=_bucket_start(now), score=1
+    )
+    TrendingBucket.objects.create(
+        recipe=stale,
+        bucket=now - timedelta(seconds=TRENDING_WINDOW_SECONDS + 3600),
+        score=5
+    )
+
+    assert compact_scores() == (1, 1)
+    assert list(
+        TrendingScore.objects.values_list('recipe_id', flat=True)
+    ) == [fresh.id]
+
+
+@pytest.mark.django_db
+def test_recorded_scores_match_compacted_scores(make_recipe):
+    borscht, soup = make_recipe(name='Борщ'), make_recipe(name='Щи')
+    now = timezone.now()
+    for hours in (0, 30, 100):
+        record_event(
+            Favorite, borscht.id, created_at=now - timedelta(hours=hours)
+        )
+    record_event(ShoppingCart, soup.id)
+    record_event(ShoppingCart, soup.id)
+    recorded = dict(TrendingScore.objects.values_list('recipe_id', 'score'))
+
+    compact_scores()
+
+    compacted = dict(TrendingScore.objects.values_list('recipe_id', 'score'))
+    assert recorded == pytest.approx(compacted, rel=1e-3)
+    assert recorded[borscht.id] < 3 * TRENDING_FAVORITE_WEIGHT
+
+
+@pytest.mark.django_db
+def test_scores_never_go_negative(make_recipe):
+    recipe = make_recipe()
+    record_event(Favorite, recipe.id, added=False)
+
+    assert not TrendingBucket.objects.exists()
+    assert not TrendingScore.objects.exists()
+
+    record_event(ShoppingCart, recipe.id)
+    record_event(Favorite, recipe.id, added=False)
+
+    assert TrendingBucket.objects.get(recipe=recipe).score == 0
+    assert TrendingScore.objects.get(recipe=recipe).score == 0
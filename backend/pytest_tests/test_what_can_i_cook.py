@@ -0,0 +1,85 @@
+import pytest
+from django.utils import timezone
+
+from api.recipes import views
+from recipes_app.ingredient_index import IngredientIndex
+from recipes_app.models import Ingredient, IngredientInRecipe, Recipe
+
+URL = '/api/recipes/what-can-i-cook/'
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = IngredientIndex()
+    monkeypatch.setattr(views, 'ingredient_index', index)
+    return index
+
+
+@pytest.fixture
+def pantry(make_recipe):
+    potato, beet, onion, meat = (
+        Ingredient.objects.create(name=name, measurement_unit='г')
+        for name in ('картофель', 'свёкла', 'лук', 'мясо')
+    )
+    recipes = {
+        'mash': [potato],
+        'salad': [potato, beet],
+        'borscht': [potato, beet, onion, meat],
+        'stew': [potato, onion, meat],
+        'steak': [meat],
+    }
+    for name, ingredients in recipes.items():
+        recipe = make_recipe(name=name)
+        IngredientInRecipe.objects.bulk_create([
+            IngredientInRecipe(recipe=recipe, ingredient=ingredient, amount=1)
+            for ingredient in ingredients
+        ])
+    return f'{potato.id},{beet.id}'
+
+
+def _names(response):
+    return [recipe['name'] for recipe in response.json()['results']]
+
+
+@pytest.mark.django_db
+def test_recipes_are_ranked_by_coverage_then_missing(client, index, pantry):
+    response = client.get(URL, {'pantry': pantry})
+
+    assert response.status_code == 200
+    assert _names(response) == ['mash', 'salad', 'borscht', 'stew']
+    assert [
+        (recipe['coverage'], recipe['missing_count'])
+        for recipe in response.json()['results']
+    ] == [(1.0, 0), (1.0, 0), (0.5, 2), (1 / 3, 2)]
+
+
+@pytest.mark.django_db
+def test_pages_follow_the_ranking(client, index, pantry):
+    first = client.get(URL, {'pantry': pantry, 'limit': 3}).json()
+    second = client.get(URL, {'pantry': pantry, 'limit': 3, 'page': 2})
+
+    assert first['count'] == 4
+    assert [recipe['name'] for recipe in first['results']] == [
+        'mash', 'salad', 'borscht'
+    ]
+    assert first['next'] is not None
+    assert _names(second) == ['stew']
+
+
+@pytest.mark.django_db
+def test_deleted_recipes_are_dropped_before_paging(client, index, pantry):
+    index.refresh()
+    Recipe.objects.filter(name__in=('mash', 'borscht')).update(
+        deleted_at=timezone.now()
+    )
+
+    response = client.get(URL, {'pantry': pantry, 'limit': 2})
+
+    assert response.json()['count'] == 2
+    assert _names(response) == ['salad', 'stew']
+
+
+@pytest.mark.django_db
+def test_pantry_is_validated(client, index):
+    assert client.get(URL).status_code == 400
+    assert client.get(URL, {'pantry': 'картофель'}).status_code == 400
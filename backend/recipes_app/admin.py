@@ -1,10 +1,34 @@
+from admin_auto_filters.filters import AutocompleteFilter
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
+from foodgram.paginators import EstimatedCountPaginator
+from foodgram.soft_delete import SoftDeleteAdminMixin
 from recipes_app.constants import EXTRA_VALUE_ON_RECIPE, MIN_VALUE_ON_RECIPE
+from recipes_app.jobs import delete_recipes
 from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
                                 Recipe, ShoppingCart)
 
 
+class AuthorFilter(AutocompleteFilter):
+
+    title = 'Автор'
+    field_name = 'author'
+
+
+class UserFilter(AutocompleteFilter):
+
+    title = 'Пользователь'
+    field_name = 'user'
+
+
+class RecipeFilter(AutocompleteFilter):
+
+    title = 'Рецепт'
+    field_name = 'recipe'
+
+
 class RecipeIngredientInline(admin.TabularInline):
 
     model = IngredientInRecipe
@@ -14,7 +38,7 @@ class RecipeIngredientInline(admin.TabularInline):
 
 
 @admin.register(Recipe)
-class RecipesAdmin(admin.ModelAdmin):
+class RecipesAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
 
     inlines = [RecipeIngredientInline]
     list_display = (
@@ -26,13 +50,17 @@ class RecipesAdmin(admin.ModelAdmin):
         'favorite_count'
     )
     search_fields = ('name', 'author__username')
-    list_filter = ('author', 'pub_date')
+    list_filter = (AuthorFilter, 'pub_date')
     ordering = ('-pub_date',)
     autocomplete_fields = ['author']
-    
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    soft_delete_function = delete_recipes
+
     def favorite_count(self, obj):
-        return obj.favorite.count()
+        return obj.favorite_count
     favorite_count.short_description = 'В избранном'
+    favorite_count.admin_order_field = 'favorite_count'
 
     def display_ingredients(self, obj):
         return ', '.join([
@@ -49,6 +77,17 @@ class RecipesAdmin(admin.ModelAdmin):
             .prefetch_related(
                 'recipe_ingredients__ingredient'
             )
+            .defer('search_vector')
+            .annotate(favorite_count=Coalesce(
+                Subquery(
+                    Favorite.objects.filter(recipe=OuterRef('pk'))
+                    .order_by()
+                    .values('recipe')
+                    .annotate(total=Count('pk'))
+                    .values('total')
+                ),
+                0
+            ))
         )
 
 
@@ -57,15 +96,28 @@ class IngredientsAdmin(admin.ModelAdmin):
 
     list_display = ('name', 'measurement_unit')
     search_fields = ('name',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
-@admin.register(Favorite)
-class FavoritesAdmin(admin.ModelAdmin):
+class UserRecipeAdmin(admin.ModelAdmin):
 
     list_display = ('user', 'recipe', 'created_at')
+    list_select_related = ('user', 'recipe')
+    list_filter = (UserFilter, RecipeFilter)
+    raw_id_fields = ('user', 'recipe')
+    ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Favorite)
+class FavoritesAdmin(UserRecipeAdmin):
+
+    pass
 
 
 @admin.register(ShoppingCart)
-class ShoppingCartsAdmin(admin.ModelAdmin):
+class ShoppingCartsAdmin(UserRecipeAdmin):
 
-    list_display = ('user', 'recipe', 'created_at')
+    pass
@@ -0,0 +1,250 @@
+import base64
+import binascii
+import io
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from PIL import Image
+
+from recipes_app.constants import (IMPORT_CHUNK_SIZE, IMPORT_IMAGE_FORMATS,
+                                   IMPORT_IMAGE_WORKERS, MAX_SMALL_INTEGER,
+                                   MIN_VALUE_AMOUNT_INGREDIENTS,
+                                   MIN_VALUE_TIME, RECIPE_NAME_LENGTH)
+from recipes_app.ingredient_index import ingredient_index
+from recipes_app.models import Ingredient, IngredientInRecipe, Recipe
+
+REQUIRED = 'Обязательное поле.'
+
+
+def _is_integer(value, minimum):
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and minimum <= value <= MAX_SMALL_INTEGER
+    )
+
+
+def _clean_text(record, field, errors, max_length=None):
+    value = record.get(field)
+    if not isinstance(value, str) or not value.strip():
+        errors[field] = REQUIRED
+        return None
+    value = value.strip()
+    if max_length and len(value) > max_length:
+        errors[field] = f'Не более {max_length} символов.'
+    return value
+
+
+def _clean_ingredients(value, errors):
+    if not isinstance(value, list) or not value:
+        errors['ingredients'] = 'Добавьте хотя бы один ингредиент.'
+        return []
+    ingredients = []
+    for item in value:
+        if not isinstance(item, dict) or not _is_integer(item.get('id'), 1):
+            errors['ingredients'] = 'Неверный формат идентификатора.'
+            return []
+        if not _is_integer(item.get('amount'), MIN_VALUE_AMOUNT_INGREDIENTS):
+            errors['ingredients'] = (
+                f'Количество должно быть от {MIN_VALUE_AMOUNT_INGREDIENTS} '
+                f'до {MAX_SMALL_INTEGER}.'
+            )
+            return []
+        ingredients.append((item['id'], item['amount']))
+    if len({ingredient_id for ingredient_id, _ in ingredients}) != len(
+        ingredients
+    ):
+        errors['ingredients'] = 'Ингредиенты не должны повторяться.'
+    return ingredients
+
+
+def parse_record(line):
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None, {'detail': 'Некорректный JSON.'}
+    if not isinstance(record, dict):
+        return None, {'detail': 'Ожидается JSON-объект.'}
+    errors = {}
+    cleaned = {
+        'name': _clean_text(record, 'name', errors, RECIPE_NAME_LENGTH),
+        'text': _clean_text(record, 'text', errors),
+        'cooking_time': record.get('cooking_time'),
+        'ingredients': _clean_ingredients(record.get('ingredients'), errors),
+        'image': record.get('image') or None,
+    }
+    if not _is_integer(cleaned['cooking_time'], MIN_VALUE_TIME):
+        errors['cooking_time'] = 'Количество минут должно быть больше 0'
+    if cleaned['image'] is not None and not isinstance(cleaned['image'], str):
+        errors['image'] = 'Ожидается строка base64.'
+    return cleaned, errors
+
+
+def store_image(value):
+    if ';base64,' in value:
+        value = value.split(';base64,', 1)[1]
+    try:
+        content = base64.b64decode(value, validate=True)
+        with Image.open(io.BytesIO(content)) as image:
+            image_format = (image.format or '').lower()
+            image.verify()
+    except (binascii.Error, ValueError, OSError, Image.DecompressionBombError):
+        return None, 'Загруженный файл не является корректным изображением.'
+    if image_format not in IMPORT_IMAGE_FORMATS:
+        return None, 'Неподдерживаемый формат изображения.'
+    extension = 'jpg' if image_format == 'jpeg' else image_format
+    name = default_storage.save(
+        f'recipes/{uuid.uuid4().hex}.{extension}', ContentFile(content)
+    )
+    return name, None
+
+
+def _existing(queryset, field, values):
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), IMPORT_CHUNK_SIZE):
+        found.update(queryset.filter(**{
+            f'{field}__in': values[start:start + IMPORT_CHUNK_SIZE]
+        }).values_list(field, flat=True))
+    return found
+
+
+def _check_references(records, author, results):
+    ingredient_ids = _existing(Ingredient.objects, 'pk', {
+        ingredient_id
+        for _, record in records
+        for ingredient_id, _ in record['ingredients']
+    })
+    taken = _existing(
+        Recipe.objects.filter(author=author),
+        'name',
+        {record['name'] for _, record in records}
+    )
+    valid = []
+    for line, record in records:
+        errors = {}
+        missing = sorted(
+            ingredient_id for ingredient_id, _ in record['ingredients']
+            if ingredient_id not in ingredient_ids
+        )
+        if missing:
+            errors['ingredients'] = (
+                f'Ингредиенты не найдены: {", ".join(map(str, missing))}.'
+            )
+        if record['name'] in taken:
+            errors['name'] = 'У вас уже есть рецепт с таким названием.'
+        taken.add(record['name'])
+        if errors:
+            results.append({'line': line, 'errors': errors})
+        else:
+            valid.append((line, record))
+    return valid
+
+
+def _store_images(records, results):
+    with_images = [
+        (line, record) for line, record in records if record['image']
+    ]
+    stored = {}
+    if with_images:
+        with ThreadPoolExecutor(
+            max_workers=min(IMPORT_IMAGE_WORKERS, len(with_images)),
+            thread_name_prefix='recipe-import'
+        ) as pool:
+            stored = dict(zip(
+                (line for line, _ in with_images),
+                pool.map(
+                    store_image,
+                    (record['image'] for _, record in with_images)
+                )
+            ))
+    valid = []
+    for line, record in records:
+        name, error = stored.get(line, ('', None))
+        if error:
+            results.append({'line': line, 'errors': {'image': error}})
+        else:
+            valid.append((line, record, name))
+    return valid
+
+
+def _insert_chunk(chunk, author):
+    with transaction.atomic():
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                author=author,
+                name=record['name'],
+                text=record['text'],
+                cooking_time=record['cooking_time'],
+                image=image
+            )
+            for _, record, image in chunk
+        ])
+        if any(recipe.pk is None for recipe in recipes):
+            ids = dict(Recipe.objects.filter(
+                author=author, name__in=[recipe.name for recipe in recipes]
+            ).values_list('name', 'pk'))
+            for recipe in recipes:
+                recipe.pk = ids[recipe.name]
+        pairs = [
+            (recipe.pk, ingredient_id, amount)
+            for recipe, (_, record, _) in zip(recipes, chunk)
+            for ingredient_id, amount in record['ingredients']
+        ]
+        IngredientInRecipe.objects.bulk_create([
+            IngredientInRecipe(
+                recipe_id=recipe_id,
+                ingredient_id=ingredient_id,
+                amount=amount
+            )
+            for recipe_id, ingredient_id, amount in pairs
+        ], batch_size=IMPORT_CHUNK_SIZE)
+        transaction.on_commit(lambda: ingredient_index.update_recipes(
+            [recipe_id for recipe_id, _, _ in pairs],
+            [ingredient_id for _, ingredient_id, _ in pairs]
+        ))
+    return recipes
+
+
+def import_recipes(lines, author):
+    results = []
+    records = []
+    for line, content in enumerate(lines, 1):
+        if not content.strip():
+            continue
+        record, errors = parse_record(content)
+        if errors:
+            results.append({'line': line, 'errors': errors})
+        else:
+            records.append((line, record))
+    records = _check_references(records, author, results)
+    records = _store_images(records, results)
+    created = 0
+    for start in range(0, len(records), IMPORT_CHUNK_SIZE):
+        chunk = records[start:start + IMPORT_CHUNK_SIZE]
+        try:
+            recipes = _insert_chunk(chunk, author)
+        except IntegrityError:
+            for line, _, image in chunk:
+                if image:
+                    default_storage.delete(image)
+                results.append({
+                    'line': line,
+                    'errors': {'detail': 'Конфликт при сохранении пакета.'}
+                })
+            continue
+        created += len(recipes)
+        results.extend(
+            {'line': line, 'id': recipe.pk}
+            for (line, _, _), recipe in zip(chunk, recipes)
+        )
+    results.sort(key=lambda result: result['line'])
+    return {
+        'created': created,
+        'failed': len(results) - created,
+        'results': results,
+    }
@@ -7,3 +7,45 @@ EXTRA_VALUE_ON_RECIPE = 3
 MIN_VALUE_ON_RECIPE = 1
 PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
+SEARCH_CONFIG = 'russian'
+INGREDIENT_INDEX_CHUNK_SIZE = 10000
+INGREDIENT_INDEX_REFRESH_INTERVAL = 5
+INGREDIENT_INDEX_TTL = 300
+MAX_PANTRY_SIZE = 500
+MAX_MULTI_GET_SIZE = 100
+SIMILAR_RECIPES_TOP_K = 10
+SIMILAR_RECIPES_BLOCK_SIZE = 2048
+SIMILAR_RECIPES_CHUNK_SIZE = 50000
+TRENDING_BUCKET_SECONDS = 60 * 60
+TRENDING_HALF_LIFE_SECONDS = 24 * 60 * 60
+TRENDING_WINDOW_SECONDS = 7 * 24 * 60 * 60
+TRENDING_FAVORITE_WEIGHT = 1.0
+TRENDING_SHOPPING_CART_WEIGHT = 0.5
+TRENDING_SIZE = 100
+TRENDING_CACHE_KEY = 'trending-recipes'
+TRENDING_CACHE_TIMEOUT = 5
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 64 * 1024
+IMPORT_MAX_RECORDS = 10000
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_IMAGE_WORKERS = 4
+IMPORT_IMAGE_FORMATS = ('jpeg', 'png', 'gif', 'webp')
+MAX_SMALL_INTEGER = 32767
+PURGE_BATCH_SIZE = 1000
+MEDIA_GC_GRACE_HOURS = 24
+MEDIA_GC_WORKERS = 8
+MEDIA_GC_BATCH_SIZE = 5000
+SHORT_LINK_ALPHABET = (
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+)
+SHORT_LINK_CHUNK_SIZE = 10000
+SHORT_LINK_REFRESH_INTERVAL = 5
+SHORT_LINK_MISS_INTERVAL = 1
+SHORT_LINK_TTL = 60 * 60
+SHORT_LINK_CACHE_SECONDS = 5 * 60
+SHORT_LINK_MISS_CACHE_SECONDS = 60
+CHANGE_OBJECT_TYPE_LENGTH = 16
+SYNC_BATCH_SIZE = 500
+SYNC_MAX_BATCH_SIZE = 2000
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+SYNC_COMPACT_BATCH_SIZE = 5000
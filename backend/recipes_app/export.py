@@ -0,0 +1,175 @@
+import io
+import time
+import zipfile
+
+import orjson
+from django.core.files.storage import default_storage
+
+from recipes_app.constants import EXPORT_BATCH_SIZE, EXPORT_CHUNK_SIZE
+from recipes_app.models import Favorite, Recipe, ShoppingCart
+from users_app.models import Subscription, User
+
+DATA_FILE = 'data.ndjson'
+MEDIA_DIR = 'media'
+
+
+def _batches(queryset, batch_size):
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def _filter(queryset, user_ids, field):
+    if user_ids is None:
+        return queryset
+    return queryset.filter(**{f'{field}__in': user_ids})
+
+
+def _users(user_ids, batch_size):
+    queryset = _filter(User.objects.all(), user_ids, 'pk')
+    for batch in _batches(queryset, batch_size):
+        for user in batch:
+            yield {
+                'type': 'user',
+                'id': user.pk,
+                'email': user.email,
+                'username': user.username,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'avatar': user.avatar.name or None,
+                'date_joined': user.date_joined,
+            }
+
+
+def _recipes(user_ids, batch_size):
+    queryset = _filter(
+        Recipe.objects.defer('search_vector').prefetch_related(
+            'recipe_ingredients__ingredient'
+        ),
+        user_ids,
+        'author'
+    )
+    for batch in _batches(queryset, batch_size):
+        for recipe in batch:
+            yield {
+                'type': 'recipe',
+                'id': recipe.pk,
+                'author': recipe.author_id,
+                'name': recipe.name,
+                'text': recipe.text,
+                'cooking_time': recipe.cooking_time,
+                'pub_date': recipe.pub_date,
+                'image': recipe.image.name or None,
+                'ingredients': [
+                    {
+                        'id': item.ingredient_id,
+                        'name': item.ingredient.name,
+                        'measurement_unit': item.ingredient.measurement_unit,
+                        'amount': item.amount,
+                    }
+                    for item in recipe.recipe_ingredients.all()
+                ],
+            }
+
+
+def _relations(user_ids, batch_size):
+    for record_type, model in (
+        ('favorite', Favorite),
+        ('shopping_cart', ShoppingCart),
+    ):
+        rows = _filter(model.objects.all(), user_ids, 'user').order_by(
+            'pk'
+        ).values_list('user_id', 'recipe_id', 'created_at')
+        for user_id, recipe_id, created_at in rows.iterator(batch_size):
+            yield {
+                'type': record_type,
+                'user': user_id,
+                'recipe': recipe_id,
+                'created_at': created_at,
+            }
+    rows = _filter(
+        Subscription.objects.all(), user_ids, 'subscriber'
+    ).order_by('pk').values_list('subscriber_id', 'author_id')
+    for subscriber_id, author_id in rows.iterator(batch_size):
+        yield {
+            'type': 'subscription',
+            'subscriber': subscriber_id,
+            'author': author_id,
+        }
+
+
+def export_records(user_ids=None, batch_size=EXPORT_BATCH_SIZE):
+    yield from _users(user_ids, batch_size)
+    yield from _recipes(user_ids, batch_size)
+    yield from _relations(user_ids, batch_size)
+
+
+def export_ndjson(user_ids=None, batch_size=EXPORT_BATCH_SIZE):
+    buffer = []
+    size = 0
+    for record in export_records(user_ids, batch_size):
+        line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _media_names(user_ids, batch_size):
+    avatars = _filter(User.objects.exclude(avatar=''), user_ids, 'pk')
+    images = _filter(Recipe.objects.exclude(image=''), user_ids, 'author')
+    for queryset, field in ((avatars, 'avatar'), (images, 'image')):
+        yield from queryset.order_by('pk').values_list(
+            field, flat=True
+        ).iterator(batch_size)
+
+
+class _Pipe(io.RawIOBase):
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return b''.join(chunks)
+
+
+def export_zip(user_ids=None, batch_size=EXPORT_BATCH_SIZE):
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, 'w') as archive:
+        info = zipfile.ZipInfo(DATA_FILE, time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with archive.open(info, 'w', force_zip64=True) as stream:
+            for chunk in export_ndjson(user_ids, batch_size):
+                stream.write(chunk)
+                yield pipe.drain()
+        for name in _media_names(user_ids, batch_size):
+            try:
+                source = default_storage.open(name)
+            except OSError:
+                continue
+            with source, archive.open(
+                f'{MEDIA_DIR}/{name}', 'w', force_zip64=True
+            ) as stream:
+                for chunk in iter(
+                    lambda: source.read(EXPORT_CHUNK_SIZE), b''
+                ):
+                    stream.write(chunk)
+                    yield pipe.drain()
+    yield pipe.drain()
@@ -0,0 +1,296 @@
+import threading
+import time
+
+import numpy as np
+from django.db import connections
+
+from recipes_app.constants import (INGREDIENT_INDEX_CHUNK_SIZE,
+                                   INGREDIENT_INDEX_REFRESH_INTERVAL,
+                                   INGREDIENT_INDEX_TTL)
+from recipes_app.models import ChangeLog, IngredientInRecipe
+from recipes_app.sync import is_expired, latest_cursor, read_changes
+
+ID_DTYPE = np.int64
+EMPTY = np.empty(0, dtype=ID_DTYPE)
+
+
+def _group_pairs(ingredient_ids, recipe_ids):
+    order = np.lexsort((recipe_ids, ingredient_ids))
+    ingredient_ids = ingredient_ids[order]
+    recipe_ids = recipe_ids[order]
+    keys, starts = np.unique(ingredient_ids, return_index=True)
+    return {
+        int(key): posting
+        for key, posting in zip(keys, np.split(recipe_ids, starts[1:]))
+    }
+
+
+def rank_by_coverage(postings, sizes):
+    if not postings:
+        return EMPTY, np.empty(0), EMPTY
+    recipe_ids, matched = np.unique(
+        np.concatenate(postings), return_counts=True
+    )
+    totals = sizes[recipe_ids]
+    recipe_ids, matched, totals = (
+        recipe_ids[totals > 0], matched[totals > 0], totals[totals > 0]
+    )
+    coverage = matched / totals
+    missing = totals - matched
+    order = np.lexsort((recipe_ids, missing, -coverage))
+    return recipe_ids[order], coverage[order], missing[order]
+
+
+class IngredientIndex:
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._rebuild_thread = None
+        self._pending = None
+        self._generation = 0
+        self._postings = {}
+        self._ingredients = {}
+        self._sizes = np.zeros(0, dtype=np.int32)
+        self._cursor = (0, 0)
+        self._built_at = None
+        self._checked_at = None
+        self.version = 0
+
+    def _fetch_pairs(self, queryset):
+        ingredient_chunks, recipe_chunks = [], []
+        buffer = []
+        rows = queryset.filter(recipe__deleted_at__isnull=True).values_list(
+            'ingredient_id', 'recipe_id'
+        ).iterator(chunk_size=INGREDIENT_INDEX_CHUNK_SIZE)
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= INGREDIENT_INDEX_CHUNK_SIZE:
+                chunk = np.array(buffer, dtype=ID_DTYPE)
+                ingredient_chunks.append(chunk[:, 0])
+                recipe_chunks.append(chunk[:, 1])
+                buffer = []
+        if buffer:
+            chunk = np.array(buffer, dtype=ID_DTYPE)
+            ingredient_chunks.append(chunk[:, 0])
+            recipe_chunks.append(chunk[:, 1])
+        if not ingredient_chunks:
+            return EMPTY, EMPTY
+        return np.concatenate(ingredient_chunks), np.concatenate(recipe_chunks)
+
+    def _ensure_size(self, max_recipe_id):
+        if max_recipe_id >= len(self._sizes):
+            sizes = np.zeros(
+                max(max_recipe_id + 1, len(self._sizes) * 2), dtype=np.int32
+            )
+            sizes[:len(self._sizes)] = self._sizes
+            self._sizes = sizes
+
+    def _load(self):
+        cursor = latest_cursor()
+        ingredient_ids, recipe_ids = self._fetch_pairs(
+            IngredientInRecipe.objects.all()
+        )
+        sizes = np.zeros(0, dtype=np.int32)
+        if len(recipe_ids):
+            sizes = np.bincount(recipe_ids).astype(np.int32)
+        return (
+            _group_pairs(ingredient_ids, recipe_ids),
+            _group_pairs(recipe_ids, ingredient_ids),
+            sizes,
+            cursor
+        )
+
+    def _build(self):
+        with self._lock:
+            self._pending = []
+            self._generation += 1
+        try:
+            postings, ingredients, sizes, cursor = self._load()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._postings, self._ingredients = postings, ingredients
+            self._sizes, self._cursor = sizes, cursor
+            self._built_at = self._checked_at = time.monotonic()
+            self.version += 1
+            for change in pending:
+                self._replace_recipes(*change)
+
+    def _rebuild(self):
+        try:
+            with self._build_lock:
+                self._build()
+        finally:
+            self._rebuild_thread = None
+            connections.close_all()
+
+    def _start_rebuild(self):
+        if self._rebuild_thread is None:
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild, daemon=True
+            )
+            self._rebuild_thread.start()
+
+    def _replace_recipes(self, recipe_ids, ingredient_ids, pair_recipe_ids):
+        recipe_ids = np.unique(np.asarray(recipe_ids, dtype=ID_DTYPE))
+        if not len(recipe_ids):
+            return
+        removed = [
+            (self._ingredients.pop(int(recipe_id), EMPTY), recipe_id)
+            for recipe_id in recipe_ids
+        ]
+        for key, stale in _group_pairs(
+            np.concatenate([ingredients for ingredients, _ in removed]),
+            np.concatenate([
+                np.full(len(ingredients), recipe_id, dtype=ID_DTYPE)
+                for ingredients, recipe_id in removed
+            ])
+        ).items():
+            posting = np.setdiff1d(
+                self._postings.get(key, EMPTY), stale, assume_unique=True
+            )
+            if len(posting):
+                self._postings[key] = posting
+            else:
+                self._postings.pop(key, None)
+        self._ensure_size(int(recipe_ids[-1]))
+        self._sizes[recipe_ids] = 0
+        if len(pair_recipe_ids):
+            for key, added in _group_pairs(
+                ingredient_ids, pair_recipe_ids
+            ).items():
+                self._postings[key] = np.union1d(
+                    self._postings.get(key, EMPTY), added
+                )
+            self._ingredients.update(
+                _group_pairs(pair_recipe_ids, ingredient_ids)
+            )
+            touched, counts = np.unique(pair_recipe_ids, return_counts=True)
+            self._ensure_size(int(touched[-1]))
+            self._sizes[touched] = counts
+        self.version += 1
+
+    def _catch_up(self, generation, cursor):
+        # Soft deletes, restores and edits of existing rows do not create
+        # new IngredientInRecipe ids, so follow the change log instead.
+        if is_expired(cursor):
+            with self._lock:
+                self._start_rebuild()
+            return
+        recipe_ids, ingredient_chunks, recipe_chunks = [], [], []
+        while True:
+            changes = read_changes(cursor, INGREDIENT_INDEX_CHUNK_SIZE)
+            cursor = changes['cursor']
+            changed = changes['changed'][ChangeLog.RECIPE]
+            if changed:
+                ingredient_ids, pair_recipe_ids = self._fetch_pairs(
+                    IngredientInRecipe.objects.filter(recipe_id__in=changed)
+                )
+                recipe_ids += changed
+                ingredient_chunks.append(ingredient_ids)
+                recipe_chunks.append(pair_recipe_ids)
+            if not changes['has_more']:
+                break
+        with self._lock:
+            if generation != self._generation or self._pending is not None:
+                return
+            if recipe_ids:
+                self._replace_recipes(
+                    recipe_ids,
+                    np.concatenate(ingredient_chunks),
+                    np.concatenate(recipe_chunks)
+                )
+            self._cursor = cursor
+
+    def _apply(self, recipe_ids, ingredient_ids, pair_recipe_ids):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(
+                    (recipe_ids, ingredient_ids, pair_recipe_ids)
+                )
+            if self._built_at is not None:
+                self._replace_recipes(
+                    recipe_ids, ingredient_ids, pair_recipe_ids
+                )
+
+    def refresh(self):
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._build()
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now - self._built_at > INGREDIENT_INDEX_TTL:
+                self._start_rebuild()
+            due = (
+                self._pending is None
+                and now - self._checked_at > INGREDIENT_INDEX_REFRESH_INTERVAL
+            )
+            if due:
+                self._checked_at = now
+            generation, cursor = self._generation, self._cursor
+        if due:
+            self._catch_up(generation, cursor)
+
+    def update_recipe(self, recipe_id, ingredient_ids):
+        ingredient_ids = np.asarray(ingredient_ids, dtype=ID_DTYPE)
+        self._apply(
+            [recipe_id],
+            ingredient_ids,
+            np.full(len(ingredient_ids), recipe_id, dtype=ID_DTYPE)
+        )
+
+    def update_recipes(self, pair_recipe_ids, ingredient_ids):
+        pair_recipe_ids = np.asarray(pair_recipe_ids, dtype=ID_DTYPE)
+        self._apply(
+            pair_recipe_ids,
+            np.asarray(ingredient_ids, dtype=ID_DTYPE),
+            pair_recipe_ids
+        )
+
+    def remove_recipes(self, recipe_ids):
+        self._apply(recipe_ids, EMPTY, EMPTY)
+
+    def recipes_with_all(self, ingredient_ids):
+        self.refresh()
+        with self._lock:
+            postings = [
+                self._postings.get(int(key), EMPTY) for key in ingredient_ids
+            ]
+        if not postings:
+            return EMPTY
+        postings.sort(key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def rank_pantry(self, ingredient_ids):
+        self.refresh()
+        with self._lock:
+            postings = [
+                self._postings.get(int(key), EMPTY)
+                for key in set(ingredient_ids)
+            ]
+            sizes = self._sizes
+        return rank_by_coverage(postings, sizes)
+
+    def recipes_with_any(self, ingredient_ids):
+        self.refresh()
+        with self._lock:
+            postings = [
+                self._postings.get(int(key), EMPTY) for key in ingredient_ids
+            ]
+        if not postings:
+            return EMPTY
+        return np.unique(np.concatenate(postings))
+
+
+ingredient_index = IngredientIndex()
@@ -0,0 +1,83 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from foodgram.soft_delete import delete_in_batches
+from jobs_app.registry import job, report_progress
+from recipes_app.constants import PURGE_BATCH_SIZE
+from recipes_app.ingredient_index import ingredient_index
+from recipes_app.models import (Favorite, IngredientInRecipe, Recipe,
+                                ShoppingCart, SimilarRecipe, TrendingBucket,
+                                TrendingScore)
+from recipes_app.sync import compact_changelog
+from recipes_app.trending import compact_scores
+
+RECIPE_DEPENDENTS = (
+    (IngredientInRecipe, 'recipe'),
+    (Favorite, 'recipe'),
+    (ShoppingCart, 'recipe'),
+    (SimilarRecipe, 'recipe'),
+    (SimilarRecipe, 'similar'),
+    (TrendingBucket, 'recipe'),
+    (TrendingScore, 'recipe'),
+)
+
+
+@job('recipes.compact_trending')
+def compact_trending():
+    compact_scores()
+
+
+@job('recipes.compact_changelog')
+def compact_sync_changelog():
+    compact_changelog()
+
+
+def _delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+def purge_recipe_rows(recipe_ids):
+    recipe_ids = list(Recipe.all_objects.filter(
+        pk__in=recipe_ids, deleted_at__isnull=False
+    ).values_list('pk', flat=True))
+    if not recipe_ids:
+        return 0
+    rows = 0
+    for model, field in RECIPE_DEPENDENTS:
+        rows += delete_in_batches(
+            model.objects.filter(**{f'{field}__in': recipe_ids}),
+            PURGE_BATCH_SIZE
+        )
+    images = list(Recipe.all_objects.filter(
+        pk__in=recipe_ids
+    ).exclude(image='').values_list('image', flat=True))
+    with transaction.atomic():
+        rows += Recipe.all_objects.filter(pk__in=recipe_ids).delete()[0]
+        transaction.on_commit(lambda: _delete_files(images))
+    return rows
+
+
+@job('recipes.purge')
+def purge_recipes(recipe_ids):
+    rows = 0
+    for start in range(0, len(recipe_ids), PURGE_BATCH_SIZE):
+        rows += purge_recipe_rows(recipe_ids[start:start + PURGE_BATCH_SIZE])
+        report_progress(
+            recipes=len(recipe_ids),
+            processed=min(start + PURGE_BATCH_SIZE, len(recipe_ids)),
+            rows=rows
+        )
+
+
+def delete_recipes(recipe_ids):
+    recipe_ids = list(recipe_ids)
+    with transaction.atomic():
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            deleted_at=timezone.now()
+        )
+        purge_recipes.enqueue(recipe_ids=recipe_ids)
+        transaction.on_commit(
+            lambda: ingredient_index.remove_recipes(recipe_ids)
+        )
@@ -0,0 +1,140 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from recipes_app.constants import (SIMILAR_RECIPES_BLOCK_SIZE,
+                                   SIMILAR_RECIPES_CHUNK_SIZE,
+                                   SIMILAR_RECIPES_TOP_K)
+from recipes_app.models import Ingredient, IngredientInRecipe, SimilarRecipe
+from recipes_app.similarity import (COLUMNS_DTYPE, COLUMNS_FILE,
+                                    INDPTR_DTYPE, INDPTR_FILE, WEIGHTS_FILE,
+                                    idf_weights, top_k_block)
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Рассчитывает похожие рецепты по TF-IDF векторам ингредиентов '
+        'и сохраняет top-K соседей каждого рецепта.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=SIMILAR_RECIPES_TOP_K
+        )
+        parser.add_argument(
+            '--block-size', type=int, default=SIMILAR_RECIPES_BLOCK_SIZE
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1
+        )
+
+    def _write_matrix(self, workdir):
+        ingredient_ids = np.array(
+            Ingredient.objects.order_by('id').values_list('id', flat=True),
+            dtype=np.int64
+        )
+        frequency = np.zeros(len(ingredient_ids), dtype=np.int64)
+        recipe_ids, counts = [], []
+        rows = IngredientInRecipe.objects.order_by(
+            'recipe_id', 'ingredient_id'
+        ).values_list('recipe_id', 'ingredient_id').iterator(
+            chunk_size=SIMILAR_RECIPES_CHUNK_SIZE
+        )
+        with open(os.path.join(workdir, COLUMNS_FILE), 'wb') as columns:
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) < SIMILAR_RECIPES_CHUNK_SIZE:
+                    continue
+                self._write_chunk(
+                    buffer, ingredient_ids, columns, frequency,
+                    recipe_ids, counts
+                )
+                buffer = []
+            if buffer:
+                self._write_chunk(
+                    buffer, ingredient_ids, columns, frequency,
+                    recipe_ids, counts
+                )
+        if not recipe_ids:
+            return np.empty(0, dtype=np.int64)
+        recipe_ids = np.concatenate(recipe_ids)
+        counts = np.concatenate(counts)
+        boundaries = np.flatnonzero(np.diff(recipe_ids)) + 1
+        counts = np.add.reduceat(counts, np.r_[0, boundaries])
+        recipe_ids = recipe_ids[np.r_[0, boundaries]]
+        np.concatenate([[0], np.cumsum(counts)]).astype(INDPTR_DTYPE).tofile(
+            os.path.join(workdir, INDPTR_FILE)
+        )
+        idf_weights(frequency, len(recipe_ids)).tofile(
+            os.path.join(workdir, WEIGHTS_FILE)
+        )
+        return recipe_ids
+
+    def _write_chunk(
+        self, buffer, ingredient_ids, columns, frequency, recipe_ids, counts
+    ):
+        chunk = np.array(buffer, dtype=np.int64)
+        chunk_columns = np.searchsorted(ingredient_ids, chunk[:, 1])
+        chunk_columns.astype(COLUMNS_DTYPE).tofile(columns)
+        frequency += np.bincount(chunk_columns, minlength=len(frequency))
+        chunk_recipes, chunk_counts = np.unique(
+            chunk[:, 0], return_counts=True
+        )
+        recipe_ids.append(chunk_recipes)
+        counts.append(chunk_counts)
+
+    def _save_block(self, recipe_ids, start, neighbours, scores):
+        block_recipes = recipe_ids[start:start + len(neighbours)]
+        objects = [
+            SimilarRecipe(
+                recipe_id=int(recipe_id),
+                similar_id=int(recipe_ids[neighbour]),
+                rank=rank,
+                score=float(score)
+            )
+            for recipe_id, row_neighbours, row_scores in zip(
+                block_recipes, neighbours, scores
+            )
+            for rank, (neighbour, score) in enumerate(
+                (neighbour, score)
+                for neighbour, score in zip(row_neighbours, row_scores)
+                if score > 0
+            )
+        ]
+        with transaction.atomic():
+            SimilarRecipe.objects.filter(
+                recipe_id__in=block_recipes.tolist()
+            ).delete()
+            SimilarRecipe.objects.bulk_create(
+                objects, batch_size=SIMILAR_RECIPES_CHUNK_SIZE
+            )
+
+    def handle(self, *args, **options):
+        block_size = options['block_size']
+        top_k = options['top_k']
+        with tempfile.TemporaryDirectory() as workdir:
+            recipe_ids = self._write_matrix(workdir)
+            self.stdout.write(f'Рецептов в матрице: {len(recipe_ids)}')
+            SimilarRecipe.objects.exclude(
+                recipe_id__in=IngredientInRecipe.objects.values('recipe_id')
+            ).delete()
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                futures = [
+                    pool.submit(
+                        top_k_block, workdir, start,
+                        min(start + block_size, len(recipe_ids)),
+                        block_size, top_k
+                    )
+                    for start in range(0, len(recipe_ids), block_size)
+                ]
+                for done, future in enumerate(as_completed(futures), 1):
+                    self._save_block(recipe_ids, *future.result())
+                    self.stdout.write(f'Блоков готово: {done}/{len(futures)}')
+        self.stdout.write(self.style.SUCCESS('Похожие рецепты обновлены.'))
@@ -0,0 +1,116 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Sum
+
+from recipes_app.constants import PAGE_SIZE
+from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
+                                Recipe, ShoppingCart)
+from users_app.models import Subscription, User
+
+FULL_SCANS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)\s*$', re.M),
+}
+
+
+def hot_queries(user, author, ingredient):
+    recipes = Recipe.objects.annotate(
+        is_favorited=Exists(
+            Favorite.objects.filter(recipe=OuterRef('pk'), user=user)
+        ),
+        is_in_shopping_cart=Exists(
+            ShoppingCart.objects.filter(recipe=OuterRef('pk'), user=user)
+        )
+    )
+    return {
+        'recipe_list': recipes.order_by('-pub_date')[:PAGE_SIZE],
+        'author_recipes': (
+            recipes.filter(author=author).order_by('-pub_date')[:PAGE_SIZE]
+        ),
+        'favorited_recipes': (
+            recipes.filter(favorite__user=user).order_by('-pub_date')
+        ),
+        'user_favorites': (
+            Favorite.objects.filter(user=user).order_by('-created_at')
+        ),
+        'user_shopping_cart': (
+            ShoppingCart.objects.filter(user=user).order_by('-created_at')
+        ),
+        'shopping_list': IngredientInRecipe.objects.filter(
+            recipe__shoppingcart__user=user
+        ).values(
+            'ingredient__name', 'ingredient__measurement_unit'
+        ).annotate(total_amount=Sum('amount')),
+        'ingredient_recipes': IngredientInRecipe.objects.filter(
+            ingredient=ingredient
+        ).values('recipe_id'),
+        'author_subscribers': Subscription.objects.filter(author=author),
+        'is_subscribed': Subscription.objects.filter(
+            subscriber=user, author=author
+        ),
+        'user_subscriptions': Subscription.objects.filter(subscriber=user),
+    }
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Проверяет планы выполнения горячих запросов и завершается '
+        'с ошибкой, если какой-то из них читает таблицу целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--natural',
+            action='store_true',
+            help=(
+                'Не запрещать планировщику последовательное сканирование '
+                '(имеет смысл на заполненной базе).'
+            )
+        )
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCANS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(
+                f'СУБД {connection.vendor} не поддерживается.'
+            )
+        user = User.objects.filter(subscriptions__isnull=False).first()
+        author = Recipe.objects.values_list('author', flat=True).first()
+        ingredient = IngredientInRecipe.objects.values_list(
+            'ingredient', flat=True
+        ).first()
+        if user is None or author is None or ingredient is None:
+            raise CommandError(
+                'Недостаточно данных: заполните базу командой '
+                'generate_dataset.'
+            )
+        regressions = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql' and not options['natural']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for name, queryset in hot_queries(
+                user,
+                User(pk=author),
+                Ingredient(pk=ingredient)
+            ).items():
+                plan = queryset.explain()
+                scans = pattern.findall(plan)
+                if scans:
+                    regressions.append(name)
+                    self.stdout.write(self.style.ERROR(
+                        f'{name}: полное сканирование {", ".join(scans)}'
+                    ))
+                    self.stdout.write(plan)
+                else:
+                    self.stdout.write(f'{name}: OK')
+                    if options['verbosity'] > 1:
+                        self.stdout.write(plan)
+        if regressions:
+            raise CommandError(
+                f'Планы с полным сканированием: {", ".join(regressions)}'
+            )
+        self.stdout.write(self.style.SUCCESS('Все планы используют индексы.'))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from recipes_app.constants import MEDIA_GC_GRACE_HOURS, MEDIA_GC_WORKERS
+from recipes_app.media_gc import (delete_files, find_orphans,
+                                  media_directories, referenced_files)
+
+
+def _megabytes(size):
+    return f'{size / 1024 / 1024:.1f} МБ'
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Удаляет из MEDIA_ROOT изображения рецептов и аватары, на которые '
+        'больше не ссылается ни одна запись.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=MEDIA_GC_GRACE_HOURS,
+            help='Не трогать файлы моложе указанного числа часов.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=MEDIA_GC_WORKERS
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+
+    def handle(self, *args, **options):
+        referenced = referenced_files()
+        self.stdout.write(
+            f'Файлов в базе: {len(referenced)}; каталоги: '
+            f'{", ".join(media_directories())}.'
+        )
+        orphans = []
+        found = 0
+        for path, size in find_orphans(
+            referenced, options['grace_hours'] * 60 * 60
+        ):
+            orphans.append((path, size))
+            found += size
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{path} ({size} Б)')
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Будет удалено файлов: {len(orphans)}, '
+                f'освободится {_megabytes(found)}.'
+            ))
+            return
+        reclaimed = delete_files(orphans, options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено файлов: {len(orphans)}, '
+            f'освобождено {_megabytes(reclaimed)}.'
+        ))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from recipes_app.constants import (SYNC_COMPACT_BATCH_SIZE,
+                                   SYNC_TOMBSTONE_RETENTION_DAYS)
+from recipes_app.sync import compact_changelog
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Сжимает журнал изменений: оставляет последнюю запись для каждого '
+        'объекта и удаляет старые записи об удалённых объектах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=SYNC_TOMBSTONE_RETENTION_DAYS,
+            help=(
+                'Сколько дней хранить записи об удалении; клиентам с более '
+                'старым курсором придётся синхронизироваться заново.'
+            )
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=SYNC_COMPACT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        superseded, expired = compact_changelog(
+            options['retention_days'], options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено устаревших записей: {superseded}, '
+            f'старых записей об удалении: {expired}.'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from recipes_app.trending import compact_scores
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Удаляет устаревшие интервалы популярности и пересчитывает '
+        'очки рецептов с учётом затухания.'
+    )
+
+    def handle(self, *args, **options):
+        expired, buckets = compact_scores()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено интервалов: {expired}, учтено интервалов: {buckets}.'
+        ))
@@ -0,0 +1,58 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes_app.constants import EXPORT_BATCH_SIZE
+from recipes_app.export import export_ndjson, export_zip
+from users_app.models import User
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Выгружает пользователей, рецепты, избранное, списки покупок и '
+        'подписки в NDJSON или ZIP-архив с изображениями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            default=[],
+            help='Email или id пользователя; по умолчанию весь сайт.'
+        )
+        parser.add_argument('--output', default='-')
+        parser.add_argument('--zip', action='store_true')
+        parser.add_argument(
+            '--batch-size', type=int, default=EXPORT_BATCH_SIZE
+        )
+
+    def _user_ids(self, values):
+        if not values:
+            return None
+        user_ids = []
+        for value in values:
+            lookup = {'pk': value} if value.isdigit() else {'email': value}
+            try:
+                user_ids.append(User.objects.get(**lookup).pk)
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь {value} не найден.')
+        return user_ids
+
+    def handle(self, *args, **options):
+        user_ids = self._user_ids(options['user'])
+        export = export_zip if options['zip'] else export_ndjson
+        chunks = export(user_ids, options['batch_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        size = 0
+        with open(options['output'], 'wb') as stream:
+            for chunk in chunks:
+                stream.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выгружено {size} байт в {options["output"]}.'
+        ))
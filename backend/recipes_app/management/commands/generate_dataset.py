@@ -0,0 +1,259 @@
+import csv
+import multiprocessing
+import time
+from contextlib import ExitStack
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from recipes_app.models import (Favorite, Ingredient, IngredientInRecipe,
+                                Recipe, ShoppingCart)
+from users_app.models import Subscription, User
+
+ZIPF_EXPONENT = 1.2
+SCRAMBLE_PRIME = 2_147_483_647
+FIRST_NAMES = ('Анна', 'Иван', 'Мария', 'Олег', 'Елена', 'Пётр', 'Ольга')
+LAST_NAMES = ('Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов')
+DISHES = (
+    'Борщ', 'Плов', 'Салат', 'Пирог', 'Суп', 'Запеканка', 'Рагу',
+    'Каша', 'Омлет', 'Блины', 'Котлеты', 'Паста', 'Рыба', 'Десерт'
+)
+TEXT = (
+    'Подготовьте ингредиенты, смешайте их в нужном порядке и готовьте '
+    'до готовности, периодически помешивая. Подавайте горячим.'
+)
+PHASES = ('users', 'recipes', 'relations')
+
+
+def _rng(seed, phase, chunk):
+    return np.random.default_rng([seed, PHASES.index(phase), chunk])
+
+
+def _zipf(rng, size, population):
+    return (rng.zipf(ZIPF_EXPONENT, size=size) - 1) % population
+
+
+def _scramble(indexes, population):
+    return (indexes * SCRAMBLE_PRIME) % population
+
+
+def _users_task(plan, chunk, start, stop):
+    User.objects.bulk_create([
+        User(
+            id=plan['user_offset'] + index,
+            email=f'user{plan["user_offset"] + index}@example.com',
+            username=f'user{plan["user_offset"] + index}',
+            first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+            last_name=LAST_NAMES[index % len(LAST_NAMES)],
+            password=plan['password'],
+        )
+        for index in range(start, stop)
+    ], batch_size=plan['batch_size'])
+    return stop - start
+
+
+def _recipes_task(plan, chunk, start, stop):
+    rng = _rng(plan['seed'], 'recipes', chunk)
+    size = stop - start
+    authors = _scramble(_zipf(rng, size, plan['users']), plan['users'])
+    cooking_times = rng.integers(5, 180, size=size)
+    Recipe.objects.bulk_create([
+        Recipe(
+            id=plan['recipe_offset'] + index,
+            author_id=plan['user_offset'] + int(author),
+            name=(
+                f'{DISHES[index % len(DISHES)]} '
+                f'#{plan["recipe_offset"] + index}'
+            ),
+            text=TEXT,
+            cooking_time=int(cooking_time),
+        )
+        for index, author, cooking_time in zip(
+            range(start, stop), authors, cooking_times
+        )
+    ], batch_size=plan['batch_size'])
+
+    ingredient_ids = np.array(plan['ingredient_ids'], dtype=np.int64)
+    counts = np.clip(rng.poisson(plan['ingredients_per_recipe'], size), 1, 25)
+    recipe_ids = np.repeat(
+        np.arange(plan['recipe_offset'] + start, plan['recipe_offset'] + stop),
+        counts
+    )
+    picks = _zipf(rng, len(recipe_ids), len(ingredient_ids))
+    pairs = np.unique(recipe_ids * len(ingredient_ids) + picks)
+    recipe_ids, picks = np.divmod(pairs, len(ingredient_ids))
+    amounts = rng.integers(1, 500, size=len(pairs))
+    IngredientInRecipe.objects.bulk_create([
+        IngredientInRecipe(
+            recipe_id=int(recipe_id),
+            ingredient_id=int(ingredient_ids[pick]),
+            amount=int(amount)
+        )
+        for recipe_id, pick, amount in zip(recipe_ids, picks, amounts)
+    ], batch_size=plan['batch_size'])
+    return size + len(pairs)
+
+
+def _pairs(rng, users, average, population):
+    counts = rng.poisson(average, size=len(users))
+    owners = np.repeat(users, counts)
+    targets = _scramble(_zipf(rng, len(owners), population), population)
+    pairs = np.unique(owners * population + targets)
+    return np.divmod(pairs, population)
+
+
+def _relations_task(plan, chunk, start, stop):
+    rng = _rng(plan['seed'], 'relations', chunk)
+    users = np.arange(start, stop, dtype=np.int64)
+    created = 0
+    for model, average in (
+        (Favorite, plan['favorites']),
+        (ShoppingCart, plan['cart']),
+    ):
+        owners, recipes = _pairs(rng, users, average, plan['recipes'])
+        model.objects.bulk_create([
+            model(
+                user_id=plan['user_offset'] + int(owner),
+                recipe_id=plan['recipe_offset'] + int(recipe)
+            )
+            for owner, recipe in zip(owners, recipes)
+        ], batch_size=plan['batch_size'], ignore_conflicts=True)
+        created += len(owners)
+    subscribers, authors = _pairs(
+        rng, users, plan['subscriptions'], plan['users']
+    )
+    Subscription.objects.bulk_create([
+        Subscription(
+            subscriber_id=plan['user_offset'] + int(subscriber),
+            author_id=plan['user_offset'] + int(author)
+        )
+        for subscriber, author in zip(subscribers, authors)
+        if subscriber != author
+    ], batch_size=plan['batch_size'], ignore_conflicts=True)
+    return created + len(subscribers)
+
+
+TASKS = {
+    'users': _users_task,
+    'recipes': _recipes_task,
+    'relations': _relations_task,
+}
+
+
+def _run_task(arguments):
+    phase, plan, chunk, start, stop = arguments
+    try:
+        with transaction.atomic():
+            return TASKS[phase](plan, chunk, start, stop)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Генерирует синтетический набор пользователей, рецептов, '
+        'избранного, списков покупок и подписок для нагрузочных проверок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--recipes', type=int, default=100000)
+        parser.add_argument('--ingredients-per-recipe', type=float, default=7)
+        parser.add_argument('--favorites', type=float, default=20)
+        parser.add_argument('--cart', type=float, default=5)
+        parser.add_argument('--subscriptions', type=float, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--workers', type=int, default=multiprocessing.cpu_count()
+        )
+        parser.add_argument('--chunk-size', type=int, default=20000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--ingredients-csv',
+            default=settings.BASE_DIR.parent / 'data' / 'ingredients.csv'
+        )
+
+    def _load_ingredients(self, path):
+        try:
+            with open(path, encoding='utf-8') as stream:
+                rows = [row for row in csv.reader(stream) if len(row) == 2]
+        except OSError as error:
+            if not Ingredient.objects.exists():
+                raise CommandError(
+                    f'Не удалось прочитать ингредиенты: {error}'
+                )
+            rows = []
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=name, measurement_unit=unit)
+             for name, unit in rows],
+            batch_size=5000,
+            ignore_conflicts=True
+        )
+        return list(
+            Ingredient.objects.order_by('id').values_list('id', flat=True)
+        )
+
+    def _run_phase(self, run, phase, plan, total, chunk_size):
+        started = time.monotonic()
+        tasks = [
+            (phase, plan, chunk, start, min(start + chunk_size, total))
+            for chunk, start in enumerate(range(0, total, chunk_size))
+        ]
+        rows = sum(run(_run_task, tasks))
+        self.stdout.write(
+            f'{phase}: {rows} строк за {time.monotonic() - started:.1f} с'
+        )
+
+    def handle(self, *args, **options):
+        plan = {
+            'seed': options['seed'],
+            'users': options['users'],
+            'recipes': options['recipes'],
+            'ingredients_per_recipe': options['ingredients_per_recipe'],
+            'favorites': options['favorites'],
+            'cart': options['cart'],
+            'subscriptions': options['subscriptions'],
+            'batch_size': options['batch_size'],
+            'ingredient_ids': self._load_ingredients(
+                options['ingredients_csv']
+            ),
+            'user_offset': (
+                User.all_objects.aggregate(value=Max('id'))['value'] or 0
+            ) + 1,
+            'recipe_offset': (
+                Recipe.all_objects.aggregate(value=Max('id'))['value'] or 0
+            ) + 1,
+            'password': make_password('password'),
+        }
+        if not plan['users'] or not plan['recipes']:
+            raise CommandError('Нужен хотя бы один пользователь и рецепт.')
+        workers = options['workers']
+        if connection.vendor == 'sqlite':
+            workers = 1
+        connections.close_all()
+        with ExitStack() as stack:
+            run = map
+            if workers > 1:
+                run = stack.enter_context(
+                    multiprocessing.get_context('fork').Pool(workers)
+                ).imap_unordered
+            for phase, total in (
+                ('users', plan['users']),
+                ('recipes', plan['recipes']),
+                ('relations', plan['users']),
+            ):
+                self._run_phase(
+                    run, phase, plan, total, options['chunk_size']
+                )
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(
+                no_style(), [User, Recipe]
+            ):
+                cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS('Данные сгенерированы.'))
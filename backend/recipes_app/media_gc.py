@@ -0,0 +1,76 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from recipes_app.constants import MEDIA_GC_BATCH_SIZE, MEDIA_GC_WORKERS
+from recipes_app.models import Recipe
+from users_app.models import User
+
+MEDIA_FIELDS = (
+    (Recipe.all_objects, 'image'),
+    (User.all_objects, 'avatar'),
+)
+
+
+def media_directories():
+    return sorted({
+        manager.model._meta.get_field(field).upload_to.strip('/')
+        for manager, field in MEDIA_FIELDS
+    })
+
+
+def referenced_files():
+    referenced = set()
+    for manager, field in MEDIA_FIELDS:
+        referenced.update(
+            manager.exclude(**{field: ''}).values_list(
+                field, flat=True
+            ).iterator(chunk_size=MEDIA_GC_BATCH_SIZE)
+        )
+    return referenced
+
+
+def _walk(path):
+    try:
+        entries = os.scandir(path)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def find_orphans(referenced, grace_seconds, media_root=None):
+    media_root = media_root or settings.MEDIA_ROOT
+    cutoff = time.time() - grace_seconds
+    for directory in media_directories():
+        for entry in _walk(os.path.join(media_root, directory)):
+            name = os.path.relpath(entry.path, media_root).replace(
+                os.sep, '/'
+            )
+            if name in referenced:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime < cutoff:
+                yield entry.path, stat.st_size
+
+
+def _remove(orphan):
+    path, size = orphan
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return 0
+    return size
+
+
+def delete_files(orphans, workers=MEDIA_GC_WORKERS):
+    with ThreadPoolExecutor(
+        workers, thread_name_prefix='media-gc'
+    ) as pool:
+        return sum(pool.map(_remove, orphans, chunksize=64))
@@ -0,0 +1,115 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION recipes_app_recipe_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('russian', coalesce(NEW.name, '')), 'A')
+            || setweight(to_tsvector('russian', coalesce(NEW.text, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER recipes_app_recipe_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, text ON recipes_app_recipe
+    FOR EACH ROW EXECUTE FUNCTION recipes_app_recipe_search_vector_update();
+    """,
+    'UPDATE recipes_app_recipe SET name = name;',
+    """
+    CREATE INDEX recipes_app_recipe_search_vector_gin
+    ON recipes_app_recipe USING gin (search_vector);
+    """,
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS recipes_app_recipe_search_vector_gin;',
+    """
+    DROP TRIGGER IF EXISTS recipes_app_recipe_search_vector_trigger
+    ON recipes_app_recipe;
+    """,
+    'DROP FUNCTION IF EXISTS recipes_app_recipe_search_vector_update();',
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE recipes_app_recipe_fts USING fts5(
+        name, text,
+        content='recipes_app_recipe',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    """,
+    """
+    CREATE TRIGGER recipes_app_recipe_fts_insert
+    AFTER INSERT ON recipes_app_recipe BEGIN
+        INSERT INTO recipes_app_recipe_fts(rowid, name, text)
+        VALUES (new.id, new.name, new.text);
+    END;
+    """,
+    """
+    CREATE TRIGGER recipes_app_recipe_fts_delete
+    AFTER DELETE ON recipes_app_recipe BEGIN
+        INSERT INTO recipes_app_recipe_fts(
+            recipes_app_recipe_fts, rowid, name, text
+        ) VALUES ('delete', old.id, old.name, old.text);
+    END;
+    """,
+    """
+    CREATE TRIGGER recipes_app_recipe_fts_update
+    AFTER UPDATE OF name, text ON recipes_app_recipe BEGIN
+        INSERT INTO recipes_app_recipe_fts(
+            recipes_app_recipe_fts, rowid, name, text
+        ) VALUES ('delete', old.id, old.name, old.text);
+        INSERT INTO recipes_app_recipe_fts(rowid, name, text)
+        VALUES (new.id, new.name, new.text);
+    END;
+    """,
+    "INSERT INTO recipes_app_recipe_fts(recipes_app_recipe_fts) "
+    "VALUES ('rebuild');",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS recipes_app_recipe_fts_update;',
+    'DROP TRIGGER IF EXISTS recipes_app_recipe_fts_delete;',
+    'DROP TRIGGER IF EXISTS recipes_app_recipe_fts_insert;',
+    'DROP TABLE IF EXISTS recipes_app_recipe_fts;',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes_app', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunPython(
+            _run({
+                'postgresql': POSTGRES_FORWARD,
+                'sqlite': SQLITE_FORWARD,
+            }),
+            _run({
+                'postgresql': POSTGRES_REVERSE,
+                'sqlite': SQLITE_REVERSE,
+            }),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.3 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+from recipes_app.migrations._search_triggers import \
+    restore_sqlite_search_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes_app', '0006_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='recipe',
+            name='unique_author_recipe',
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.RunPython(
+            restore_sqlite_search_triggers, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='recipe',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('author', 'name'), name='unique_author_recipe'),
+        ),
+    ]
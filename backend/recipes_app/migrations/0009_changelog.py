@@ -0,0 +1,182 @@
+# Generated by Django 3.2.3 on 2026-10-19 10:23
+
+from django.db import migrations, models
+
+CHANGELOG_TABLE = 'recipes_app_changelog'
+TRACKED = (
+    ('recipes_app_recipe', 'recipe', 'id'),
+    ('recipes_app_ingredient', 'ingredient', 'id'),
+    ('recipes_app_ingredientinrecipe', 'recipe', 'recipe_id'),
+)
+EVENTS = {
+    'insert': 'REFERENCING NEW TABLE AS new_rows',
+    'update': 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'delete': 'REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def _postgres_forward():
+    statements = []
+    for table, object_type, column in TRACKED:
+        statements.append(f"""
+        CREATE FUNCTION {table}_changelog()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO {CHANGELOG_TABLE}
+                    (object_type, object_id, txid, created_at)
+                SELECT DISTINCT '{object_type}', {column}, txid_current(),
+                    clock_timestamp()
+                FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO {CHANGELOG_TABLE}
+                    (object_type, object_id, txid, created_at)
+                SELECT DISTINCT '{object_type}', {column}, txid_current(),
+                    clock_timestamp()
+                FROM old_rows;
+            ELSE
+                INSERT INTO {CHANGELOG_TABLE}
+                    (object_type, object_id, txid, created_at)
+                SELECT '{object_type}', changed.{column}, txid_current(),
+                    clock_timestamp()
+                FROM (
+                    SELECT {column} FROM new_rows
+                    UNION SELECT {column} FROM old_rows
+                ) AS changed;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        """)
+        for event, referencing in EVENTS.items():
+            statements.append(f"""
+            CREATE TRIGGER {table}_changelog_{event}
+            AFTER {event.upper()} ON {table}
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {table}_changelog();
+            """)
+    return statements
+
+
+def _postgres_reverse():
+    statements = []
+    for table, _, _ in TRACKED:
+        for event in EVENTS:
+            statements.append(
+                f'DROP TRIGGER IF EXISTS {table}_changelog_{event} '
+                f'ON {table};'
+            )
+        statements.append(f'DROP FUNCTION IF EXISTS {table}_changelog();')
+    return statements
+
+
+def _log(object_type, value):
+    return (
+        f'INSERT INTO {CHANGELOG_TABLE} '
+        f'(object_type, object_id, txid, created_at) '
+        f"VALUES ('{object_type}', {value}, 0, "
+        f"strftime('%Y-%m-%d %H:%M:%f', 'now'));"
+    )
+
+
+def _sqlite_forward():
+    statements = []
+    for table, object_type, column in TRACKED:
+        statements += [
+            f"""
+            CREATE TRIGGER {table}_changelog_insert
+            AFTER INSERT ON {table} BEGIN
+                {_log(object_type, f'new.{column}')}
+            END;
+            """,
+            f"""
+            CREATE TRIGGER {table}_changelog_update
+            AFTER UPDATE ON {table} BEGIN
+                {_log(object_type, f'new.{column}')}
+                INSERT INTO {CHANGELOG_TABLE}
+                    (object_type, object_id, txid, created_at)
+                SELECT '{object_type}', old.{column}, 0,
+                    strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE old.{column} != new.{column};
+            END;
+            """,
+            f"""
+            CREATE TRIGGER {table}_changelog_delete
+            AFTER DELETE ON {table} BEGIN
+                {_log(object_type, f'old.{column}')}
+            END;
+            """,
+        ]
+    return statements
+
+
+def _sqlite_reverse():
+    return [
+        f'DROP TRIGGER IF EXISTS {table}_changelog_{event};'
+        for table, _, _ in TRACKED
+        for event in EVENTS
+    ]
+
+
+def _seed(txid):
+    return [
+        f'INSERT INTO {CHANGELOG_TABLE} '
+        f'(object_type, object_id, txid, created_at) '
+        f"SELECT '{object_type}', id, {txid}, CURRENT_TIMESTAMP "
+        f'FROM {table} ORDER BY id;'
+        for table, object_type, column in TRACKED
+        if column == 'id'
+    ]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes_app', '0008_recipe_deleted_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('recipe', 'Рецепт'), ('ingredient', 'Ингредиент'), ('reset', 'Сброс курсоров')], max_length=16, verbose_name='Тип объекта')),
+                ('object_id', models.BigIntegerField(verbose_name='Идентификатор объекта')),
+                ('txid', models.BigIntegerField(editable=False, verbose_name='Транзакция')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['object_type', 'object_id', 'id'], name='changelog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['txid', 'id'], name='changelog_txid_idx'),
+        ),
+        migrations.RunPython(
+            _run({
+                'postgresql': _seed('txid_current()') + _postgres_forward(),
+                'sqlite': _seed('0') + _sqlite_forward(),
+            }),
+            _run({
+                'postgresql': _postgres_reverse(),
+                'sqlite': _sqlite_reverse(),
+            }),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from recipes_app.migrations._search_triggers import \
+    restore_sqlite_search_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes_app', '0009_changelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            restore_sqlite_search_triggers, migrations.RunPython.noop
+        ),
+    ]
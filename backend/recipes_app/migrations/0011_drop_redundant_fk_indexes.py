@@ -0,0 +1,61 @@
+# Generated by Django 3.2.3 on 2026-10-19 12:40
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from recipes_app.migrations._search_triggers import \
+    restore_sqlite_search_triggers
+
+changelog_migration = import_module('recipes_app.migrations.0009_changelog')
+
+
+def restore_sqlite_triggers(apps, schema_editor):
+    # SQLite rebuilds the altered tables and drops their triggers.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in (
+        changelog_migration._sqlite_reverse()
+        + changelog_migration._sqlite_forward()
+    ):
+        schema_editor.execute(statement)
+    restore_sqlite_search_triggers(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes_app', '0010_restore_search_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_sqlite_triggers
+        ),
+        migrations.AlterField(
+            model_name='favorite',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='favorite', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AlterField(
+            model_name='ingredientinrecipe',
+            name='ingredient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ingredient_recipes', to='recipes_app.ingredient', verbose_name='Ингредиент'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='recipes', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        migrations.AlterField(
+            model_name='shoppingcart',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='shoppingcart', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.RunPython(
+            restore_sqlite_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,22 @@
+from importlib import import_module
+
+search_migration = import_module(
+    'recipes_app.migrations.0003_recipe_search_vector'
+)
+
+SQLITE_TRIGGERS = [
+    statement.replace('CREATE TRIGGER ', 'CREATE TRIGGER IF NOT EXISTS ', 1)
+    for statement in search_migration.SQLITE_FORWARD
+    if 'CREATE TRIGGER' in statement
+]
+SQLITE_REBUILD = (
+    "INSERT INTO recipes_app_recipe_fts(recipes_app_recipe_fts) "
+    "VALUES ('rebuild');"
+)
+
+
+def restore_sqlite_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_TRIGGERS + [SQLITE_REBUILD]:
+        schema_editor.execute(statement)
@@ -1,8 +1,11 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
 
-from recipes_app.constants import (INGREDIENT_NAME_LENGTH,
+from foodgram.soft_delete import SoftDeleteManager
+from recipes_app.constants import (CHANGE_OBJECT_TYPE_LENGTH,
+                                   INGREDIENT_NAME_LENGTH,
                                    MIN_VALUE_AMOUNT_INGREDIENTS,
                                    RECIPE_NAME_LENGTH, UNIT_NAME_LENGTH)
 from recipes_app.validators import validate_ingredient_name, validate_time
@@ -14,6 +17,7 @@ class UserRecipeBaseModel(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='%(class)s',
+        db_index=False,
         verbose_name='Пользователь'
     )
     recipe = models.ForeignKey(
@@ -37,6 +41,12 @@ class UserRecipeBaseModel(models.Model):
                 name='unique_%(class)s'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at'],
+                name='%(class)s_user_created_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.user} - {self.recipe}'
@@ -48,6 +58,7 @@ class Recipe(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='recipes',
+        db_index=False,
         verbose_name='Автор'
     )
     ingredients = models.ManyToManyField(
@@ -77,6 +88,20 @@ class Recipe(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор'
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Дата удаления'
+    )
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
 
     class Meta:
 
@@ -86,9 +111,22 @@ class Recipe(models.Model):
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'name'],
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_author_recipe'
             )
         ]
+        indexes = [
+            models.Index(fields=['-pub_date'], name='recipe_pub_date_idx'),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='recipe_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='recipe_deleted_at_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name
@@ -132,6 +170,7 @@ class IngredientInRecipe(models.Model):
         Ingredient,
         on_delete=models.CASCADE,
         related_name='ingredient_recipes',
+        db_index=False,
         verbose_name='Ингредиент'
     )
     amount = models.PositiveSmallIntegerField(
@@ -149,6 +188,12 @@ class IngredientInRecipe(models.Model):
                 name='unique_recipe_ingredient'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['ingredient', 'recipe'],
+                name='ingredient_recipe_idx'
+            )
+        ]
 
     def __str__(self):
         return (
@@ -170,4 +215,146 @@ class ShoppingCart(UserRecipeBaseModel):
     class Meta(UserRecipeBaseModel.Meta):
 
         verbose_name = 'Список покупок'
-        verbose_name_plural = 'Списки покупок'
\ No newline at end of file
+        verbose_name_plural = 'Списки покупок'
+
+
+class SimilarRecipe(models.Model):
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='similar_recipes',
+        verbose_name='Рецепт'
+    )
+    similar = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Похожий рецепт'
+    )
+    rank = models.PositiveSmallIntegerField(
+        verbose_name='Позиция'
+    )
+    score = models.FloatField(
+        verbose_name='Косинусная близость'
+    )
+
+    class Meta:
+
+        verbose_name = 'Похожий рецепт'
+        verbose_name_plural = 'Похожие рецепты'
+        ordering = ['recipe', 'rank']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'rank'],
+                name='unique_similar_recipe_rank'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.recipe} ~ {self.similar}'
+
+
+class TrendingBucket(models.Model):
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='trending_buckets',
+        verbose_name='Рецепт'
+    )
+    bucket = models.DateTimeField(
+        verbose_name='Начало интервала'
+    )
+    score = models.FloatField(
+        default=0,
+        verbose_name='Очки'
+    )
+
+    class Meta:
+
+        verbose_name = 'Интервал популярности'
+        verbose_name_plural = 'Интервалы популярности'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'bucket'],
+                name='unique_trending_bucket'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['bucket'], name='trending_bucket_idx')
+        ]
+
+    def __str__(self):
+        return f'{self.recipe} ({self.bucket}): {self.score}'
+
+
+class TrendingScore(models.Model):
+
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Рецепт'
+    )
+    score = models.FloatField(
+        default=0,
+        verbose_name='Очки'
+    )
+
+    class Meta:
+
+        verbose_name = 'Популярность рецепта'
+        verbose_name_plural = 'Популярность рецептов'
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score_idx')
+        ]
+
+    def __str__(self):
+        return f'{self.recipe}: {self.score}'
+
+
+class ChangeLog(models.Model):
+
+    RECIPE = 'recipe'
+    INGREDIENT = 'ingredient'
+    RESET = 'reset'
+    OBJECT_TYPES = (
+        (RECIPE, 'Рецепт'),
+        (INGREDIENT, 'Ингредиент'),
+        (RESET, 'Сброс курсоров'),
+    )
+
+    object_type = models.CharField(
+        max_length=CHANGE_OBJECT_TYPE_LENGTH,
+        choices=OBJECT_TYPES,
+        verbose_name='Тип объекта'
+    )
+    object_id = models.BigIntegerField(
+        verbose_name='Идентификатор объекта'
+    )
+    txid = models.BigIntegerField(
+        editable=False,
+        verbose_name='Транзакция'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата изменения'
+    )
+
+    class Meta:
+
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['object_type', 'object_id', 'id'],
+                name='changelog_object_idx'
+            ),
+            models.Index(fields=['txid', 'id'], name='changelog_txid_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.pk}: {self.object_type} {self.object_id}'
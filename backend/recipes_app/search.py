@@ -0,0 +1,43 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+
+from recipes_app.constants import SEARCH_CONFIG
+
+FTS_TABLE = 'recipes_app_recipe_fts'
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _fts5_query(value):
+    words = WORD_PATTERN.findall(value)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_recipes(queryset, value):
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', '-pub_date')
+    if vendor == 'sqlite':
+        query = _fts5_query(value)
+        if not query:
+            return queryset.none()
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND {FTS_TABLE}.rowid = recipes_app_recipe.id',
+            (query,),
+            output_field=FloatField()
+        )
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                (query,)
+            )
+        ).annotate(search_rank=rank).order_by('-search_rank', '-pub_date')
+    return queryset.filter(name__icontains=value)
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from recipes_app.constants import (SHORT_LINK_ALPHABET, SHORT_LINK_CHUNK_SIZE,
+                                   SHORT_LINK_MISS_INTERVAL,
+                                   SHORT_LINK_REFRESH_INTERVAL, SHORT_LINK_TTL)
+from recipes_app.models import ChangeLog, Recipe
+from recipes_app.sync import is_expired, latest_cursor, read_changes
+
+BASE = len(SHORT_LINK_ALPHABET)
+DIGITS = {char: value for value, char in enumerate(SHORT_LINK_ALPHABET)}
+SALT = 'recipes_app.short_links'
+
+
+def _to_base62(number):
+    chars = []
+    while True:
+        number, remainder = divmod(number, BASE)
+        chars.append(SHORT_LINK_ALPHABET[remainder])
+        if not number:
+            return ''.join(reversed(chars))
+
+
+def _from_base62(code):
+    number = 0
+    for char in code:
+        number = number * BASE + DIGITS[char]
+    return number
+
+
+def _signature(recipe_id):
+    length = settings.SHORT_LINK_SIGNATURE_LENGTH
+    digest = salted_hmac(SALT, str(recipe_id)).digest()
+    return _to_base62(int.from_bytes(digest, 'big'))[:length]
+
+
+def encode(recipe_id):
+    code = _to_base62(recipe_id) + _signature(recipe_id)
+    if code.isdigit():
+        code = SHORT_LINK_ALPHABET[0] + code
+    return code
+
+
+def decode(code):
+    if code.isdigit():
+        if (
+            settings.SHORT_LINK_SIGNATURE_LENGTH
+            and not settings.SHORT_LINK_ALLOW_LEGACY
+        ):
+            return None
+        return int(code)
+    if not code or any(char not in DIGITS for char in code):
+        return None
+    length = settings.SHORT_LINK_SIGNATURE_LENGTH
+    body, signature = code[:len(code) - length], code[len(code) - length:]
+    if not body:
+        return None
+    recipe_id = _from_base62(body)
+    if not constant_time_compare(signature, _signature(recipe_id)):
+        return None
+    return recipe_id
+
+
+class RecipeIdSet:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bits = np.zeros(0, dtype=bool)
+        self._max_id = 0
+        self._cursor = (0, 0)
+        self._built_at = None
+        self._checked_at = None
+
+    def _assign(self, recipe_ids, value):
+        recipe_ids = np.fromiter(recipe_ids, dtype=np.int64)
+        if not len(recipe_ids):
+            return
+        top = int(recipe_ids.max())
+        if top >= len(self._bits):
+            bits = np.zeros(max(top + 1, len(self._bits) * 2), dtype=bool)
+            bits[:len(self._bits)] = self._bits
+            self._bits = bits
+        self._bits[recipe_ids] = value
+        if value:
+            self._max_id = max(self._max_id, top)
+
+    def _build(self):
+        self._cursor = latest_cursor()
+        self._bits = np.zeros(0, dtype=bool)
+        self._max_id = 0
+        self._assign(Recipe.objects.values_list('pk', flat=True).iterator(
+            chunk_size=SHORT_LINK_CHUNK_SIZE
+        ), True)
+        self._built_at = self._checked_at = time.monotonic()
+
+    def _catch_up(self):
+        # Follow the change log: creation is not the only way a recipe
+        # becomes live, a soft-deleted one can also be restored.
+        if is_expired(self._cursor):
+            self._build()
+            return
+        while True:
+            changes = read_changes(self._cursor, SHORT_LINK_CHUNK_SIZE)
+            changed = changes['changed'][ChangeLog.RECIPE]
+            live = set(Recipe.objects.filter(
+                pk__in=changed
+            ).values_list('pk', flat=True))
+            self._assign(live, True)
+            self._assign(
+                (recipe_id for recipe_id in changed if recipe_id not in live),
+                False
+            )
+            self._cursor = changes['cursor']
+            if not changes['has_more']:
+                break
+        self._checked_at = time.monotonic()
+
+    def refresh(self, recipe_id=None):
+        with self._lock:
+            now = time.monotonic()
+            if self._built_at is None or now - self._built_at > SHORT_LINK_TTL:
+                self._build()
+            elif now - self._checked_at > SHORT_LINK_REFRESH_INTERVAL or (
+                recipe_id is not None
+                and recipe_id > self._max_id
+                and now - self._checked_at > SHORT_LINK_MISS_INTERVAL
+            ):
+                self._catch_up()
+
+    def is_unseen(self, recipe_id):
+        return recipe_id > self._max_id
+
+    def __contains__(self, recipe_id):
+        self.refresh(recipe_id)
+        return 0 < recipe_id < len(self._bits) and bool(
+            self._bits[recipe_id]
+        )
+
+
+live_recipe_ids = RecipeIdSet()
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+INDPTR_FILE = 'indptr.bin'
+COLUMNS_FILE = 'columns.bin'
+WEIGHTS_FILE = 'weights.bin'
+INDPTR_DTYPE = np.int64
+COLUMNS_DTYPE = np.int32
+WEIGHTS_DTYPE = np.float32
+
+
+def open_matrix(workdir):
+    indptr = np.fromfile(
+        os.path.join(workdir, INDPTR_FILE), dtype=INDPTR_DTYPE
+    )
+    columns = np.memmap(
+        os.path.join(workdir, COLUMNS_FILE), dtype=COLUMNS_DTYPE, mode='r'
+    )
+    weights = np.fromfile(
+        os.path.join(workdir, WEIGHTS_FILE), dtype=WEIGHTS_DTYPE
+    )
+    return indptr, columns, weights
+
+
+def idf_weights(document_frequency, documents):
+    return (
+        np.log((1 + documents) / (1 + document_frequency)) + 1
+    ).astype(WEIGHTS_DTYPE)
+
+
+def dense_block(indptr, columns, weights, start, stop):
+    block = np.zeros((stop - start, len(weights)), dtype=WEIGHTS_DTYPE)
+    block_columns = np.asarray(columns[indptr[start]:indptr[stop]])
+    rows = np.repeat(
+        np.arange(stop - start), np.diff(indptr[start:stop + 1])
+    )
+    block[rows, block_columns] = weights[block_columns]
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return block / norms
+
+
+def top_k_block(workdir, start, stop, block_size, top_k):
+    indptr, columns, weights = open_matrix(workdir)
+    rows = len(indptr) - 1
+    query = dense_block(indptr, columns, weights, start, stop)
+    best_scores = np.zeros((stop - start, 0), dtype=WEIGHTS_DTYPE)
+    best_index = np.zeros((stop - start, 0), dtype=np.int64)
+    for candidate_start in range(0, rows, block_size):
+        candidate_stop = min(candidate_start + block_size, rows)
+        scores = query @ dense_block(
+            indptr, columns, weights, candidate_start, candidate_stop
+        ).T
+        overlap_start = max(start, candidate_start)
+        overlap_stop = min(stop, candidate_stop)
+        if overlap_start < overlap_stop:
+            own = np.arange(overlap_start, overlap_stop)
+            scores[own - start, own - candidate_start] = 0
+        candidates = np.broadcast_to(
+            np.arange(candidate_start, candidate_stop), scores.shape
+        )
+        best_scores = np.hstack([best_scores, scores])
+        best_index = np.hstack([best_index, candidates])
+        if best_scores.shape[1] > top_k:
+            keep = np.argpartition(-best_scores, top_k - 1, axis=1)[:, :top_k]
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_index = np.take_along_axis(best_index, keep, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return (
+        start,
+        np.take_along_axis(best_index, order, axis=1),
+        np.take_along_axis(best_scores, order, axis=1),
+    )
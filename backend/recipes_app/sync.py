@@ -0,0 +1,123 @@
+import re
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from foodgram.soft_delete import delete_in_batches
+from recipes_app.constants import (SYNC_COMPACT_BATCH_SIZE,
+                                   SYNC_TOMBSTONE_RETENTION_DAYS)
+from recipes_app.models import ChangeLog, Ingredient, Recipe
+
+LIVE_OBJECTS = {
+    ChangeLog.RECIPE: Recipe.objects,
+    ChangeLog.INGREDIENT: Ingredient.objects,
+}
+CURSOR_PATTERN = re.compile(r'^(\d+)(?:\.(\d+))?$')
+COMMITTED_HORIZON_SQL = 'txid_snapshot_xmin(txid_current_snapshot())'
+
+
+def parse_cursor(value):
+    match = CURSOR_PATTERN.match(value)
+    if match is None:
+        return None
+    txid, pk = match.groups()
+    return int(txid), int(pk or 0)
+
+
+def format_cursor(cursor):
+    return '{}.{}'.format(*cursor)
+
+
+def _after(cursor, pk_field='pk'):
+    txid, pk = cursor
+    return Q(txid__gt=txid) | Q(txid=txid, **{f'{pk_field}__gt': pk})
+
+
+def _committed(queryset):
+    # PostgreSQL hands out ids at insert time, not at commit, so only rows
+    # older than every running transaction are final. SQLite has a single
+    # writer: rows are logged with txid 0 and commit in id order.
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset
+    return queryset.filter(txid__lt=RawSQL(COMMITTED_HORIZON_SQL, ()))
+
+
+def latest_cursor():
+    return _committed(ChangeLog.objects.all()).order_by(
+        '-txid', '-pk'
+    ).values_list('txid', 'pk').first() or (0, 0)
+
+
+def is_expired(cursor):
+    return cursor != (0, 0) and ChangeLog.objects.filter(
+        _after(cursor, pk_field='object_id'),
+        object_type=ChangeLog.RESET
+    ).exists()
+
+
+def read_changes(cursor, limit):
+    entries = list(_committed(ChangeLog.objects.filter(
+        _after(cursor), object_type__in=list(LIVE_OBJECTS)
+    )).order_by('txid', 'pk').values_list(
+        'txid', 'pk', 'object_type', 'object_id'
+    )[:limit])
+    changed = {object_type: {} for object_type in LIVE_OBJECTS}
+    for _, _, object_type, object_id in entries:
+        changed[object_type][object_id] = None
+    return {
+        'cursor': entries[-1][:2] if entries else cursor,
+        'has_more': len(entries) == limit,
+        'changed': {
+            object_type: list(object_ids)
+            for object_type, object_ids in changed.items()
+        },
+    }
+
+
+def _superseded():
+    return ChangeLog.objects.filter(Exists(ChangeLog.objects.filter(
+        Q(txid__gt=OuterRef('txid'))
+        | Q(txid=OuterRef('txid'), pk__gt=OuterRef('pk')),
+        object_type=OuterRef('object_type'),
+        object_id=OuterRef('object_id')
+    )))
+
+
+def _expired_tombstones(cutoff):
+    for object_type, objects in LIVE_OBJECTS.items():
+        yield ChangeLog.objects.filter(
+            ~Exists(objects.filter(pk=OuterRef('object_id'))),
+            object_type=object_type,
+            created_at__lt=cutoff
+        )
+
+
+def compact_changelog(
+    retention_days=SYNC_TOMBSTONE_RETENTION_DAYS,
+    batch_size=SYNC_COMPACT_BATCH_SIZE
+):
+    superseded = delete_in_batches(_superseded(), batch_size)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = 0
+    for tombstones in _expired_tombstones(cutoff):
+        horizon = tombstones.order_by('-txid', '-pk').values_list(
+            'txid', 'pk'
+        ).first()
+        if horizon is None:
+            continue
+        with transaction.atomic():
+            previous = ChangeLog.objects.filter(
+                object_type=ChangeLog.RESET
+            ).values_list('txid', 'object_id').first() or (0, 0)
+            ChangeLog.objects.filter(object_type=ChangeLog.RESET).delete()
+            txid, pk = max(previous, horizon)
+            ChangeLog.objects.create(
+                object_type=ChangeLog.RESET, object_id=pk, txid=txid
+            )
+        expired += delete_in_batches(
+            tombstones.exclude(_after(horizon)), batch_size
+        )
+    return superseded, expired
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone as django_timezone
+
+from foodgram.metrics import count_cache
+from recipes_app.constants import (TRENDING_BUCKET_SECONDS,
+                                   TRENDING_CACHE_KEY, TRENDING_CACHE_TIMEOUT,
+                                   TRENDING_FAVORITE_WEIGHT,
+                                   TRENDING_HALF_LIFE_SECONDS,
+                                   TRENDING_SHOPPING_CART_WEIGHT,
+                                   TRENDING_SIZE, TRENDING_WINDOW_SECONDS)
+from recipes_app.models import (Favorite, ShoppingCart, TrendingBucket,
+                                TrendingScore)
+
+EVENT_WEIGHTS = {
+    Favorite: TRENDING_FAVORITE_WEIGHT,
+    ShoppingCart: TRENDING_SHOPPING_CART_WEIGHT,
+}
+
+
+def _bucket_start(moment):
+    timestamp = moment.timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % TRENDING_BUCKET_SECONDS, tz=timezone.utc
+    )
+
+
+def _decay(moment, now):
+    age = max((now - moment).total_seconds(), 0)
+    return 0.5 ** (age / TRENDING_HALF_LIFE_SECONDS)
+
+
+def _increment(model, weight, **lookup):
+    score = Greatest(F('score') + weight, 0.0)
+    if model.objects.filter(**lookup).update(score=score) or weight <= 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(score=weight, **lookup)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(score=score)
+
+
+def record_event(model, recipe_id, added=True, created_at=None):
+    now = django_timezone.now()
+    bucket = _bucket_start(created_at or now)
+    if bucket < now - timedelta(seconds=TRENDING_WINDOW_SECONDS):
+        return
+    weight = EVENT_WEIGHTS[model] if added else -EVENT_WEIGHTS[model]
+    _increment(TrendingBucket, weight, recipe_id=recipe_id, bucket=bucket)
+    # Compaction stores bucket sums decayed to the time it ran, so the live
+    # score has to receive the same decayed weight to stay comparable.
+    _increment(
+        TrendingScore, weight * _decay(bucket, now), recipe_id=recipe_id
+    )
+
+
+def get_trending_ids():
+    recipe_ids = cache.get(TRENDING_CACHE_KEY)
+    count_cache('trending', recipe_ids is not None)
+    if recipe_ids is None:
+        recipe_ids = list(
+            TrendingScore.objects.filter(score__gt=0)
+            .order_by('-score')
+            .values_list('recipe_id', flat=True)[:TRENDING_SIZE]
+        )
+        cache.set(TRENDING_CACHE_KEY, recipe_ids, TRENDING_CACHE_TIMEOUT)
+    return recipe_ids
+
+
+def compact_scores():
+    now = django_timezone.now()
+    with transaction.atomic():
+        expired, _ = TrendingBucket.objects.filter(
+            bucket__lt=now - timedelta(seconds=TRENDING_WINDOW_SECONDS)
+        ).delete()
+        rows = list(
+            TrendingBucket.objects.select_for_update()
+            .values_list('recipe_id', 'bucket', 'score')
+        )
+        TrendingScore.objects.all().delete()
+        if rows:
+            recipe_ids = np.array([row[0] for row in rows], dtype=np.int64)
+            ages = np.array(
+                [(now - row[1]).total_seconds() for row in rows]
+            )
+            scores = np.array([row[2] for row in rows])
+            decayed = scores * np.power(
+                0.5, np.maximum(ages, 0) / TRENDING_HALF_LIFE_SECONDS
+            )
+            unique_ids, positions = np.unique(recipe_ids, return_inverse=True)
+            totals = np.bincount(positions, weights=decayed)
+            TrendingScore.objects.bulk_create([
+                TrendingScore(recipe_id=int(recipe_id), score=float(total))
+                for recipe_id, total in zip(unique_ids, totals)
+                if total > 0
+            ], batch_size=1000)
+    cache.delete(TRENDING_CACHE_KEY)
+    return expired, len(rows)
@@ -1,12 +1,28 @@
+from admin_auto_filters.filters import AutocompleteFilter
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 
+from foodgram.paginators import EstimatedCountPaginator
+from foodgram.soft_delete import SoftDeleteAdminMixin
+from users_app.jobs import delete_users
 from users_app.models import Subscription, User
 
 
+class SubscriberFilter(AutocompleteFilter):
+
+    title = 'Подписчик'
+    field_name = 'subscriber'
+
+
+class AuthorFilter(AutocompleteFilter):
+
+    title = 'Автор'
+    field_name = 'author'
+
+
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(SoftDeleteAdminMixin, BaseUserAdmin):
 
     form = UserChangeForm
     add_form = UserCreationForm
@@ -19,6 +35,9 @@ class UserAdmin(BaseUserAdmin):
         'is_staff'
     )
     search_fields = ('username', 'email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    soft_delete_function = delete_users
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal info', {'fields': (
@@ -50,3 +69,8 @@ class UserAdmin(BaseUserAdmin):
 class SubscriptionAdmin(admin.ModelAdmin):
 
     list_display = ('subscriber', 'author')
+    list_select_related = ('subscriber', 'author')
+    list_filter = (SubscriberFilter, AuthorFilter)
+    raw_id_fields = ('subscriber', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
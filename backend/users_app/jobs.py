@@ -0,0 +1,73 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from foodgram.soft_delete import delete_in_batches
+from jobs_app.registry import job, report_progress
+from recipes_app.constants import PURGE_BATCH_SIZE
+from recipes_app.ingredient_index import ingredient_index
+from recipes_app.jobs import purge_recipe_rows
+from recipes_app.models import Favorite, Recipe, ShoppingCart
+from users_app.models import Subscription, User
+
+USER_DEPENDENTS = (
+    (Token, 'user'),
+    (Subscription, 'subscriber'),
+    (Subscription, 'author'),
+    (Favorite, 'user'),
+    (ShoppingCart, 'user'),
+)
+
+
+@job('users.purge')
+def purge_user(user_id):
+    if not User.all_objects.filter(
+        pk=user_id, deleted_at__isnull=False
+    ).exists():
+        return
+    rows = 0
+    for model, field in USER_DEPENDENTS:
+        rows += delete_in_batches(
+            model.objects.filter(**{field: user_id}), PURGE_BATCH_SIZE
+        )
+        report_progress(stage=model._meta.model_name, rows=rows)
+    recipes = Recipe.all_objects.filter(
+        author_id=user_id, deleted_at__isnull=False
+    ).order_by('pk')
+    while True:
+        recipe_ids = list(
+            recipes.values_list('pk', flat=True)[:PURGE_BATCH_SIZE]
+        )
+        if not recipe_ids:
+            break
+        rows += purge_recipe_rows(recipe_ids)
+        report_progress(
+            stage='recipe', rows=rows, remaining=recipes.count()
+        )
+    avatar = User.all_objects.get(pk=user_id).avatar.name
+    with transaction.atomic():
+        rows += User.all_objects.filter(pk=user_id).delete()[0]
+        if avatar:
+            transaction.on_commit(lambda: default_storage.delete(avatar))
+    report_progress(stage='user', rows=rows)
+
+
+def delete_users(user_ids):
+    user_ids = list(user_ids)
+    deleted_at = timezone.now()
+    with transaction.atomic():
+        User.objects.filter(pk__in=user_ids).update(
+            deleted_at=deleted_at, is_active=False
+        )
+        Token.objects.filter(user_id__in=user_ids).delete()
+        recipes = Recipe.objects.filter(author_id__in=user_ids)
+        recipe_ids = list(recipes.values_list('pk', flat=True))
+        recipes.update(deleted_at=deleted_at)
+        transaction.on_commit(
+            lambda: ingredient_index.remove_recipes(recipe_ids)
+        )
+        for user_id in user_ids:
+            purge_user.enqueue(
+                dedup_key=f'users.purge:{user_id}', user_id=user_id
+            )
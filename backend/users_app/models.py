@@ -1,12 +1,19 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as BaseUserManager
 from django.db import models
 
+from foodgram.soft_delete import SoftDeleteManager
 from users_app.constants import (EMAIL_LENGTH, FIRST_NAME_LENGTH,
                                  LAST_NAME_LENGTH, USERNAME_LENGTH)
 from users_app.validators import validate_not_blank, validate_username
 
 
+class UserManager(SoftDeleteManager, BaseUserManager):
+
+    use_in_migrations = False
+
+
 class User(AbstractUser):
 
     email = models.EmailField(
@@ -44,9 +51,18 @@ class User(AbstractUser):
         blank=True,
         verbose_name='Аватар'
     )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Дата удаления'
+    )
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    objects = UserManager()
+    all_objects = BaseUserManager()
+
     class Meta:
 
         verbose_name = 'Пользователь'
@@ -69,6 +85,7 @@ class Subscription(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='subscribers',
+        db_index=False,
         verbose_name='Автор'
     )
 
@@ -84,6 +101,12 @@ class Subscription(models.Model):
                 name='prevent_self_subscription'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['author', 'subscriber'],
+                name='subscription_author_idx'
+            )
+        ]
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
 